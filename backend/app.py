@@ -7,7 +7,7 @@
 # from models.cake import Cake
 # from models.order import Order
 
-# def create_app(config_class=Config):
+# def create_app(config_class=Config, register_blueprints=True):
 #     app = Flask(__name__)
 #     app.config.from_object(config_class)
     
@@ -42,10 +42,17 @@
 #     app = create_app()
 #     app.run(debug=True)
 
+import time
+
+# Start of the cold-start clock reported by services/startup_service.py
+IMPORT_STARTED = time.perf_counter()
+
 from flask import Flask
 from flask_cors import CORS
 from config import Config
-from extensions import db, migrate, ma, jwt
+from extensions import db, migrate, jwt, cache, password_hasher
+from services.serializers import FastJSONProvider
+from services import auth_service, db_service, email_service, idempotency_service, metrics_service, rate_limit_service, startup_service, image_service
 
 # --- FIX 1: Import all model classes from their respective files ---
 # CustomizationOption is in models/customization.py
@@ -57,42 +64,80 @@ from models.order_customization import OrderCustomization
 from models.cake import Cake
 from models.order import Order
 from models.User import User 
+from models.idempotency_key import IdempotencyKey
+from models.email_outbox import EmailOutbox
+from models.image_asset import ImageAsset
+from models.delivery_capacity import DeliveryCapacity
 # ----------------------------------------------------------------
 
-def create_app(config_class=Config):
+_imports_timed = False
+
+def create_app(config_class=Config, register_blueprints=True):
+    global _imports_timed
+    # The first app built in a process also reports the time spent importing
+    if _imports_timed:
+        timer = startup_service.StartupTimer()
+    else:
+        timer = startup_service.StartupTimer(IMPORT_STARTED)
+        timer.mark('imports')
+        _imports_timed = True
+
     app = Flask(__name__)
     app.config.from_object(config_class)
+    app.json = FastJSONProvider(app)
+    timer.mark('config')
+    # Registered first so its timings cover the other request hooks
+    metrics_service.init_app(app)
     
     # Initialize extensions
+    db_service.configure_engines(app)
     db.init_app(app)
+    db_service.init_app(app)
     migrate.init_app(app, db)
-    ma.init_app(app)
     jwt.init_app(app)
+    cache.init_app(app)
+    auth_service.init_app(app)
+    password_hasher.init_app(app)
+    idempotency_service.init_app(app)
+    email_service.init_app(app)
+    rate_limit_service.init_app(app)
+    image_service.init_app(app)
     CORS(app)
+    timer.mark('extensions')
     
-    # Register blueprints
-    from controllers.cake_controller import cake_bp
-    from controllers.order_controller import order_bp
-    from controllers.auth_controller import auth_bp
-    from controllers.contact_controller import contact_bp
-    from controllers.admin_controller import admin_bp
-    from controllers.customization_controller import customization_bp
+    # Register blueprints (scripts that only use the models skip them)
+    if register_blueprints:
+        from controllers.cake_controller import cake_bp
+        from controllers.order_controller import order_bp
+        from controllers.auth_controller import auth_bp
+        from controllers.contact_controller import contact_bp
+        from controllers.admin_controller import admin_bp
+        from controllers.customization_controller import customization_bp
+        from controllers.media_controller import media_bp
 
-    
-    app.register_blueprint(cake_bp, url_prefix='/api')
-    app.register_blueprint(admin_bp, url_prefix='/api/admin')
-    app.register_blueprint(order_bp, url_prefix='/api')
-    app.register_blueprint(auth_bp, url_prefix='/api/auth')
-    app.register_blueprint(contact_bp, url_prefix='/api')
-    app.register_blueprint(customization_bp)
-    
+        app.register_blueprint(cake_bp, url_prefix='/api')
+        app.register_blueprint(admin_bp, url_prefix='/api/admin')
+        app.register_blueprint(order_bp, url_prefix='/api')
+        app.register_blueprint(auth_bp, url_prefix='/api/auth')
+        app.register_blueprint(contact_bp, url_prefix='/api')
+        app.register_blueprint(customization_bp)
+        app.register_blueprint(media_bp, url_prefix='/api')
+        timer.mark('blueprints')
+
+    startup_service.init_app(app, timer)
     return app
 
 # --- FIX 2: Define 'app' globally for Flask CLI/Migrate ---
-# Flask-Migrate needs the initialized app instance (with 'db' extension registered) 
-# to be defined globally (outside of if __name__ == '__main__':) when the file is imported.
-app = create_app()
+# The Flask CLI and wsgi.py look up `app` on this module. It is built on
+# first access, so scripts that only need create_app() (seed.py,
+# make_admin.py, bulk_seed.py, the benchmarks) don't build a second app.
+def __getattr__(name):
+    if name == 'app':
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 if __name__ == '__main__':
-    # Since app is already created globally, we just run it here.
+    app = create_app()
     app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,89 @@
+# backend/benchmarks/bench_bake_sheet.py
+# Bake sheet latency: nothing cached, everything cached, and one date changed.
+#
+# Builds the sheets for --days dates starting today over --orders synthetic
+# orders (a tenth of them with a customization option). 'cold' invalidates
+# every date first, so all of them come from the single grouped query;
+# 'one_day_changed' invalidates one date, which is what a new order costs
+# the next reader; 'warm' is served entirely from the cache.
+#
+# Usage: python benchmarks/bench_bake_sheet.py [--orders 200000] [--days 30] [--repeat 5]
+import argparse
+import json
+from datetime import date, timedelta
+
+from sqlalchemy import func, insert
+
+from common import QueryCounter, ensure_orders, make_app, time_call
+from extensions import db
+from models.customization import CustomizationOption
+from models.order import Order
+from models.order_customization import OrderCustomization
+from services import production_service
+
+
+def ensure_customizations():
+    if db.session.query(OrderCustomization.id).first():
+        return
+    if not db.session.query(CustomizationOption.id).first():
+        db.session.execute(insert(CustomizationOption), [
+            {'category': category, 'name': f'{category} {i}', 'price': 5.0 * i}
+            for category in ('Design', 'Flavor') for i in range(5)
+        ])
+    option_ids = [row[0] for row in db.session.query(CustomizationOption.id)]
+    order_ids = [row[0] for row in db.session.query(Order.id).filter(Order.id % 10 == 0)]
+    db.session.execute(insert(OrderCustomization), [
+        {'order_id': order_id, 'customization_option_id': option_ids[order_id % len(option_ids)]}
+        for order_id in order_ids
+    ])
+    db.session.commit()
+
+
+def measure(fn, repeat):
+    with QueryCounter() as counter:
+        fn()
+    return dict(queries=counter.count, **time_call(fn, repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bake sheet benchmark')
+    parser.add_argument('--orders', type=int, default=200_000)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    app = make_app()
+    with app.app_context():
+        ensure_orders(args.orders)
+        ensure_customizations()
+
+        start = date.today()
+        end = start + timedelta(days=args.days - 1)
+        days = [start + timedelta(days=offset) for offset in range(args.days)]
+
+        def cold():
+            production_service.invalidate(*days)
+            return production_service.json_body(start, end)
+
+        def one_day_changed():
+            production_service.invalidate(days[len(days) // 2])
+            return production_service.json_body(start, end)
+
+        def warm():
+            return production_service.json_body(start, end)
+
+        in_range = db.session.query(func.count(Order.id)).filter(Order.delivery_date.between(start, end)).scalar()
+        print(json.dumps({
+            'benchmark': 'bake_sheet',
+            'database': db.engine.url.get_backend_name(),
+            'orders': args.orders,
+            'orders_in_range': in_range,
+            'days': args.days,
+            'cold': measure(cold, args.repeat),
+            'one_day_changed': measure(one_day_changed, args.repeat),
+            'warm': measure(warm, args.repeat),
+        }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
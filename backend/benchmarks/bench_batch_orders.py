@@ -0,0 +1,93 @@
+# backend/benchmarks/bench_batch_orders.py
+# N single POST /api/orders calls vs one POST /api/orders/batch with N orders.
+#
+# Reports wall time and SQL statements for both paths. On PostgreSQL the
+# batch INSERT ... RETURNING is sent as a few multi-row statements; SQLite
+# falls back to one statement per row but still commits once.
+#
+# Usage: python benchmarks/bench_batch_orders.py [--sizes 10 50 100] [--repeat 5]
+import argparse
+import json
+from datetime import date, timedelta
+
+from common import BenchConfig, QueryCounter, make_app, time_call
+from extensions import db
+from models.cake import Cake
+from models.customization import CustomizationOption
+
+
+def order_payloads(count, cake_ids, option_ids):
+    delivery_date = (date.today() + timedelta(days=7)).isoformat()
+    return [{
+        'cake_id': cake_ids[i % len(cake_ids)],
+        'quantity': 1 + i % 3,
+        'customer_name': 'Bench Customer',
+        'customer_email': 'customer@example.com',
+        'customer_phone': '555-000-0000',
+        'delivery_date': delivery_date,
+        'customizations': option_ids[:i % 3]
+    } for i in range(count)]
+
+
+def ensure_catalog():
+    if not db.session.query(Cake.id).first():
+        db.session.add_all([
+            Cake(name=f'Bench Cake {i}', description='Benchmark cake', price=30.0 + i, image_url='')
+            for i in range(5)
+        ])
+    if not db.session.query(CustomizationOption.id).first():
+        db.session.add_all([
+            CustomizationOption(category='Topping', name=f'Bench Topping {i}', price=2.0 * i)
+            for i in range(3)
+        ])
+    db.session.commit()
+    cake_ids = [row[0] for row in db.session.query(Cake.id).all()]
+    option_ids = [row[0] for row in db.session.query(CustomizationOption.id).filter_by(active=True).all()]
+    return cake_ids, option_ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Batch order submission benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 50, 100])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    app = make_app(BenchConfig)
+    client = app.test_client()
+    results = []
+
+    with app.app_context():
+        cake_ids, option_ids = ensure_catalog()
+
+        for size in args.sizes:
+            payloads = order_payloads(size, cake_ids, option_ids)
+
+            def single_calls():
+                for payload in payloads:
+                    response = client.post('/api/orders', json=payload)
+                    assert response.status_code == 201, response.get_json()
+
+            def batch_call():
+                response = client.post('/api/orders/batch', json={'orders': payloads})
+                assert response.status_code == 201, response.get_json()
+
+            with QueryCounter() as single_queries:
+                single_calls()
+            with QueryCounter() as batch_queries:
+                batch_call()
+
+            results.append({
+                'orders': size,
+                'single': dict(time_call(single_calls, args.repeat), queries=single_queries.count),
+                'batch': dict(time_call(batch_call, args.repeat), queries=batch_queries.count)
+            })
+
+    print(json.dumps({
+        'benchmark': 'batch_orders',
+        'database': app.config['SQLALCHEMY_DATABASE_URI'].split(':', 1)[0],
+        'results': results
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
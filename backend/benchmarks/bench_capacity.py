@@ -0,0 +1,105 @@
+# backend/benchmarks/bench_capacity.py
+# Delivery capacity under a burst of concurrent orders for one date.
+#
+# --threads clients post --orders orders between them, all for the same
+# delivery date with room for --capacity cakes, through POST /api/orders.
+# Afterwards the date's booked count must equal both the capacity (the
+# burst asks for more than fits) and the sum of the quantities of the
+# orders that were accepted: anything else is an overbooking or a lost
+# update. Also reports the latency of GET /api/delivery/availability.
+#
+# Usage: python benchmarks/bench_capacity.py [--threads 16] [--orders 400] [--capacity 150]
+import argparse
+import json
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+
+from common import BenchConfig, make_app, time_call
+from bench_batch_orders import ensure_catalog
+from extensions import db
+from models.cake import Cake
+from models.delivery_capacity import DeliveryCapacity
+from models.order import Order
+from services import capacity_service
+
+
+def client(app, payloads, start_at, statuses, latencies):
+    http = app.test_client()
+    while time.time() < start_at:
+        time.sleep(0.001)
+    for payload in payloads:
+        begin = time.perf_counter()
+        response = http.post('/api/orders', json=payload)
+        latencies.append(time.perf_counter() - begin)
+        statuses[response.status_code] += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Concurrent delivery capacity benchmark')
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--orders', type=int, default=400)
+    parser.add_argument('--capacity', type=int, default=150)
+    args = parser.parse_args()
+
+    app = make_app(BenchConfig)
+    with app.app_context():
+        ensure_catalog()
+        cake_id = db.session.query(Cake.id).order_by(Cake.id).first()[0]
+        # A date far enough ahead that earlier runs and seeded orders don't use it
+        day = capacity_service.first_bookable_date() + timedelta(days=400)
+        Order.query.filter_by(delivery_date=day).delete()
+        DeliveryCapacity.query.filter_by(delivery_date=day).delete()
+        capacity_service.set_capacity(day, args.capacity)
+        db.session.commit()
+
+    payloads = [{
+        'cake_id': cake_id, 'quantity': 1 + i % 3, 'customer_name': f'Burst {i}',
+        'customer_email': f'burst-{i}@example.com', 'customer_phone': '555-000-0000',
+        'delivery_date': day.isoformat(),
+    } for i in range(args.orders)]
+
+    statuses, latencies = Counter(), []
+    start_at = time.time() + 0.5
+    threads = [
+        threading.Thread(target=client, args=(app, payloads[i::args.threads], start_at, statuses, latencies))
+        for i in range(args.threads)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.time() - start_at
+
+    with app.app_context():
+        booked = db.session.get(DeliveryCapacity, day).booked
+        ordered = db.session.query(db.func.coalesce(db.func.sum(Order.quantity), 0)).filter(
+            Order.delivery_date == day, Order.status != 'cancelled'
+        ).scalar()
+        http = app.test_client()
+        availability_ms = time_call(lambda: http.get('/api/delivery/availability'), repeat=50)
+
+    consistent = booked == ordered <= args.capacity
+    latencies.sort()
+    print(json.dumps({
+        'benchmark': 'capacity',
+        'database': app.config['SQLALCHEMY_DATABASE_URI'].split(':', 1)[0],
+        'threads': args.threads,
+        'orders': args.orders,
+        'capacity': args.capacity,
+        'statuses': {str(code): count for code, count in sorted(statuses.items())},
+        'booked': booked,
+        'ordered_quantity': ordered,
+        'consistent': consistent,
+        'orders_per_second': round(args.orders / elapsed, 1),
+        'order_p50_ms': round(latencies[len(latencies) // 2] * 1000, 2),
+        'order_p99_ms': round(latencies[int(len(latencies) * 0.99)] * 1000, 2),
+        'availability_60_days': availability_ms,
+    }, indent=2))
+    return 0 if consistent else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,66 @@
+# backend/benchmarks/bench_dashboard_stats.py
+# Compares the old per-metric dashboard queries with the single-query stats engine.
+#
+# Usage: python benchmarks/bench_dashboard_stats.py [--orders 1000000] [--repeat 5]
+import argparse
+import json
+from datetime import datetime, timedelta
+
+from common import QueryCounter, ensure_orders, make_app, time_call
+from extensions import db
+from models.order import Order
+from models.User import User
+from services import stats_service
+
+
+def legacy_dashboard_stats():
+    """The original get_dashboard_stats body: one round trip per metric."""
+    seven_days_ago = datetime.now() - timedelta(days=7)
+    total_revenue = db.session.query(db.func.sum(Order.total_price)).filter(
+        Order.status.in_(['completed', 'confirmed'])
+    ).scalar() or 0
+    return {
+        'total_users': User.query.count(),
+        'total_orders': Order.query.count(),
+        'orders_by_status': {
+            status: Order.query.filter_by(status=status).count()
+            for status in ['pending', 'confirmed', 'completed', 'cancelled']
+        },
+        'recent_orders': Order.query.filter(Order.created_at >= seven_days_ago).count(),
+        'total_revenue': float(total_revenue)
+    }
+
+
+def measure(fn, repeat):
+    with QueryCounter() as counter:
+        result = fn()
+    timings = time_call(fn, repeat)
+    return result, dict(round_trips=counter.count, **timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Dashboard stats benchmark')
+    parser.add_argument('--orders', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    app = make_app()
+    with app.app_context():
+        ensure_orders(args.orders)
+
+        legacy_result, legacy = measure(legacy_dashboard_stats, args.repeat)
+        engine_result, engine = measure(stats_service.get_dashboard_stats, args.repeat)
+        assert legacy_result['orders_by_status'] == engine_result['orders_by_status']
+        assert legacy_result['total_orders'] == engine_result['total_orders']
+
+        print(json.dumps({
+            'benchmark': 'dashboard_stats',
+            'database': db.engine.url.get_backend_name(),
+            'orders': engine_result['total_orders'],
+            'legacy': legacy,
+            'stats_engine': engine
+        }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+# backend/benchmarks/bench_images.py
+# Image uploads: request latency, background processing time and bytes saved.
+#
+# Uploads --images generated photos (--width x --height JPEGs with some
+# noise, so they compress like photos rather than flat colour) through
+# POST /api/admin/cakes/<id>/image, then waits for the processing pool.
+# Reports how long the upload request itself took, the processing time
+# per image, and the size of each variant next to the original a card
+# used to download.
+#
+# Usage: python benchmarks/bench_images.py [--images 8] [--width 3000] [--height 2000]
+import argparse
+import io
+import json
+import os
+import statistics
+import tempfile
+import time
+from collections import defaultdict
+
+# Before the app is built, so uploads go to a throwaway directory
+os.environ.setdefault('IMAGE_STORAGE_DIR', tempfile.mkdtemp(prefix='cakes_images_'))
+
+from flask_jwt_extended import create_access_token
+from PIL import Image
+
+from common import BenchConfig, make_app
+from bench_batch_orders import ensure_catalog
+from extensions import db
+from models.cake import Cake
+from models.User import User
+from services.image_service import image_processor
+
+
+def make_photo(width, height, seed):
+    base = Image.linear_gradient('L').resize((width, height))
+    noise = Image.effect_noise((width, height), 20 + seed % 10)
+    red = Image.blend(base, noise, 0.1)
+    green = Image.blend(base.rotate(90, expand=False), noise, 0.05)
+    blue = Image.effect_mandelbrot((width, height), (-2.0 + seed * 0.01, -1.2, 1.0, 1.2), 60)
+    buffer = io.BytesIO()
+    Image.merge('RGB', (red, green, blue)).save(buffer, 'JPEG', quality=90)
+    return buffer.getvalue()
+
+
+def admin_headers():
+    admin = User.query.filter_by(email='bench-admin@example.com').first()
+    if admin is None:
+        admin = User(name='Bench Admin', email='bench-admin@example.com', password_hash='x', is_admin=True)
+        db.session.add(admin)
+        db.session.commit()
+    token = create_access_token(identity=str(admin.id), additional_claims={'is_admin': True})
+    return {'Authorization': f'Bearer {token}'}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Image upload and processing benchmark')
+    parser.add_argument('--images', type=int, default=8)
+    parser.add_argument('--width', type=int, default=3000)
+    parser.add_argument('--height', type=int, default=2000)
+    args = parser.parse_args()
+
+    app = make_app(BenchConfig)
+    client = app.test_client()
+
+    with app.app_context():
+        ensure_catalog()
+        headers = admin_headers()
+        cake_ids = [row[0] for row in db.session.query(Cake.id).order_by(Cake.id).limit(args.images)]
+        photos = [make_photo(args.width, args.height, seed) for seed in range(len(cake_ids))]
+
+        upload_ms = []
+        start = time.perf_counter()
+        for cake_id, photo in zip(cake_ids, photos):
+            begin = time.perf_counter()
+            response = client.post(f'/api/admin/cakes/{cake_id}/image', headers=headers,
+                                   data={'image': (io.BytesIO(photo), 'photo.jpg')})
+            assert response.status_code in (200, 202), response.get_json()
+            upload_ms.append((time.perf_counter() - begin) * 1000)
+        image_processor.wait()
+        processing_s = time.perf_counter() - start
+
+        sizes = defaultdict(list)
+        for cake in client.get('/api/cakes').get_json():
+            if cake['id'] not in cake_ids:
+                continue
+            for variant in cake['image_variants']:
+                body = client.get(variant['url']).data
+                sizes[(variant['type'], variant['width'])].append(len(body))
+
+    original_kb = statistics.mean(len(photo) for photo in photos) / 1024
+    print(json.dumps({
+        'benchmark': 'images',
+        'images': len(photos),
+        'source': f'{args.width}x{args.height} JPEG',
+        'workers': app.config['IMAGE_WORKERS'],
+        'upload_request_ms_p50': round(statistics.median(upload_ms), 2),
+        'processing_ms_per_image': round(processing_s * 1000 / len(photos), 1),
+        'original_kb': round(original_kb, 1),
+        'variant_kb': {f'{content_type} {width}w': round(statistics.mean(values) / 1024, 1)
+                       for (content_type, width), values in sorted(sizes.items())},
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+# backend/benchmarks/bench_password_hashing.py
+# Login throughput per core for each password hashing cost setting.
+#
+# Logins are sent one at a time through the Flask test client, so the
+# numbers are what a single core can sustain for /api/auth/login.
+#
+# Usage: python benchmarks/bench_password_hashing.py [--logins 20] [--methods scrypt:16384:8:1 ...]
+import argparse
+import json
+import time
+
+from common import BenchConfig, make_app
+from extensions import db
+from models.User import User
+
+DEFAULT_METHODS = [
+    'pbkdf2:sha256:260000',
+    'pbkdf2:sha256:600000',
+    'pbkdf2:sha256:1000000',
+    'scrypt:16384:8:1',
+    'scrypt:32768:8:1',
+    'scrypt:65536:8:1',
+]
+
+
+def bench_method(method, logins):
+    config = type('HashBenchConfig', (BenchConfig,), {
+        'SQLALCHEMY_DATABASE_URI': 'sqlite://',
+        'PASSWORD_HASH_METHOD': method,
+    })
+    app = make_app(config)
+    client = app.test_client()
+
+    with app.app_context():
+        user = User(name='Bench User', email='bench@example.com')
+        user.set_password('benchmark-password')
+        db.session.add(user)
+        db.session.commit()
+
+        credentials = {'email': 'bench@example.com', 'password': 'benchmark-password'}
+        start = time.perf_counter()
+        for _ in range(logins):
+            response = client.post('/api/auth/login', json=credentials)
+            assert response.status_code == 200, response.get_json()
+        elapsed = time.perf_counter() - start
+
+    return {
+        'method': method,
+        'logins': logins,
+        'ms_per_login': round(elapsed / logins * 1000, 2),
+        'logins_per_second_per_core': round(logins / elapsed, 1)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Password hashing benchmark')
+    parser.add_argument('--logins', type=int, default=20)
+    parser.add_argument('--methods', nargs='+', default=DEFAULT_METHODS)
+    args = parser.parse_args()
+
+    print(json.dumps({
+        'benchmark': 'password_hashing',
+        'results': [bench_method(method, args.logins) for method in args.methods]
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+# backend/benchmarks/bench_quotes.py
+# Quote throughput for POST /api/quote and for the price engine itself.
+#
+# The HTTP figure includes Flask routing and JSON handling through the
+# test client; the engine figure is the bare in-memory price lookup.
+# Both should run with zero SQL statements once the table is loaded.
+#
+# Usage: python benchmarks/bench_quotes.py [--quotes 5000]
+import argparse
+import json
+import time
+
+from common import BenchConfig, QueryCounter, make_app
+from bench_batch_orders import ensure_catalog
+from services.price_service import price_engine
+
+
+def rate(fn, count):
+    start = time.perf_counter()
+    for i in range(count):
+        fn(i)
+    elapsed = time.perf_counter() - start
+    return {
+        'quotes': count,
+        'us_per_quote': round(elapsed / count * 1e6, 2),
+        'quotes_per_second': round(count / elapsed)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Quote endpoint benchmark')
+    parser.add_argument('--quotes', type=int, default=5000)
+    args = parser.parse_args()
+
+    app = make_app(BenchConfig)
+    client = app.test_client()
+
+    with app.app_context():
+        cake_ids, option_ids = ensure_catalog()
+        selections = [
+            {'cake_id': cake_ids[i % len(cake_ids)], 'quantity': 1 + i % 3, 'customizations': option_ids[:i % 4]}
+            for i in range(64)
+        ]
+
+        def http_quote(i):
+            response = client.post('/api/quote', json=selections[i % 64])
+            assert response.status_code == 200, response.get_json()
+
+        def engine_quote(i):
+            selection = selections[i % 64]
+            price_engine.quote(selection['cake_id'], selection['quantity'], selection['customizations'])
+
+        price_engine.table()
+        with QueryCounter() as http_queries:
+            http = rate(http_quote, args.quotes)
+        with QueryCounter() as engine_queries:
+            engine = rate(engine_quote, args.quotes)
+
+    print(json.dumps({
+        'benchmark': 'quotes',
+        'http': dict(http, queries=http_queries.count),
+        'engine': dict(engine, queries=engine_queries.count)
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+# backend/benchmarks/bench_rate_limiter.py
+# Per-request cost of the rate limiter.
+#
+# "backend" is one token-bucket update in the in-memory backend; "check"
+# is the whole @rate_limited wrapper (limit lookup, client key, bucket
+# update) inside a request context, which is what every limited request
+# pays. Both should stay well under 50 microseconds.
+#
+# Usage: python benchmarks/bench_rate_limiter.py [--calls 200000] [--clients 1000]
+import argparse
+import json
+import time
+
+from common import BenchConfig, make_app
+from services.rate_limit_service import MemoryBackend, limiter, rate_limited
+
+
+def per_call(fn, calls):
+    start = time.perf_counter()
+    for i in range(calls):
+        fn(i)
+    elapsed = time.perf_counter() - start
+    return {'calls': calls, 'us_per_call': round(elapsed / calls * 1e6, 3)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rate limiter microbenchmark')
+    parser.add_argument('--calls', type=int, default=200000)
+    parser.add_argument('--clients', type=int, default=1000)
+    args = parser.parse_args()
+
+    config = type('RateLimitBenchConfig', (BenchConfig,), {
+        'SQLALCHEMY_DATABASE_URI': 'sqlite://',
+        'RATE_LIMIT_ENABLED': True,
+        # Large enough that every call is allowed and takes the full path
+        'RATE_LIMITS': {'orders': '1000000000/second'},
+    })
+    app = make_app(config)
+
+    backend = MemoryBackend()
+    keys = [f'orders.create_order:ip:10.0.{i // 256}.{i % 256}' for i in range(args.clients)]
+    backend_result = per_call(lambda i: backend.hit(keys[i % args.clients], 30, 0.5), args.calls)
+
+    limited_view = rate_limited()(lambda: None)
+    with app.test_request_context('/api/orders', method='POST'):
+        check_result = per_call(lambda i: limited_view(), args.calls)
+
+    print(json.dumps({
+        'benchmark': 'rate_limiter',
+        'clients': args.clients,
+        'backend': backend_result,
+        'check': check_result,
+        'buckets': len(limiter.backend._buckets)
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
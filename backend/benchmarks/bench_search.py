@@ -0,0 +1,106 @@
+# backend/benchmarks/bench_search.py
+# Catalog search versus downloading the whole catalog.
+#
+# Fills the catalog up to --cakes generated cakes, then times a few
+# representative searches through GET /api/cakes/search and compares the
+# response size with the full GET /api/cakes list the portfolio page used
+# to filter client-side. On SQLite this measures the in-memory index; set
+# BENCH_DATABASE_URL to a migrated Postgres to measure tsvector + GIN.
+#
+# Usage: python benchmarks/bench_search.py [--cakes 5000] [--requests 200]
+import argparse
+import json
+import random
+import time
+
+from sqlalchemy import func, insert
+
+from common import BenchConfig, QueryCounter, make_app
+from extensions import db, cache
+from models.cake import Cake
+from services.cache_service import CATALOG_NAMESPACE
+
+FLAVORS = ['chocolate', 'vanilla', 'strawberry', 'lemon', 'carrot', 'coconut', 'caramel', 'coffee', 'mango']
+STYLES = ['layer', 'sponge', 'mousse', 'cheesecake', 'bundt', 'chiffon', 'tiered', 'naked']
+EXTRAS = ['ganache', 'buttercream', 'berries', 'meringue', 'sprinkles', 'walnuts', 'cream cheese frosting']
+
+QUERIES = [
+    ('q=choc', 'prefix'),
+    ('q=lemon meringue', 'two terms'),
+    ('q=vanilla&sort=price_asc&max_price=50', 'text + price filter'),
+    ('sort=price_desc&min_price=100', 'price filter only'),
+    ('q=caramel&offset=40', 'deep page'),
+]
+
+
+def ensure_cakes(count, seed=7):
+    existing = db.session.query(func.count(Cake.id)).scalar()
+    if existing >= count:
+        return
+    rng = random.Random(seed)
+    rows = []
+    for i in range(existing, count):
+        flavor, style = rng.choice(FLAVORS), rng.choice(STYLES)
+        rows.append({
+            'name': f'{flavor.title()} {style.title()} {i}',
+            'description': f'A {flavor} {style} cake with {rng.choice(EXTRAS)} and {rng.choice(EXTRAS)}.',
+            'price': float(rng.randint(20, 160)),
+            'image_url': f'https://example.com/cakes/{i}.jpg',
+        })
+    db.session.execute(insert(Cake), rows)
+    db.session.commit()
+    cache.bump(CATALOG_NAMESPACE)
+
+
+def measure(client, path, requests):
+    response = client.get(path)
+    assert response.status_code == 200, response.get_json()
+    size = len(response.data)
+    with QueryCounter() as queries:
+        start = time.perf_counter()
+        for _ in range(requests):
+            client.get(path)
+        elapsed = time.perf_counter() - start
+    return {
+        'bytes': size,
+        'ms_per_request': round(elapsed / requests * 1000, 3),
+        'queries_per_request': round(queries.count / requests, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Catalog search benchmark')
+    parser.add_argument('--cakes', type=int, default=5000)
+    parser.add_argument('--requests', type=int, default=200)
+    args = parser.parse_args()
+
+    app = make_app(BenchConfig)
+    client = app.test_client()
+
+    with app.app_context():
+        ensure_cakes(args.cakes)
+        backend = 'postgres' if db.engine.dialect.name == 'postgresql' else 'memory'
+
+        # First search after a catalog change builds the in-memory index
+        cache.bump(CATALOG_NAMESPACE)
+        start = time.perf_counter()
+        client.get('/api/cakes/search?q=warmup')
+        first_search_ms = round((time.perf_counter() - start) * 1000, 2)
+
+        results = {
+            'full_catalog GET /api/cakes': measure(client, '/api/cakes', args.requests),
+        }
+        for query, label in QUERIES:
+            results[f'{label}: {query}'] = measure(client, f'/api/cakes/search?{query}', args.requests)
+
+    print(json.dumps({
+        'benchmark': 'search',
+        'backend': backend,
+        'cakes': args.cakes,
+        'first_search_ms': first_search_ms,
+        'results': results,
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
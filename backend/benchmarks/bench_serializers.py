@@ -0,0 +1,76 @@
+# backend/benchmarks/bench_serializers.py
+# Compares Marshmallow Schema.dump + stdlib JSON with the generated row
+# encoders + FastJSONProvider for order and cake listings.
+#
+# Usage: python benchmarks/bench_serializers.py [--rows 10000] [--repeat 5]
+import argparse
+import json
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+from common import make_app, time_call
+from flask.json.provider import DefaultJSONProvider
+from controllers.admin_controller import OrderSchema
+from controllers.cake_controller import CakeSchema
+from services import serializers
+
+
+def make_rows(count):
+    now = datetime.now()
+    orders, cakes = [], []
+    for i in range(count):
+        cake = SimpleNamespace(id=i, name=f'Cake {i}', description='A benchmark cake', price=40.0,
+                               image_url='https://example.com/cake.jpg')
+        user = SimpleNamespace(email=f'user{i}@example.com')
+        orders.append(SimpleNamespace(
+            id=i, user_id=i, cake_id=i, quantity=2, customer_name='Bench Customer',
+            customer_email='customer@example.com', customer_phone='555-000-0000',
+            delivery_date=date.today() + timedelta(days=3), special_requests='',
+            total_price=80.0, status='pending', created_at=now, cake=cake, user=user
+        ))
+        cakes.append(cake)
+    return orders, cakes
+
+
+def as_tuples(objects, names):
+    return [
+        tuple(getattr(obj, name) if name not in ('cake_name', 'user_email')
+              else (obj.cake.name if name == 'cake_name' else obj.user.email)
+              for name in names)
+        for obj in objects
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serializer microbenchmark')
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    app = make_app()
+    orders, cakes = make_rows(args.rows)
+    order_rows = as_tuples(orders, serializers.ADMIN_ORDER.names)
+    cake_rows = as_tuples(cakes, serializers.CAKE.names)
+
+    order_schema = OrderSchema(many=True)
+    cake_schema = CakeSchema(many=True)
+    stdlib = DefaultJSONProvider(app)
+    fast = serializers.FastJSONProvider(app)
+
+    results = {
+        'orders_marshmallow': time_call(lambda: stdlib.dumps(order_schema.dump(orders)), args.repeat),
+        'orders_row_encoder': time_call(lambda: fast.dumps(serializers.ADMIN_ORDER.many(order_rows)), args.repeat),
+        'cakes_marshmallow': time_call(lambda: stdlib.dumps(cake_schema.dump(cakes)), args.repeat),
+        'cakes_row_encoder': time_call(lambda: fast.dumps(serializers.CAKE.many(cake_rows)), args.repeat),
+    }
+
+    print(json.dumps({
+        'benchmark': 'serializers',
+        'rows': args.rows,
+        'orjson': serializers.orjson is not None,
+        'results': results
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
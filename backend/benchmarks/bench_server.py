@@ -0,0 +1,141 @@
+# backend/benchmarks/bench_server.py
+# Throughput of the production server (gunicorn.conf.py) by worker count.
+#
+# Starts gunicorn on a free local port for each --workers value, waits for
+# it to answer, then drives GET --path from --clients client processes,
+# each with one keep-alive connection, for --seconds. The clients run on
+# the same machine, so compare runs made on the same hardware only.
+#
+# Usage: python benchmarks/bench_server.py [--workers 1 4] [--clients 8] [--seconds 10]
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import time
+
+from common import BenchConfig, make_app
+from bench_batch_orders import ensure_catalog
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(port, process, deadline=30):
+    end = time.monotonic() + deadline
+    while time.monotonic() < end:
+        if process.poll() is not None:
+            sys.exit(f'gunicorn exited with status {process.returncode}')
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            connection.request('GET', '/api/cakes')
+            if connection.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.1)
+    sys.exit('gunicorn did not become ready')
+
+
+def client(port, path, seconds, start_at, results):
+    connection = http.client.HTTPConnection('127.0.0.1', port)
+    while time.time() < start_at:
+        time.sleep(0.001)
+    count = errors = 0
+    latencies = []
+    end = start_at + seconds
+    while time.time() < end:
+        begin = time.perf_counter()
+        # Like a browser, retry once on a fresh connection when the server
+        # closed the idle keep-alive one (e.g. a worker being recycled)
+        for attempt in range(2):
+            try:
+                connection.request('GET', path)
+                response = connection.getresponse()
+                response.read()
+                if response.status != 200:
+                    errors += 1
+                break
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                connection = http.client.HTTPConnection('127.0.0.1', port)
+                if attempt:
+                    errors += 1
+        latencies.append(time.perf_counter() - begin)
+        count += 1
+    results.put((count, errors, latencies))
+
+
+def run(workers, args):
+    port = free_port()
+    env = dict(
+        os.environ,
+        DATABASE_URL=BenchConfig.SQLALCHEMY_DATABASE_URI,
+        MAIL_WORKER_ENABLED='false',
+        WEB_CONCURRENCY=str(workers),
+        SERVER_BIND=f'127.0.0.1:{port}',
+        SERVER_LOG_LEVEL='warning',
+    )
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app'],
+        cwd=BACKEND_DIR, env=env
+    )
+    try:
+        wait_until_ready(port, process)
+        results = multiprocessing.Queue()
+        start_at = time.time() + 1
+        clients = [
+            multiprocessing.Process(target=client, args=(port, args.path, args.seconds, start_at, results))
+            for _ in range(args.clients)
+        ]
+        for proc in clients:
+            proc.start()
+        collected = [results.get() for _ in clients]
+        for proc in clients:
+            proc.join()
+    finally:
+        process.terminate()
+        process.wait()
+
+    latencies = sorted(latency for _, _, sample in collected for latency in sample)
+    requests = sum(count for count, _, _ in collected)
+    return {
+        'workers': workers,
+        'requests': requests,
+        'errors': sum(errors for _, errors, _ in collected),
+        'throughput_rps': round(requests / args.seconds, 1),
+        'p50_ms': round(latencies[len(latencies) // 2] * 1000, 2) if latencies else None,
+        'p99_ms': round(latencies[int(len(latencies) * 0.99)] * 1000, 2) if latencies else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Production server throughput by worker count')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, max(2, os.cpu_count() or 1)])
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--path', default='/api/cakes')
+    args = parser.parse_args()
+
+    app = make_app(BenchConfig)
+    with app.app_context():
+        ensure_catalog()
+
+    print(json.dumps({
+        'benchmark': 'server',
+        'path': args.path,
+        'clients': args.clients,
+        'cpus': os.cpu_count(),
+        'runs': [run(workers, args) for workers in args.workers],
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
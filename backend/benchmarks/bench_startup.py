@@ -0,0 +1,129 @@
+# backend/benchmarks/bench_startup.py
+# Cold start: how long a fresh process takes to build the app and serve.
+#
+# Each run starts a new interpreter (so nothing is cached in memory) and
+# reports the create_app() phase timings from app.extensions['startup'],
+# the time until the first GET --path has been answered, and the wall time
+# of the whole process including interpreter start-up. The 'script' mode
+# does what seed.py and make_admin.py do: build an app without the API
+# blueprints and run one query. Before timing, one web run with
+# STARTUP_TIMING=true checks that the phase report and first-request line
+# are actually written to stderr; the script exits non-zero if they aren't.
+#
+# Usage: python benchmarks/bench_startup.py [--runs 10] [--path /api/cakes]
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from common import BenchConfig, make_app
+from bench_batch_orders import ensure_catalog
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WEB = """
+import json, time
+started = time.perf_counter()
+from app import app
+built = time.perf_counter()
+response = app.test_client().get({path!r})
+assert response.status_code == 200, response.status_code
+served = time.perf_counter()
+print(json.dumps({{
+    'create_app_ms': (built - started) * 1000,
+    'first_request_ms': (served - started) * 1000,
+    'phases_ms': app.extensions['startup']['phases_ms'],
+}}))
+"""
+
+SCRIPT = """
+import json, time
+started = time.perf_counter()
+from app import create_app
+from extensions import db
+from models.User import User
+app = create_app(register_blueprints=False)
+built = time.perf_counter()
+with app.app_context():
+    User.query.first()
+done = time.perf_counter()
+print(json.dumps({
+    'create_app_ms': (built - started) * 1000,
+    'first_query_ms': (done - started) * 1000,
+    'phases_ms': app.extensions['startup']['phases_ms'],
+}))
+"""
+
+
+def run_process(code, **extra_env):
+    env = dict(
+        os.environ,
+        DATABASE_URL=BenchConfig.SQLALCHEMY_DATABASE_URI,
+        MAIL_WORKER_ENABLED='false',
+        RATE_LIMIT_ENABLED='false',
+        STARTUP_TIMING='false',
+    )
+    env.update(extra_env)
+    return subprocess.run(
+        [sys.executable, '-c', code], cwd=BACKEND_DIR, env=env,
+        capture_output=True, text=True, check=True
+    )
+
+
+def run_once(code):
+    start = time.perf_counter()
+    output = run_process(code).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result['process_ms'] = (time.perf_counter() - start) * 1000
+    return result
+
+
+def timing_logged(code):
+    """True when STARTUP_TIMING=true prints both report lines to stderr."""
+    stderr = run_process(code, STARTUP_TIMING='true').stderr
+    return 'cakes.startup: create_app ' in stderr and 'first request served ' in stderr
+
+
+def summarize(results):
+    summary = {}
+    for key in results[0]:
+        if key == 'phases_ms':
+            summary[key] = {
+                name: round(statistics.median(r[key][name] for r in results), 2)
+                for name in results[0][key]
+            }
+        else:
+            summary[f'median_{key}'] = round(statistics.median(r[key] for r in results), 2)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description='App cold-start benchmark')
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--path', default='/api/cakes')
+    args = parser.parse_args()
+
+    app = make_app(BenchConfig)
+    with app.app_context():
+        ensure_catalog()
+
+    # One discarded run per mode so .pyc files are written before timing
+    web_code = WEB.format(path=args.path)
+    run_once(web_code)
+    run_once(SCRIPT)
+    if not timing_logged(web_code):
+        sys.exit('STARTUP_TIMING=true did not log the start-up report')
+
+    print(json.dumps({
+        'benchmark': 'startup',
+        'runs': args.runs,
+        'web': summarize([run_once(web_code) for _ in range(args.runs)]),
+        'script': summarize([run_once(SCRIPT) for _ in range(args.runs)]),
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
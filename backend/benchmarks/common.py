@@ -0,0 +1,133 @@
+# backend/benchmarks/common.py
+# Shared helpers for the benchmark scripts in this folder
+import os
+import sys
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+# This line helps Python find the application files when run as a script
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event, func, insert
+from app import create_app
+from config import Config
+from extensions import db
+from models.cake import Cake
+from models.order import Order
+from models.User import User
+
+STATUSES = ['pending', 'confirmed', 'completed', 'cancelled']
+
+
+class BenchConfig(Config):
+    # Defaults to a throwaway SQLite file; point BENCH_DATABASE_URL at a
+    # local Postgres to benchmark against the production engine
+    SQLALCHEMY_DATABASE_URI = os.environ.get('BENCH_DATABASE_URL') or \
+        'sqlite:///' + os.path.join(tempfile.gettempdir(), 'cakes_bench.db')
+    TESTING = True
+    # Keep the email dispatcher's polling out of the timings and query counts
+    MAIL_WORKER_ENABLED = False
+    MAIL_BACKEND = 'local'
+    # Benchmarks replay many requests from one client
+    RATE_LIMIT_ENABLED = False
+    # and place far more orders per delivery date than a bakery would take
+    DELIVERY_DAILY_CAPACITY = 10 ** 9
+
+
+def make_app(config_class=BenchConfig):
+    app = create_app(config_class)
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+class QueryCounter:
+    """Count the SQL statements executed on the engine inside a `with` block."""
+
+    def __init__(self, engine=None):
+        self.engine = engine
+        self.count = 0
+        self.statements = []
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+        self.statements.append(statement)
+
+    def __enter__(self):
+        self.engine = self.engine or db.engine
+        event.listen(self.engine, 'before_cursor_execute', self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self._on_execute)
+
+
+def time_call(fn, repeat=5):
+    """Run `fn` `repeat` times and return latency figures in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        'min_ms': round(min(timings), 3),
+        'median_ms': round(statistics.median(timings), 3),
+        'max_ms': round(max(timings), 3)
+    }
+
+
+def ensure_orders(total_orders, users=1000, cakes=20, batch_size=50000, seed=42):
+    """Bulk-insert synthetic cakes, users and orders until the order table
+    holds `total_orders` rows. Must be called inside an app context."""
+    existing = db.session.query(func.count(Order.id)).scalar()
+    if existing >= total_orders:
+        return existing
+
+    rng = random.Random(seed + existing)
+
+    if not db.session.query(Cake.id).first():
+        db.session.execute(insert(Cake), [
+            {'name': f'Bench Cake {i}', 'description': 'Benchmark cake', 'price': 30.0 + i,
+             'image_url': ''}
+            for i in range(cakes)
+        ])
+    if not db.session.query(User.id).first():
+        db.session.execute(insert(User), [
+            {'name': f'Bench User {i}', 'email': f'bench{i}@example.com', 'password_hash': 'x',
+             'created_at': datetime.now() - timedelta(minutes=i)}
+            for i in range(users)
+        ])
+    db.session.commit()
+
+    cake_ids = [row[0] for row in db.session.query(Cake.id).all()]
+    user_ids = [row[0] for row in db.session.query(User.id).all()] + [None]
+    now = datetime.now()
+    today = date.today()
+
+    remaining = total_orders - existing
+    while remaining > 0:
+        size = min(batch_size, remaining)
+        rows = []
+        for _ in range(size):
+            quantity = rng.randint(1, 3)
+            rows.append({
+                'user_id': rng.choice(user_ids),
+                'cake_id': rng.choice(cake_ids),
+                'quantity': quantity,
+                'customer_name': 'Bench Customer',
+                'customer_email': 'customer@example.com',
+                'customer_phone': '555-000-0000',
+                'delivery_date': today + timedelta(days=rng.randint(-365, 60)),
+                'special_requests': '',
+                'total_price': 40.0 * quantity,
+                'status': rng.choice(STATUSES),
+                'created_at': now - timedelta(seconds=rng.randint(0, 2 * 365 * 86400))
+            })
+        db.session.execute(insert(Order), rows)
+        db.session.commit()
+        remaining -= size
+
+    return total_orders
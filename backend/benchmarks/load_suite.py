@@ -0,0 +1,294 @@
+# backend/benchmarks/load_suite.py
+# Scripted load scenarios against the real Flask app.
+#
+# Each scenario is run by --concurrency threads for --iterations rounds,
+# either through the Flask test client or over HTTP against a threaded
+# WSGI server started in-process. Per endpoint it reports p50/p95/p99
+# latency, throughput and SQL statements per request (read from the
+# Server-Timing header), as JSON that can be diffed between runs.
+#
+# Usage:
+#   python bulk_seed.py --users 100000 --orders 1000000 --options 500
+#   python benchmarks/load_suite.py --driver wsgi --concurrency 8 --output run.json
+# or let the suite generate its own (smaller) dataset:
+#   python benchmarks/load_suite.py --seed-data --users 10000 --orders 100000
+import argparse
+import http.client
+import json
+import math
+import random
+import re
+import sys
+import threading
+import time
+from datetime import date, timedelta
+from urllib.parse import quote
+
+from werkzeug.serving import WSGIRequestHandler, make_server
+from flask_jwt_extended import create_access_token
+
+from common import BenchConfig, make_app
+from extensions import db
+from models.cake import Cake
+from models.customization import CustomizationOption
+from models.order import Order
+from models.User import User
+from services.auth_service import role_claims
+
+QUERY_COUNT = re.compile(r'desc="(\d+) queries"')
+
+
+class TestClientDriver:
+    name = 'test_client'
+
+    def __init__(self, app):
+        self.app = app
+
+    def session(self):
+        client = self.app.test_client()
+
+        def send(method, path, body=None, headers=None):
+            response = client.open(path, method=method, json=body, headers=headers)
+            return response.status_code, response.headers.get('Server-Timing', ''), response.data
+        return send
+
+    def close(self):
+        pass
+
+
+class WSGIDriver:
+    """Serves the app with werkzeug's threaded server on a free local port."""
+    name = 'wsgi'
+
+    def __init__(self, app):
+        WSGIRequestHandler.protocol_version = 'HTTP/1.1'
+        self.server = make_server('127.0.0.1', 0, app, threaded=True)
+        self.port = self.server.server_port
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def session(self):
+        # One keep-alive connection per simulated client
+        connection = http.client.HTTPConnection('127.0.0.1', self.port)
+
+        def send(method, path, body=None, headers=None):
+            headers = dict(headers or {})
+            payload = None
+            if body is not None:
+                payload = json.dumps(body)
+                headers['Content-Type'] = 'application/json'
+            connection.request(method, path, body=payload, headers=headers)
+            response = connection.getresponse()
+            data = response.read()
+            return response.status, response.getheader('Server-Timing', ''), data
+        return send
+
+    def close(self):
+        self.server.shutdown()
+
+
+DRIVERS = {'test_client': TestClientDriver, 'wsgi': WSGIDriver}
+
+
+class Recorder:
+    """Collects (latency, SQL statements, status) samples per endpoint."""
+
+    def __init__(self):
+        self.samples = {}
+        self._lock = threading.Lock()
+
+    def call(self, send, endpoint, method, path, body=None, headers=None):
+        start = time.perf_counter()
+        status, server_timing, data = send(method, path, body, headers)
+        elapsed = (time.perf_counter() - start) * 1000
+        match = QUERY_COUNT.search(server_timing)
+        with self._lock:
+            self.samples.setdefault(endpoint, []).append(
+                (elapsed, int(match.group(1)) if match else None, status)
+            )
+        return status, data
+
+
+# Scenarios: each takes (call, context, rng) and performs one round ---------
+
+def browse_catalog(call, context, rng):
+    call('GET /api/cakes', 'GET', '/api/cakes')
+    call('GET /api/customizations', 'GET', '/api/customizations')
+    call('GET /api/cakes/<id>', 'GET', f"/api/cakes/{rng.choice(context['cake_ids'])}")
+
+
+def place_order(call, context, rng):
+    selection = {
+        'cake_id': rng.choice(context['cake_ids']),
+        'quantity': rng.randint(1, 3),
+        'customizations': rng.sample(context['option_ids'], min(2, len(context['option_ids']))),
+    }
+    call('POST /api/quote', 'POST', '/api/quote', selection)
+    call('POST /api/orders', 'POST', '/api/orders', dict(
+        selection,
+        customer_name='Load Test',
+        customer_email='load@example.com',
+        customer_phone='555-000-0000',
+        delivery_date=(date.today() + timedelta(days=rng.randint(2, 30))).isoformat(),
+    ))
+
+
+def admin_dashboard(call, context, rng):
+    call('GET /api/admin/dashboard/stats', 'GET', '/api/admin/dashboard/stats', headers=context['admin'])
+
+
+def admin_order_paging(call, context, rng, pages=5):
+    # One offset page, then keyset pages following next_cursor
+    call('GET /api/admin/orders?page', 'GET', f'/api/admin/orders?page={rng.randint(1, 50)}',
+         headers=context['admin'])
+    cursor = ''
+    for _ in range(pages):
+        status, data = call('GET /api/admin/orders?cursor', 'GET', f'/api/admin/orders?cursor={quote(cursor)}',
+                            headers=context['admin'])
+        cursor = json.loads(data).get('next_cursor') if status == 200 else None
+        if not cursor:
+            break
+
+
+SCENARIOS = {
+    'browse_catalog': browse_catalog,
+    'place_order': place_order,
+    'admin_dashboard': admin_dashboard,
+    'admin_order_paging': admin_order_paging,
+}
+
+
+def percentile(sorted_values, fraction):
+    # Nearest-rank percentile
+    if not sorted_values:
+        return None
+    index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return round(sorted_values[index], 3)
+
+
+def summarize(samples, wall_seconds):
+    latencies = sorted(sample[0] for sample in samples)
+    queries = [sample[1] for sample in samples if sample[1] is not None]
+    return {
+        'requests': len(samples),
+        'errors': sum(1 for sample in samples if sample[2] >= 400),
+        'throughput_rps': round(len(samples) / wall_seconds, 1),
+        'p50_ms': percentile(latencies, 0.50),
+        'p95_ms': percentile(latencies, 0.95),
+        'p99_ms': percentile(latencies, 0.99),
+        'mean_queries': round(sum(queries) / len(queries), 2) if queries else None,
+        'max_queries': max(queries) if queries else None,
+    }
+
+
+def run_scenario(driver, scenario, context, iterations, concurrency, seed):
+    recorder = Recorder()
+
+    def client(worker):
+        send = driver.session()
+        rng = random.Random(seed * 1000 + worker)
+
+        def call(endpoint, method, path, body=None, headers=None):
+            return recorder.call(send, endpoint, method, path, body, headers)
+
+        for _ in range(iterations):
+            scenario(call, context, rng)
+
+    # One untimed round warms caches and connection pools
+    warm_up = Recorder()
+    warm_send = driver.session()
+    scenario(lambda *args, **kwargs: warm_up.call(warm_send, *args, **kwargs), context, random.Random(seed))
+
+    threads = [threading.Thread(target=client, args=(worker,)) for worker in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall_seconds = time.perf_counter() - start
+
+    all_samples = [sample for samples in recorder.samples.values() for sample in samples]
+    return dict(
+        summarize(all_samples, wall_seconds),
+        wall_seconds=round(wall_seconds, 3),
+        endpoints={
+            endpoint: summarize(samples, wall_seconds)
+            for endpoint, samples in sorted(recorder.samples.items())
+        }
+    )
+
+
+def load_context(app):
+    with app.app_context():
+        admin = User.query.filter_by(is_admin=True).first()
+        if admin is None:
+            admin = User(name='Load Admin', email='load-admin@example.com', password_hash='x', is_admin=True)
+            db.session.add(admin)
+            db.session.commit()
+        token = create_access_token(identity=str(admin.id), additional_claims=role_claims(admin))
+        context = {
+            'admin': {'Authorization': f'Bearer {token}'},
+            'cake_ids': [row[0] for row in db.session.query(Cake.id)],
+            'option_ids': [row[0] for row in db.session.query(CustomizationOption.id).filter_by(active=True)],
+        }
+        dataset = {
+            'users': db.session.query(db.func.count(User.id)).scalar(),
+            'orders': db.session.query(db.func.count(Order.id)).scalar(),
+            'customization_options': db.session.query(db.func.count(CustomizationOption.id)).scalar(),
+        }
+    return context, dataset
+
+
+def main():
+    parser = argparse.ArgumentParser(description='API load and benchmark suite')
+    parser.add_argument('--driver', choices=sorted(DRIVERS), default='test_client')
+    parser.add_argument('--scenarios', nargs='+', choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument('--iterations', type=int, default=50, help='rounds per client thread')
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--seed-data', action='store_true', help='(re)generate the synthetic dataset first')
+    parser.add_argument('--users', type=int, default=10000)
+    parser.add_argument('--orders', type=int, default=100000)
+    parser.add_argument('--options', type=int, default=500)
+    parser.add_argument('--output', help='write the JSON report to this file instead of stdout')
+    args = parser.parse_args()
+
+    app = make_app(BenchConfig)
+
+    if args.seed_data:
+        import bulk_seed
+        plan = bulk_seed.SeedPlan.scaled(1, users=args.users, orders=args.orders, options=args.options, seed=args.seed)
+        bulk_seed.seed(plan, app=app, log=lambda message: print(message, file=sys.stderr))
+
+    context, dataset = load_context(app)
+    if not context['cake_ids']:
+        sys.exit('No cakes in the benchmark database; run with --seed-data or bulk_seed.py first')
+
+    driver = DRIVERS[args.driver](app)
+    try:
+        results = {
+            name: run_scenario(driver, SCENARIOS[name], context, args.iterations, args.concurrency, args.seed)
+            for name in args.scenarios
+        }
+    finally:
+        driver.close()
+
+    report = json.dumps({
+        'benchmark': 'load_suite',
+        'driver': driver.name,
+        'database': app.config['SQLALCHEMY_DATABASE_URI'].split(':', 1)[0],
+        'concurrency': args.concurrency,
+        'iterations': args.iterations,
+        'dataset': dataset,
+        'scenarios': results,
+    }, indent=2)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(report + '\n')
+    else:
+        print(report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,336 @@
+# backend/bulk_seed.py
+# Fast, deterministic synthetic data for performance testing.
+#
+# Rows are streamed from generators straight into the database: COPY on
+# PostgreSQL, chunked executemany everywhere else. Primary keys are
+# assigned up front, so foreign keys never need a read-back, and every
+# synthetic user shares one precomputed password hash.
+#
+# Usage: python bulk_seed.py [--scale 10] [--seed 42] [--as-of 2026-01-01]
+#        python bulk_seed.py --users 100000 --orders 1000000 --options 500
+import sys
+import os
+import argparse
+import random
+import time
+from datetime import date, datetime, timedelta
+
+# Add the current directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app
+from extensions import db, password_hasher
+from models.cake import Cake
+from models.customization import CustomizationOption
+from models.delivery_capacity import DeliveryCapacity
+from models.email_outbox import EmailOutbox
+from models.idempotency_key import IdempotencyKey
+from models.order import Order
+from models.order_customization import OrderCustomization
+from models.User import User
+from services import capacity_service
+
+# Rows generated per unit of --scale
+SCALE_UNIT = {'users': 10000, 'orders': 100000, 'options': 50, 'cakes': 20}
+
+DEFAULT_PASSWORD = 'password123'
+OPTION_CATEGORIES = ['Design', 'Flavor', 'Topping', 'Art']
+ORDER_STATUSES = ['pending', 'confirmed', 'completed', 'cancelled']
+SPECIAL_REQUESTS = ['', '', '', 'Please add a birthday message', 'Eggless please', 'Deliver before noon']
+
+# Children first, so plain DELETEs never trip a foreign key
+TABLES_TO_CLEAR = [OrderCustomization, EmailOutbox, IdempotencyKey, DeliveryCapacity, Order, Cake, User,
+                   CustomizationOption]
+
+
+class SeedPlan:
+    """Row counts plus the seed and reference date that make a run reproducible."""
+
+    def __init__(self, users, orders, options, cakes, seed=42, as_of=None, password=DEFAULT_PASSWORD):
+        self.users = users
+        self.orders = orders
+        self.options = options
+        self.cakes = cakes
+        self.seed = seed
+        self.as_of = datetime.combine(as_of or date.today(), datetime.min.time())
+        self.password = password
+
+    @classmethod
+    def scaled(cls, scale, **overrides):
+        counts = {name: max(1, int(count * scale)) for name, count in SCALE_UNIT.items()}
+        counts.update({name: value for name, value in overrides.items() if value is not None})
+        return cls(**counts)
+
+    def cake_price(self, cake_id):
+        return float(30 + (cake_id % 20) * 2)
+
+    def option_price(self, option_id):
+        return float((option_id * 7) % 21 * 50)
+
+    def option_active(self, option_id):
+        return option_id % 10 != 0
+
+
+# Row generators -------------------------------------------------------------
+# Each yields tuples in the column order listed for its model in COLUMNS
+
+def option_rows(plan):
+    for option_id in range(1, plan.options + 1):
+        yield (option_id, OPTION_CATEGORIES[option_id % len(OPTION_CATEGORIES)], f'Option {option_id}',
+               plan.option_price(option_id), plan.option_active(option_id), 'Synthetic option', None)
+
+
+def cake_rows(plan):
+    for cake_id in range(1, plan.cakes + 1):
+        yield (cake_id, f'Synthetic Cake {cake_id}', 'Synthetic cake', plan.cake_price(cake_id), '',
+               plan.as_of, plan.as_of)
+
+
+def user_rows(plan, password_hash):
+    rng = random.Random(plan.seed)
+    # User 1 is the admin; synthetic customers are 2..users+1
+    yield (1, 'Admin', 'admin@example.com', password_hash, None, None, None, True, plan.as_of, plan.as_of)
+    for user_id in range(2, plan.users + 2):
+        created_at = plan.as_of - timedelta(seconds=rng.randint(0, 2 * 365 * 86400))
+        yield (user_id, f'User {user_id}', f'user{user_id}@example.com', password_hash,
+               f'555-{user_id % 1000:03d}-{user_id % 10000:04d}', None, None, False, created_at, created_at)
+
+
+def _orders(plan):
+    """(order row, option ids) pairs; running it twice gives the same sequence."""
+    rng = random.Random(plan.seed + 1)
+    randrange, uniform = rng.randrange, rng.random
+    active_options = [option_id for option_id in range(1, plan.options + 1) if plan.option_active(option_id)]
+    cake_prices = [None] + [plan.cake_price(cake_id) for cake_id in range(1, plan.cakes + 1)]
+    option_prices = {option_id: plan.option_price(option_id) for option_id in active_options}
+    window = 2 * 365 * 86400
+    for order_id in range(1, plan.orders + 1):
+        cake_id = randrange(plan.cakes) + 1
+        quantity = randrange(3) + 1
+        # 0, 1 or 2 distinct options
+        picks = min(len(active_options), randrange(3))
+        chosen = rng.sample(active_options, picks) if picks > 1 else \
+            [active_options[randrange(len(active_options))]] if picks else []
+        unit_price = cake_prices[cake_id] + sum(option_prices[option_id] for option_id in chosen)
+        created_at = plan.as_of - timedelta(seconds=randrange(window))
+        user_id = randrange(plan.users) + 2 if uniform() < 0.8 else None
+        row = (order_id, user_id, cake_id, quantity, 'Synthetic Customer', f'customer{order_id % 5000}@example.com',
+               '555-000-0000', (created_at + timedelta(days=randrange(30) + 1)).date(),
+               SPECIAL_REQUESTS[randrange(len(SPECIAL_REQUESTS))], unit_price * quantity,
+               ORDER_STATUSES[randrange(len(ORDER_STATUSES))], created_at, created_at)
+        yield row, chosen
+
+
+def order_rows(plan):
+    for row, _ in _orders(plan):
+        yield row
+
+
+def order_customization_rows(plan):
+    link_id = 0
+    for row, chosen in _orders(plan):
+        for option_id in chosen:
+            link_id += 1
+            yield (link_id, row[0], option_id)
+
+
+# Generator columns per model, in the order the generators yield them
+COLUMNS = {
+    CustomizationOption: ['id', 'category', 'name', 'price', 'active', 'description', 'image_url'],
+    Cake: ['id', 'name', 'description', 'price', 'image_url', 'created_at', 'updated_at'],
+    User: ['id', 'name', 'email', 'password_hash', 'phone', 'address', 'preferences', 'is_admin',
+             'created_at', 'updated_at'],
+    Order: ['id', 'user_id', 'cake_id', 'quantity', 'customer_name', 'customer_email', 'customer_phone',
+              'delivery_date', 'special_requests', 'total_price', 'status', 'created_at', 'updated_at'],
+    OrderCustomization: ['id', 'order_id', 'customization_option_id'],
+}
+
+
+# Writers --------------------------------------------------------------------
+
+def _copy_text(value):
+    return value.replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+
+# COPY text-format rendering by Python type
+COPY_FORMATS = {
+    type(None): lambda value: '\\N',
+    bool: lambda value: 't' if value else 'f',
+    int: str,
+    float: repr,
+    str: _copy_text,
+    date: date.isoformat,
+    datetime: lambda value: value.isoformat(sep=' '),
+}
+
+
+def _copy_line(row):
+    return '\t'.join([COPY_FORMATS[type(value)](value) for value in row])
+
+
+class CopyStream:
+    """File-like object that renders generator rows in COPY text format on demand."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.count = 0
+        self._buffer = b''
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            lines = []
+            for row in self.rows:
+                lines.append(_copy_line(row))
+                if len(lines) == 1000:
+                    break
+            if not lines:
+                break
+            self.count += len(lines)
+            self._buffer += ('\n'.join(lines) + '\n').encode('utf-8')
+        if size < 0:
+            size = len(self._buffer)
+        chunk, self._buffer = self._buffer[:size], self._buffer[size:]
+        return chunk
+
+    readline = read
+
+
+def copy_rows(engine, model, rows, batch_size=None):
+    """Stream rows into the model's table with PostgreSQL COPY; returns the row count."""
+    quote = engine.dialect.identifier_preparer.quote
+    table, columns = model.__table__.name, COLUMNS[model]
+    stream = CopyStream(rows)
+    connection = engine.raw_connection()
+    try:
+        with connection.cursor() as cursor:
+            cursor.copy_expert(
+                f'COPY {quote(table)} ({", ".join(quote(column) for column in columns)}) FROM STDIN', stream
+            )
+        connection.commit()
+    finally:
+        connection.close()
+    return stream.count
+
+
+def executemany_rows(engine, model, rows, batch_size=10000):
+    """Insert rows with the driver's executemany, `batch_size` at a time."""
+    dialect = engine.dialect
+    quote = dialect.identifier_preparer.quote
+    table, columns = model.__table__.name, COLUMNS[model]
+    # Raw DBAPI calls skip SQLAlchemy's type conversion, so apply the
+    # column types' bind processors (e.g. datetimes to strings on SQLite)
+    processors = [model.__table__.c[column].type.dialect_impl(dialect).bind_processor(dialect) for column in columns]
+    if any(processors):
+        rows = (tuple(value if process is None or value is None else process(value)
+                      for process, value in zip(processors, row)) for row in rows)
+    placeholder = '?' if dialect.paramstyle == 'qmark' else '%s'
+    sql = (f'INSERT INTO {quote(table)} ({", ".join(quote(column) for column in columns)}) '
+           f'VALUES ({", ".join([placeholder] * len(columns))})')
+
+    count = 0
+    with engine.begin() as connection:
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == batch_size:
+                connection.exec_driver_sql(sql, batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            connection.exec_driver_sql(sql, batch)
+            count += len(batch)
+    return count
+
+
+def clear_tables(engine, models=TABLES_TO_CLEAR):
+    """Empty the models' tables, children first; TRUNCATE on PostgreSQL."""
+    tables = [model.__table__.name for model in models]
+    quote = engine.dialect.identifier_preparer.quote
+    with engine.begin() as connection:
+        if engine.dialect.name == 'postgresql':
+            connection.exec_driver_sql(
+                f'TRUNCATE {", ".join(quote(table) for table in tables)} RESTART IDENTITY CASCADE'
+            )
+        else:
+            for table in tables:
+                connection.exec_driver_sql(f'DELETE FROM {quote(table)}')
+
+
+def reset_sequences(engine, tables):
+    """Move PostgreSQL id sequences past the explicitly inserted ids."""
+    if engine.dialect.name != 'postgresql':
+        return
+    quote = engine.dialect.identifier_preparer.quote
+    with engine.begin() as connection:
+        for table in tables:
+            connection.exec_driver_sql(
+                f"SELECT setval(pg_get_serial_sequence('{quote(table)}', 'id'), "
+                f"COALESCE((SELECT MAX(id) FROM {quote(table)}), 0) + 1, false)"
+            )
+
+
+def seed(plan, app=None, batch_size=10000, log=print):
+    """Replace the catalog, users and orders with the rows described by `plan`.
+
+    Returns {table: {'rows': n, 'seconds': s}}.
+    """
+    app = app or create_app(register_blueprints=False)
+    with app.app_context():
+        engine = db.engine
+        # Hash once; every synthetic user gets the same (valid) hash
+        password_hash = password_hasher.hash(plan.password)
+
+        start = time.perf_counter()
+        clear_tables(engine)
+        log(f'Cleared tables in {time.perf_counter() - start:.2f}s')
+
+        write = copy_rows if engine.dialect.name == 'postgresql' else executemany_rows
+        sources = [
+            (CustomizationOption, option_rows(plan)),
+            (Cake, cake_rows(plan)),
+            (User, user_rows(plan, password_hash)),
+            (Order, order_rows(plan)),
+            (OrderCustomization, order_customization_rows(plan)),
+        ]
+        report = {}
+        for model, rows in sources:
+            table = model.__table__.name
+            start = time.perf_counter()
+            count = write(engine, model, rows, batch_size)
+            elapsed = time.perf_counter() - start
+            report[table] = {'rows': count, 'seconds': round(elapsed, 2)}
+            log(f'{table}: {count} rows in {elapsed:.2f}s ({count / max(elapsed, 1e-9):,.0f} rows/s)')
+
+        reset_sequences(engine, [model.__table__.name for model in COLUMNS])
+
+        # The orders bypassed the capacity service, so count their cakes now
+        start = time.perf_counter()
+        days = capacity_service.recount()
+        db.session.commit()
+        log(f'delivery_capacity: {days} dates recounted in {time.perf_counter() - start:.2f}s')
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk synthetic data generator')
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help='multiples of 10k users / 100k orders / 50 options / 20 cakes')
+    parser.add_argument('--users', type=int)
+    parser.add_argument('--orders', type=int)
+    parser.add_argument('--options', type=int)
+    parser.add_argument('--cakes', type=int)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--as-of', type=date.fromisoformat, help='reference date for timestamps (default today)')
+    parser.add_argument('--batch-size', type=int, default=10000, help='executemany batch size (non-PostgreSQL)')
+    args = parser.parse_args()
+
+    plan = SeedPlan.scaled(args.scale, users=args.users, orders=args.orders, options=args.options,
+                           cakes=args.cakes, seed=args.seed, as_of=args.as_of)
+
+    start = time.perf_counter()
+    seed(plan, batch_size=args.batch_size)
+    print(f'Done in {time.perf_counter() - start:.2f}s. Admin login: admin@example.com / {plan.password}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,23 +1,18 @@
 # backend/controllers/admin_controller.py
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from extensions import db
+from flask import Blueprint, current_app, request, jsonify, Response, stream_with_context
+from extensions import db, cache
 from models.User import User
 from models.order import Order
 from models.cake import Cake
+from models.image_asset import ImageAsset
+from services.cache_service import CATALOG_NAMESPACE
+from services.auth_service import admin_required
+from services import stats_service, query_service, pagination, export_service, serializers, db_service, email_service, image_service, capacity_service, order_service, production_service
 from marshmallow import Schema, fields, EXCLUDE
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 
 admin_bp = Blueprint('admin', __name__)
 
-# Admin authorization check
-def require_admin():
-    user_id = get_jwt_identity()
-    user = User.query.get(int(user_id))
-    if not user or not user.is_admin:
-        return False
-    return True
-
 # Schemas
 class CakeSchema(Schema):
     class Meta:
@@ -28,11 +23,11 @@ class CakeSchema(Schema):
     description = fields.Str(required=True)
     price = fields.Float(required=True)
     image_url = fields.Str(required=True)
+    image_variants = fields.Function(lambda cake: serializers.json_list(cake.image_variants))
     created_at = fields.DateTime(dump_only=True)
     updated_at = fields.DateTime(dump_only=True)
 
 cake_schema = CakeSchema()
-cakes_schema = CakeSchema(many=True)
 
 class OrderSchema(Schema):
     class Meta:
@@ -54,92 +49,53 @@ class OrderSchema(Schema):
     user_email = fields.Str(attribute="user.email")
 
 order_schema = OrderSchema()
-orders_schema = OrderSchema(many=True)
 
 # Admin Dashboard Statistics
 @admin_bp.route('/dashboard/stats', methods=['GET'])
-@jwt_required()
+@admin_required
 def get_dashboard_stats():
-    if not require_admin():
-        return jsonify({'message': 'Admin access required'}), 403
-    
     try:
-        # Total users
-        total_users = User.query.count()
-        
-        # Total orders
-        total_orders = Order.query.count()
-        
-        # Orders by status
-        orders_by_status = {
-            'pending': Order.query.filter_by(status='pending').count(),
-            'confirmed': Order.query.filter_by(status='confirmed').count(),
-            'completed': Order.query.filter_by(status='completed').count(),
-            'cancelled': Order.query.filter_by(status='cancelled').count()
-        }
-        
-        # Recent orders (last 7 days)
-        seven_days_ago = datetime.now() - timedelta(days=7)
-        recent_orders = Order.query.filter(Order.created_at >= seven_days_ago).count()
-        
-        # Total revenue
-        total_revenue = db.session.query(db.func.sum(Order.total_price)).filter(
-            Order.status.in_(['completed', 'confirmed'])
-        ).scalar() or 0
-        
-        return jsonify({
-            'total_users': total_users,
-            'total_orders': total_orders,
-            'orders_by_status': orders_by_status,
-            'recent_orders': recent_orders,
-            'total_revenue': float(total_revenue)
-        })
+        # All order aggregates plus the user total in a single query
+        return jsonify(stats_service.get_dashboard_stats())
         
     except Exception as e:
         print(f"Error fetching admin stats: {str(e)}")
         return jsonify({'message': 'Internal server error'}), 500
 
 # Get all orders with pagination
+# Passing `cursor` (empty for the first page) switches to keyset pagination,
+# which skips the COUNT(*) unless `total=exact|approximate` is requested
 @admin_bp.route('/orders', methods=['GET'])
-@jwt_required()
+@admin_required
 def get_all_orders_admin():
-    if not require_admin():
-        return jsonify({'message': 'Admin access required'}), 403
-    
     try:
         page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 20, type=int)
+        per_page = pagination.per_page_arg(request.args)
         status_filter = request.args.get('status', type=str)
+        cursor = request.args.get('cursor', type=str)
         
-        query = Order.query.order_by(Order.created_at.desc())
+        # Plain rows with cake name and user email joined in, no ORM objects
+        query = query_service.order_rows(serializers.ADMIN_ORDER.names, db_service.read_session())
         
         if status_filter:
-            query = query.filter_by(status=status_filter)
+            query = query.filter(Order.status == status_filter)
+        
+        if cursor is not None:
+            result = pagination.keyset_page(query, Order, cursor=cursor, per_page=per_page)
+            return jsonify({
+                'orders': serializers.ADMIN_ORDER.many(result['items']),
+                'next_cursor': result['next_cursor'],
+                'prev_cursor': result['prev_cursor'],
+                'total': pagination.count_total(query, request.args.get('total'))
+            })
         
-        paginated_orders = query.paginate(
+        paginated_orders = query.order_by(Order.created_at.desc()).paginate(
             page=page, 
             per_page=per_page, 
             error_out=False
         )
         
-        orders_data = []
-        for order in paginated_orders.items:
-            orders_data.append({
-                'id': order.id,
-                'user_id': order.user_id,
-                'cake_id': order.cake_id,
-                'quantity': order.quantity,
-                'customer_name': order.customer_name,
-                'customer_email': order.customer_email,
-                'customer_phone': order.customer_phone,
-                'delivery_date': order.delivery_date.isoformat() if order.delivery_date else None,
-                'special_requests': order.special_requests,
-                'total_price': order.total_price,
-                'status': order.status,
-                'created_at': order.created_at.isoformat() if order.created_at else None,
-                'cake_name': order.cake.name if order.cake else 'Unknown Cake',
-                'user_email': order.user.email if order.user else 'Guest'
-            })
+        orders_data = serializers.ADMIN_ORDER.many(paginated_orders.items)
         
         return jsonify({
             'orders': orders_data,
@@ -148,17 +104,88 @@ def get_all_orders_admin():
             'current_page': page
         })
         
+    except (pagination.InvalidCursor, pagination.InvalidPageSize) as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         print(f"Error fetching orders: {str(e)}")
         return jsonify({'message': 'Internal server error'}), 500
 
+# Export orders as a streamed NDJSON or CSV download
+# Accepts the same `status` filter as the listing plus an inclusive
+# `start_date` / `end_date` range (YYYY-MM-DD) on the order creation date
+@admin_bp.route('/orders/export', methods=['GET'])
+@admin_required
+def export_orders():
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in ('ndjson', 'csv'):
+        return jsonify({'message': 'Format must be ndjson or csv'}), 400
+    
+    try:
+        start_date = request.args.get('start_date', type=str)
+        end_date = request.args.get('end_date', type=str)
+        start_date = datetime.strptime(start_date, '%Y-%m-%d').date() if start_date else None
+        end_date = datetime.strptime(end_date, '%Y-%m-%d').date() if end_date else None
+    except ValueError:
+        return jsonify({'message': 'Invalid date format. Use YYYY-MM-DD'}), 400
+    
+    query = export_service.order_export_query(
+        status=request.args.get('status', type=str),
+        start_date=start_date,
+        end_date=end_date
+    )
+    rows = export_service.iter_order_rows(query)
+    
+    if export_format == 'csv':
+        body, mimetype = export_service.csv_chunks(rows), 'text/csv'
+    else:
+        body, mimetype = export_service.ndjson_chunks(rows), 'application/x-ndjson'
+    
+    return Response(
+        stream_with_context(body),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename=orders.{export_format}'}
+    )
+
+# Bake sheet: cakes and customization options to produce per delivery date,
+# as JSON or a streamed CSV. `start_date` / `end_date` (YYYY-MM-DD, inclusive)
+# default to the coming week
+@admin_bp.route('/production/bake-sheet', methods=['GET'])
+@admin_required
+def get_bake_sheet():
+    export_format = request.args.get('format', 'json')
+    if export_format not in ('json', 'csv'):
+        return jsonify({'message': 'Format must be json or csv'}), 400
+    
+    try:
+        start_date = request.args.get('start_date', type=str)
+        end_date = request.args.get('end_date', type=str)
+        start_date = datetime.strptime(start_date, '%Y-%m-%d').date() if start_date else date.today()
+        end_date = datetime.strptime(end_date, '%Y-%m-%d').date() if end_date else start_date + timedelta(days=6)
+    except ValueError:
+        return jsonify({'message': 'Invalid date format. Use YYYY-MM-DD'}), 400
+    
+    max_days = current_app.config['BAKE_SHEET_MAX_DAYS']
+    if end_date < start_date or (end_date - start_date).days >= max_days:
+        return jsonify({'message': f'The range must run forwards and span at most {max_days} days'}), 400
+    
+    if export_format == 'csv':
+        return Response(
+            stream_with_context(production_service.csv_chunks(start_date, end_date)),
+            mimetype='text/csv',
+            headers={'Content-Disposition': f'attachment; filename=bake-sheet-{start_date.isoformat()}.csv'}
+        )
+    
+    try:
+        body = production_service.json_body(start_date, end_date)
+        return current_app.response_class(body, mimetype='application/json')
+    except Exception as e:
+        print(f"Error building bake sheet: {str(e)}")
+        return jsonify({'message': 'Internal server error'}), 500
+
 # Update order status
 @admin_bp.route('/orders/<int:order_id>/status', methods=['PUT'])
-@jwt_required()
+@admin_required
 def update_order_status(order_id):
-    if not require_admin():
-        return jsonify({'message': 'Admin access required'}), 403
-    
     try:
         data = request.get_json()
         new_status = data.get('status')
@@ -171,29 +198,88 @@ def update_order_status(order_id):
             return jsonify({'message': 'Invalid status'}), 400
         
         order = Order.query.get_or_404(order_id)
-        order.status = new_status
+        # Cancelling frees the cakes' delivery capacity; reinstating books it again
+        changed = order_service.change_status(order, new_status)
+        
+        # Let the customer know, in the same transaction as the change
+        if changed:
+            email_service.enqueue(email_service.order_status_changed(order))
         db.session.commit()
+        if changed:
+            email_service.notify()
+            production_service.invalidate(order.delivery_date)
         
         return jsonify({
             'message': 'Order status updated successfully',
             'order': order_schema.dump(order)
         })
         
+    except order_service.OrderError as e:
+        db.session.rollback()
+        return jsonify({'message': e.message}), e.status
     except Exception as e:
         db.session.rollback()
         print(f"Error updating order status: {str(e)}")
         return jsonify({'message': 'Internal server error'}), 500
 
+# Delivery capacity for a range of dates, past ones included
+@admin_bp.route('/delivery-capacity', methods=['GET'])
+@admin_required
+def get_delivery_capacity():
+    try:
+        max_days = current_app.config['DELIVERY_AVAILABILITY_DAYS']
+        start = request.args.get('start', type=date.fromisoformat) or capacity_service.first_bookable_date()
+        days = request.args.get('days', max_days, type=int)
+        if days < 1 or days > 366:
+            return jsonify({'message': 'days must be between 1 and 366'}), 400
+        
+        return jsonify({
+            'start': start.isoformat(),
+            'default_capacity': capacity_service.default_capacity(),
+            'days': capacity_service.availability(start, days),
+        })
+        
+    except Exception as e:
+        print(f"Error fetching delivery capacity: {str(e)}")
+        return jsonify({'message': 'Internal server error'}), 500
+
+# Set one date's capacity (null goes back to the default); 0 closes the date
+@admin_bp.route('/delivery-capacity/<delivery_date>', methods=['PUT'])
+@admin_required
+def set_delivery_capacity(delivery_date):
+    try:
+        try:
+            day = date.fromisoformat(delivery_date)
+        except ValueError:
+            return jsonify({'message': 'Invalid date format. Use YYYY-MM-DD'}), 400
+        
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict) or 'capacity' not in data:
+            return jsonify({'message': 'capacity is required'}), 400
+        capacity = data['capacity']
+        if capacity is not None and (isinstance(capacity, bool) or not isinstance(capacity, int) or capacity < 0):
+            return jsonify({'message': 'capacity must be a non-negative integer or null'}), 400
+        
+        capacity_service.set_capacity(day, capacity)
+        db.session.commit()
+        
+        return jsonify({
+            'message': 'Delivery capacity updated successfully',
+            'day': capacity_service.availability(day, 1)[0],
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error updating delivery capacity: {str(e)}")
+        return jsonify({'message': 'Internal server error'}), 500
+
 # Get all cakes
 @admin_bp.route('/cakes', methods=['GET'])
-@jwt_required()
+@admin_required
 def get_all_cakes_admin():
-    if not require_admin():
-        return jsonify({'message': 'Admin access required'}), 403
-    
     try:
-        cakes = Cake.query.order_by(Cake.name).all()
-        return jsonify(cakes_schema.dump(cakes))
+        cakes = query_service.cake_rows(serializers.ADMIN_CAKE.names).order_by(Cake.name).all()
+        return jsonify(serializers.ADMIN_CAKE.many(cakes))
         
     except Exception as e:
         print(f"Error fetching cakes: {str(e)}")
@@ -201,16 +287,14 @@ def get_all_cakes_admin():
 
 # Create new cake
 @admin_bp.route('/cakes', methods=['POST'])
-@jwt_required()
+@admin_required
 def create_cake():
-    if not require_admin():
-        return jsonify({'message': 'Admin access required'}), 403
-    
     try:
         data = request.get_json()
         
-        # Validate required fields
-        required_fields = ['name', 'description', 'price', 'image_url']
+        # Validate required fields (the image can be uploaded afterwards
+        # through POST /cakes/<id>/image instead of given as a URL)
+        required_fields = ['name', 'description', 'price']
         for field in required_fields:
             if field not in data or not data[field]:
                 return jsonify({'message': f'Missing required field: {field}'}), 400
@@ -220,11 +304,12 @@ def create_cake():
             name=data['name'],
             description=data['description'],
             price=float(data['price']),
-            image_url=data['image_url']
+            image_url=data.get('image_url') or None
         )
         
         db.session.add(new_cake)
         db.session.commit()
+        cache.bump(CATALOG_NAMESPACE)
         
         return jsonify({
             'message': 'Cake created successfully',
@@ -238,11 +323,8 @@ def create_cake():
 
 # Update cake
 @admin_bp.route('/cakes/<int:cake_id>', methods=['PUT'])
-@jwt_required()
+@admin_required
 def update_cake(cake_id):
-    if not require_admin():
-        return jsonify({'message': 'Admin access required'}), 403
-    
     try:
         cake = Cake.query.get_or_404(cake_id)
         data = request.get_json()
@@ -253,10 +335,14 @@ def update_cake(cake_id):
             cake.description = data['description']
         if 'price' in data:
             cake.price = float(data['price'])
-        if 'image_url' in data:
+        if 'image_url' in data and data['image_url'] != cake.image_url:
+            # A new URL replaces any uploaded image
             cake.image_url = data['image_url']
+            cake.image_hash = None
+            cake.image_variants = None
         
         db.session.commit()
+        cache.bump(CATALOG_NAMESPACE)
         
         return jsonify({
             'message': 'Cake updated successfully',
@@ -270,11 +356,8 @@ def update_cake(cake_id):
 
 # Delete cake
 @admin_bp.route('/cakes/<int:cake_id>', methods=['DELETE'])
-@jwt_required()
+@admin_required
 def delete_cake(cake_id):
-    if not require_admin():
-        return jsonify({'message': 'Admin access required'}), 403
-    
     try:
         cake = Cake.query.get_or_404(cake_id)
         
@@ -284,6 +367,7 @@ def delete_cake(cake_id):
         
         db.session.delete(cake)
         db.session.commit()
+        cache.bump(CATALOG_NAMESPACE)
         
         return jsonify({'message': 'Cake deleted successfully'})
         
@@ -292,34 +376,69 @@ def delete_cake(cake_id):
         print(f"Error deleting cake: {str(e)}")
         return jsonify({'message': 'Internal server error'}), 500
 
+# Upload a cake image (multipart field "image"). Returns 202 while the
+# variants are made in the background, or 200 if this file was seen before
+@admin_bp.route('/cakes/<int:cake_id>/image', methods=['POST'])
+@admin_required
+def upload_cake_image(cake_id):
+    cake = Cake.query.get_or_404(cake_id)
+    try:
+        asset = image_service.upload(cake, request.files.get('image'))
+        return jsonify({'image': image_service.asset_data(asset)}), 202 if asset.status == 'pending' else 200
+
+    except image_service.ImageError as e:
+        return jsonify({'message': str(e)}), 400
+    except image_service.ImageQueueFull:
+        db.session.rollback()
+        response = jsonify({'message': 'Image processing is busy, please try again'})
+        response.status_code = 503
+        response.headers['Retry-After'] = '5'
+        return response
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error uploading cake image: {str(e)}")
+        return jsonify({'message': 'Internal server error'}), 500
+
+# Processing status and variants of an uploaded image
+@admin_bp.route('/images/<source_hash>', methods=['GET'])
+@admin_required
+def get_image(source_hash):
+    asset = ImageAsset.query.filter_by(source_hash=source_hash).first_or_404()
+    return jsonify(image_service.asset_data(asset))
+
+def admin_users_data(rows):
+    # One grouped COUNT for the whole page instead of loading every user's orders
+    order_counts = query_service.order_counts_for([row.id for row in rows], db_service.read_session())
+    return serializers.ADMIN_USER.many((*row, order_counts.get(row.id, 0)) for row in rows)
+
 # Get all users
+# Supports the same `cursor` / `total` keyset parameters as the orders listing
 @admin_bp.route('/users', methods=['GET'])
-@jwt_required()
+@admin_required
 def get_all_users():
-    if not require_admin():
-        return jsonify({'message': 'Admin access required'}), 403
-    
     try:
         page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 20, type=int)
+        per_page = pagination.per_page_arg(request.args)
+        cursor = request.args.get('cursor', type=str)
+        
+        query = query_service.user_rows(serializers.ADMIN_USER.names, db_service.read_session())
+        
+        if cursor is not None:
+            result = pagination.keyset_page(query, User, cursor=cursor, per_page=per_page)
+            return jsonify({
+                'users': admin_users_data(result['items']),
+                'next_cursor': result['next_cursor'],
+                'prev_cursor': result['prev_cursor'],
+                'total': pagination.count_total(query, request.args.get('total'))
+            })
         
-        users = User.query.order_by(User.created_at.desc()).paginate(
+        users = query.order_by(User.created_at.desc()).paginate(
             page=page, 
             per_page=per_page, 
             error_out=False
         )
         
-        users_data = []
-        for user in users.items:
-            users_data.append({
-                'id': user.id,
-                'name': user.name,
-                'email': user.email,
-                'phone': user.phone,
-                'is_admin': user.is_admin,
-                'created_at': user.created_at.isoformat() if user.created_at else None,
-                'order_count': len(user.orders)
-            })
+        users_data = admin_users_data(users.items)
         
         return jsonify({
             'users': users_data,
@@ -328,6 +447,14 @@ def get_all_users():
             'current_page': page
         })
         
+    except (pagination.InvalidCursor, pagination.InvalidPageSize) as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         print(f"Error fetching users: {str(e)}")
-        return jsonify({'message': 'Internal server error'}), 500
\ No newline at end of file
+        return jsonify({'message': 'Internal server error'}), 500
+
+# Connection pool usage per database bind
+@admin_bp.route('/db/pool', methods=['GET'])
+@admin_required
+def get_pool_metrics():
+    return jsonify(db_service.pool_metrics())
\ No newline at end of file
@@ -3,6 +3,9 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
 from extensions import db
 from models.User import User
+from services.auth_service import role_claims
+from services.password_service import HashingBusy
+from services.rate_limit_service import rate_limited
 from marshmallow import Schema, fields, validate, EXCLUDE
 import json
 
@@ -51,7 +54,15 @@ class RegisterSchema(Schema):
 
 register_schema = RegisterSchema()
 
+# Password hashing is saturated; ask the client to retry shortly
+def server_busy():
+    response = jsonify({'message': 'Server busy, please try again'})
+    response.status_code = 503
+    response.headers['Retry-After'] = '1'
+    return response
+
 @auth_bp.route('/register', methods=['POST'])
+@rate_limited()
 def register():
     try:
         data = request.get_json()
@@ -79,20 +90,24 @@ def register():
         db.session.add(new_user)
         db.session.commit()
         
-        # Generate access token with string identity
-        access_token = create_access_token(identity=str(new_user.id))
+        # Generate access token with string identity and role claims
+        access_token = create_access_token(identity=str(new_user.id), additional_claims=role_claims(new_user))
         
         return jsonify({
             'token': access_token,
             'user': user_schema.dump(new_user)
         }), 201
         
+    except HashingBusy:
+        db.session.rollback()
+        return server_busy()
     except Exception as e:
         db.session.rollback()
         print(f"Error in register: {str(e)}")
         return jsonify({'message': 'Internal server error'}), 500
 
 @auth_bp.route('/login', methods=['POST'])
+@rate_limited()
 def login():
     try:
         data = request.get_json()
@@ -105,15 +120,23 @@ def login():
         if not user or not user.check_password(data['password']):
             return jsonify({'message': 'Invalid credentials'}), 401
         
-        # Generate access token with string identity
-        access_token = create_access_token(identity=str(user.id))
+        # Transparently upgrade hashes made with older algorithm/cost settings
+        if user.password_needs_rehash():
+            user.set_password(data['password'])
+            db.session.commit()
+        
+        # Generate access token with string identity and role claims
+        access_token = create_access_token(identity=str(user.id), additional_claims=role_claims(user))
         
         return jsonify({
             'token': access_token,
             'user': user_schema.dump(user)
         })
         
+    except HashingBusy:
+        return server_busy()
     except Exception as e:
+        db.session.rollback()
         print(f"Error in login: {str(e)}")
         return jsonify({'message': 'Internal server error'}), 500
 
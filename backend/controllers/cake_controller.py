@@ -1,7 +1,9 @@
 # backend/controllers/cake_controller.py
-from flask import Blueprint, jsonify, request
-from extensions import db
+from flask import Blueprint, jsonify, request, current_app
+from extensions import db, cache
 from models.cake import Cake
+from services.cache_service import CATALOG_NAMESPACE, cached_json_response
+from services import query_service, search_service, serializers
 from marshmallow import Schema, fields
 
 cake_bp = Blueprint('cakes', __name__)
@@ -13,19 +15,44 @@ class CakeSchema(Schema):
     description = fields.Str()
     price = fields.Float()
     image_url = fields.Str()
+    image_variants = fields.Function(lambda cake: serializers.json_list(cake.image_variants))
 
 cake_schema = CakeSchema()
 cakes_schema = CakeSchema(many=True)
 
+def build_catalog_payload():
+    cakes = query_service.cake_rows(serializers.CAKE.names).all()
+    return current_app.json.dumps(serializers.CAKE.many(cakes)).encode('utf-8'), None
+
+def build_cake_payload(id):
+    cake = Cake.query.get_or_404(id)
+    return current_app.json.dumps(cake_schema.dump(cake)).encode('utf-8'), cake.updated_at
+
+def catalog_payload():
+    return cache.get_or_build(CATALOG_NAMESPACE, 'cakes', build_catalog_payload)
+
+# Warm requests are served from the catalog cache without touching the ORM,
+# and matching If-None-Match requests get a 304 without a body
 @cake_bp.route('/cakes', methods=['GET'])
 def get_cakes():
-    cakes = Cake.query.all()
-    return jsonify(cakes_schema.dump(cakes))
+    return cached_json_response(catalog_payload())
+
+# Search by text (q) with min_price / max_price, sort and limit / offset;
+# returns one page of cakes plus the total and price facet counts
+@cake_bp.route('/cakes/search', methods=['GET'])
+def search_cakes():
+    try:
+        return jsonify(search_service.search(search_service.CAKES, request.args))
+    except search_service.SearchError as e:
+        return jsonify({'message': str(e)}), 400
+    except Exception as e:
+        print(f"Error searching cakes: {str(e)}")
+        return jsonify({'message': 'Internal server error'}), 500
 
 @cake_bp.route('/cakes/<int:id>', methods=['GET'])
 def get_cake(id):
-    cake = Cake.query.get_or_404(id)
-    return jsonify(cake_schema.dump(cake))
+    payload = cache.get_or_build(CATALOG_NAMESPACE, f'cake:{id}', lambda: build_cake_payload(id))
+    return cached_json_response(payload)
 
 # Admin endpoints for managing cakes (to be protected with auth in Phase 3)
 @cake_bp.route('/cakes', methods=['POST'])
@@ -39,6 +66,7 @@ def create_cake():
     )
     db.session.add(new_cake)
     db.session.commit()
+    cache.bump(CATALOG_NAMESPACE)
     return jsonify(cake_schema.dump(new_cake)), 201
 
 @cake_bp.route('/cakes/<int:id>', methods=['PUT'])
@@ -52,6 +80,7 @@ def update_cake(id):
     cake.image_url = data.get('image_url', cake.image_url)
     
     db.session.commit()
+    cache.bump(CATALOG_NAMESPACE)
     return jsonify(cake_schema.dump(cake))
 
 @cake_bp.route('/cakes/<int:id>', methods=['DELETE'])
@@ -59,4 +88,5 @@ def delete_cake(id):
     cake = Cake.query.get_or_404(id)
     db.session.delete(cake)
     db.session.commit()
+    cache.bump(CATALOG_NAMESPACE)
     return '', 204
\ No newline at end of file
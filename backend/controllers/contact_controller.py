@@ -1,5 +1,8 @@
 # backend/controllers/contact_controller.py
 from flask import Blueprint, request, jsonify
+from extensions import db
+from services import email_service
+from services.rate_limit_service import rate_limited
 from marshmallow import Schema, fields
 
 contact_bp = Blueprint('contact', __name__)
@@ -12,13 +15,21 @@ class ContactSchema(Schema):
 contact_schema = ContactSchema()
 
 @contact_bp.route('/contact', methods=['POST'])
+@rate_limited()
 def contact():
     data = request.get_json()
     errors = contact_schema.validate(data)
     if errors:
         return jsonify({'message': 'Validation error', 'errors': errors}), 400
     
-    # In Phase 3, this would send an email using SendGrid
-    print(f"Contact form submission from {data['name']} ({data['email']}): {data['message']}")
+    # Queue the message for the email dispatcher instead of sending inline
+    try:
+        email_service.enqueue(email_service.contact_message(data['name'], data['email'], data['message']))
+        db.session.commit()
+        email_service.notify()
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error queueing contact message: {str(e)}")
+        return jsonify({'message': 'Internal server error'}), 500
     
     return jsonify({'message': 'Thank you for your message! We will get back to you soon.'}), 200
\ No newline at end of file
@@ -61,9 +61,14 @@
 #     db.session.commit()
 #     return "", 204
 
-from flask import Blueprint, request, jsonify
-from extensions import db
+from flask import Blueprint, request, jsonify, current_app
+from extensions import db, cache
 from models.customization import CustomizationOption
+from models.order_customization import OrderCustomization
+from sqlalchemy.exc import IntegrityError
+from services.cache_service import CUSTOMIZATIONS_NAMESPACE, MaterializedPayload, cached_json_response
+from services import image_service, query_service, search_service, serializers
+from services.auth_service import admin_required
 from marshmallow import Schema, fields
 
 customization_bp = Blueprint("customizations", __name__, url_prefix="/api")
@@ -76,16 +81,17 @@ class CustomizationOptionSchema(Schema):
     active = fields.Bool()
     description = fields.Str()
     image_url = fields.Str()
+    image_variants = fields.Function(lambda option: serializers.json_list(option.image_variants), dump_only=True)
 
 customization_option_schema = CustomizationOptionSchema()
 customization_options_schema = CustomizationOptionSchema(many=True)
 
 
-# Get all active customizations, GROUPED BY CATEGORY (Crucial for the frontend)
-@customization_bp.route("/customizations", methods=["GET"])
-def get_customizations():
+def build_customizations_payload():
     # Fetch all active options
-    customizations = CustomizationOption.query.filter_by(active=True).order_by(CustomizationOption.category, CustomizationOption.price).all()
+    customizations = query_service.customization_rows(serializers.CUSTOMIZATION_OPTION.names).filter(
+        CustomizationOption.active == True
+    ).order_by(CustomizationOption.category, CustomizationOption.price).all()
     grouped = {}
     
     # Group the options into a dictionary: { "Category": [option1, option2], ... }
@@ -96,7 +102,7 @@ def get_customizations():
             grouped[category_name] = []
             
         # Append the serialized option data
-        grouped[category_name].append(customization_option_schema.dump(c))
+        grouped[category_name].append(serializers.CUSTOMIZATION_OPTION.encode(c))
         
     # Convert the grouped dictionary into the array structure the frontend expects:
     # [{"category": "Design", "options": [...]}, ...]
@@ -105,12 +111,37 @@ def get_customizations():
         for cat, options_list in grouped.items()
     ]
 
-    # Return the structured array
-    return jsonify(result_array), 200
+    # Return the structured array as JSON bytes (options have no timestamps)
+    return current_app.json.dumps(result_array).encode('utf-8'), None
+
+
+# The grouped menu is serialized once and rebuilt by the admin handlers below
+customization_menu = MaterializedPayload(cache, CUSTOMIZATIONS_NAMESPACE, build_customizations_payload)
+
+
+# Get all active customizations, GROUPED BY CATEGORY (Crucial for the frontend)
+# Reads are a memory lookup, and repeat visitors get a 304 via the ETag
+@customization_bp.route("/customizations", methods=["GET"])
+def get_customizations():
+    return cached_json_response(customization_menu.get())
+
+
+# Search active options; same parameters as /api/cakes/search plus an
+# exact `category` filter, with category facet counts as well
+@customization_bp.route("/customizations/search", methods=["GET"])
+def search_customizations():
+    try:
+        return jsonify(search_service.search(search_service.CUSTOMIZATIONS, request.args))
+    except search_service.SearchError as e:
+        return jsonify({'message': str(e)}), 400
+    except Exception as e:
+        print(f"Error searching customizations: {str(e)}")
+        return jsonify({'message': 'Internal server error'}), 500
 
 
 # Admin: Add a new customization
 @customization_bp.route("/admin/customizations", methods=["POST"])
+@admin_required
 def add_customization():
     data = request.get_json()
     new_item = CustomizationOption(
@@ -122,11 +153,13 @@ def add_customization():
     )
     db.session.add(new_item)
     db.session.commit()
+    customization_menu.rebuild()
     return jsonify(customization_option_schema.dump(new_item)), 201
 
 
 # Admin: Update customization
 @customization_bp.route("/admin/customizations/<int:id>", methods=["PUT"])
+@admin_required
 def update_customization(id):
     data = request.get_json()
     customization = CustomizationOption.query.get_or_404(id)
@@ -136,19 +169,73 @@ def update_customization(id):
     customization.category = data.get("category", customization.category)
     customization.price = data.get("price", customization.price)
     customization.description = data.get("description", customization.description)
-    customization.image_url = data.get("image_url", customization.image_url)
+    if data.get("image_url", customization.image_url) != customization.image_url:
+        # A new URL replaces any uploaded image
+        customization.image_url = data["image_url"]
+        customization.image_hash = None
+        customization.image_variants = None
     
     if 'active' in data:
         customization.active = data.get("active")
         
     db.session.commit()
+    customization_menu.rebuild()
     return jsonify(customization_option_schema.dump(customization)), 200
 
 
+# Admin: Upload an option image (multipart field "image"); 202 while the
+# variants are made in the background, 200 if this file was seen before
+@customization_bp.route("/admin/customizations/<int:id>/image", methods=["POST"])
+@admin_required
+def upload_customization_image(id):
+    customization = CustomizationOption.query.get_or_404(id)
+    try:
+        asset = image_service.upload(customization, request.files.get("image"))
+        return jsonify({"image": image_service.asset_data(asset)}), 202 if asset.status == "pending" else 200
+    except image_service.ImageError as e:
+        return jsonify({"message": str(e)}), 400
+    except image_service.ImageQueueFull:
+        db.session.rollback()
+        response = jsonify({"message": "Image processing is busy, please try again"})
+        response.status_code = 503
+        response.headers["Retry-After"] = "5"
+        return response
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error uploading customization image: {str(e)}")
+        return jsonify({"message": "Internal server error"}), 500
+
+
 # Admin: Delete customization
+# Options that orders refer to are deactivated instead, so the order
+# history keeps them; the response is then 200 with the updated option
 @customization_bp.route("/admin/customizations/<int:id>", methods=["DELETE"])
+@admin_required
 def delete_customization(id):
     customization = CustomizationOption.query.get_or_404(id)
-    db.session.delete(customization)
-    db.session.commit()
-    return "", 204
\ No newline at end of file
+    try:
+        ordered = db.session.query(OrderCustomization.id).filter(
+            OrderCustomization.customization_option_id == id
+        ).first() is not None
+        if not ordered:
+            try:
+                db.session.delete(customization)
+                db.session.commit()
+                customization_menu.rebuild()
+                return "", 204
+            except IntegrityError:
+                # Ordered in the meantime
+                db.session.rollback()
+                customization = CustomizationOption.query.get_or_404(id)
+
+        customization.active = False
+        db.session.commit()
+        customization_menu.rebuild()
+        return jsonify({
+            "message": "Option has been ordered, so it was deactivated instead of deleted",
+            "option": customization_option_schema.dump(customization)
+        }), 200
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error deleting customization: {str(e)}")
+        return jsonify({"message": "Internal server error"}), 500
@@ -0,0 +1,19 @@
+# backend/controllers/media_controller.py
+from flask import Blueprint, send_from_directory
+from services.image_service import image_processor
+
+media_bp = Blueprint('media', __name__)
+
+# A year, the longest lifetime caches are expected to honour
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+# Image variants. File names are hashes of their content, so a URL never
+# changes meaning and browsers and CDNs may keep it for good. In production
+# a static file server or CDN can serve IMAGE_STORAGE_DIR/variants instead
+# (point IMAGE_BASE_URL at it).
+@media_bp.route('/media/<filename>', methods=['GET'])
+def get_media(filename):
+    response = send_from_directory(image_processor.variants_dir, filename, max_age=IMMUTABLE_MAX_AGE)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
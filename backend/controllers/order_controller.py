@@ -1,113 +1,124 @@
 # backend/controllers/order_controller.py
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from extensions import db
 from models.order import Order
-from models.cake import Cake
-from marshmallow import Schema, fields, validate, EXCLUDE
-from datetime import datetime
+from services import capacity_service, order_service, price_service, production_service, query_service, serializers
+from services.idempotency_service import idempotent
+from services.rate_limit_service import rate_limited
 
 order_bp = Blueprint('orders', __name__)
 
-# Marshmallow schema for serialization
-class OrderSchema(Schema):
-    class Meta:
-        unknown = EXCLUDE
-    
-    id = fields.Int(dump_only=True)
-    cake_id = fields.Int(required=True)
-    quantity = fields.Int(required=True, validate=validate.Range(min=1))
-    customer_name = fields.Str(required=True)
-    customer_email = fields.Str(required=True, validate=validate.Email())
-    customer_phone = fields.Str(required=True)
-    delivery_date = fields.Date(required=True)
-    special_requests = fields.Str(allow_none=True)
-    total_price = fields.Float(dump_only=True)
-    status = fields.Str(dump_only=True)
-    created_at = fields.DateTime(dump_only=True)
-    cake_name = fields.Str(dump_only=True, attribute="cake.name")
-
-order_schema = OrderSchema()
-orders_schema = OrderSchema(many=True)
+def optional_user_id():
+    """The authenticated user's id as an int, or None for guests."""
+    try:
+        current_identity = get_jwt_identity()
+        if current_identity:
+            return int(current_identity)
+    except (ValueError, TypeError):
+        pass
+    return None
 
 @order_bp.route('/orders', methods=['POST'])
 @jwt_required(optional=True)
+@rate_limited()
+@idempotent
 def create_order():
     try:
         data = request.get_json()
         
-        # Get user ID if authenticated (convert from string to int)
-        user_id = None
-        try:
-            current_identity = get_jwt_identity()
-            if current_identity:
-                user_id = int(current_identity)
-        except (ValueError, TypeError):
-            user_id = None
-        
-        # Validate required fields
-        required_fields = ['cake_id', 'quantity', 'customer_name', 'customer_email', 
-                          'customer_phone', 'delivery_date']
-        for field in required_fields:
-            if field not in data or not data[field]:
-                return jsonify({'message': f'Missing required field: {field}'}), 422
-        
-        # Parse delivery date
-        try:
-            delivery_date = datetime.strptime(data['delivery_date'], '%Y-%m-%d').date()
-        except ValueError:
-            return jsonify({'message': 'Invalid date format. Use YYYY-MM-DD'}), 422
-        
-        # Check if delivery date is in the future
-        if delivery_date <= datetime.now().date():
-            return jsonify({'message': 'Delivery date must be in the future'}), 422
-        
-        # Get cake and calculate total price
-        cake = Cake.query.get(data['cake_id'])
-        if not cake:
-            return jsonify({'message': 'Cake not found'}), 404
-        
-        total_price = cake.price * data['quantity']
-        
-        # Create new order
-        new_order = Order(
-            user_id=user_id,
-            cake_id=data['cake_id'],
-            quantity=data['quantity'],
-            customer_name=data['customer_name'],
-            customer_email=data['customer_email'],
-            customer_phone=data['customer_phone'],
-            delivery_date=delivery_date,
-            special_requests=data.get('special_requests', ''),
-            total_price=total_price
-        )
-        
-        db.session.add(new_order)
-        db.session.commit()
+        # Get user ID if authenticated (guest orders have none)
+        user_id = optional_user_id()
         
-        # Return the created order with cake name
-        order_data = {
-            'id': new_order.id,
-            'cake_id': new_order.cake_id,
-            'quantity': new_order.quantity,
-            'customer_name': new_order.customer_name,
-            'customer_email': new_order.customer_email,
-            'customer_phone': new_order.customer_phone,
-            'delivery_date': new_order.delivery_date.isoformat(),
-            'special_requests': new_order.special_requests,
-            'total_price': new_order.total_price,
-            'status': new_order.status,
-            'created_at': new_order.created_at.isoformat() if new_order.created_at else None,
-            'cake_name': cake.name
-        }
+        # Validate, price (cake + customizations) and save the order
+        order_data = order_service.create_order(data, user_id)
         
         return jsonify(order_data), 201
         
+    except order_service.OrderError as e:
+        return jsonify({'message': e.message}), e.status
     except Exception as e:
         db.session.rollback()
         print(f"Error creating order: {str(e)}")
         return jsonify({'message': 'Internal server error'}), 500
 
+# A batch takes one rate-limit token per order it contains
+def batch_cost():
+    data = request.get_json(silent=True)
+    orders = data.get('orders') if isinstance(data, dict) else None
+    return max(1, len(orders)) if isinstance(orders, list) else 1
+
+# Submit several orders at once; valid ones are saved in one transaction
+@order_bp.route('/orders/batch', methods=['POST'])
+@jwt_required(optional=True)
+@rate_limited(cost=batch_cost)
+@idempotent
+def create_orders_batch():
+    try:
+        data = request.get_json(silent=True)
+        orders = data.get('orders') if isinstance(data, dict) else None
+        if not isinstance(orders, list) or not orders:
+            return jsonify({'message': 'orders must be a non-empty list'}), 422
+        
+        max_size = current_app.config.get('ORDER_BATCH_MAX_SIZE', 100)
+        if len(orders) > max_size:
+            return jsonify({'message': f'A batch can contain at most {max_size} orders'}), 413
+        
+        user_id = optional_user_id()
+        
+        results = order_service.create_orders_batch(orders, user_id)
+        created = sum(1 for result in results if result['status'] == 'created')
+        
+        # 201 when everything was saved, 207 for a partial batch, 422 when nothing was
+        if created == len(results):
+            status_code = 201
+        elif created:
+            status_code = 207
+        else:
+            status_code = 422
+        
+        return jsonify({'created': created, 'failed': len(results) - created, 'results': results}), status_code
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error creating order batch: {str(e)}")
+        return jsonify({'message': 'Internal server error'}), 500
+
+# Price a cake with its customizations without placing an order
+@order_bp.route('/quote', methods=['POST'])
+def quote_order():
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'message': 'Quote must be a JSON object'}), 422
+    try:
+        cake_id, quantity, option_ids = price_service.parse_selection(data)
+        return jsonify(price_service.price_engine.quote(cake_id, quantity, option_ids))
+    except price_service.QuoteError as e:
+        return jsonify({'message': e.message}), e.status
+    except Exception as e:
+        print(f"Error quoting order: {str(e)}")
+        return jsonify({'message': 'Internal server error'}), 500
+
+# Remaining delivery capacity for the next days, for the date picker
+@order_bp.route('/delivery/availability', methods=['GET'])
+def get_delivery_availability():
+    try:
+        max_days = current_app.config['DELIVERY_AVAILABILITY_DAYS']
+        days = request.args.get('days', max_days, type=int)
+        if days < 1 or days > max_days:
+            return jsonify({'message': f'days must be between 1 and {max_days}'}), 400
+        
+        start = capacity_service.first_bookable_date()
+        return jsonify({
+            'start': start.isoformat(),
+            'default_capacity': capacity_service.default_capacity(),
+            'days': capacity_service.availability(start, days),
+        })
+        
+    except Exception as e:
+        print(f"Error fetching delivery availability: {str(e)}")
+        return jsonify({'message': 'Internal server error'}), 500
+
 @order_bp.route('/orders/my-orders', methods=['GET'])
 @jwt_required()
 def get_user_orders():
@@ -116,25 +127,12 @@ def get_user_orders():
         # Convert string identity back to integer
         user_id_int = int(user_id)
         
-        orders = Order.query.filter_by(user_id=user_id_int).order_by(Order.created_at.desc()).all()
-        
-        # Manually serialize the orders to avoid schema issues
-        orders_data = []
-        for order in orders:
-            orders_data.append({
-                'id': order.id,
-                'cake_id': order.cake_id,
-                'quantity': order.quantity,
-                'customer_name': order.customer_name,
-                'customer_email': order.customer_email,
-                'customer_phone': order.customer_phone,
-                'delivery_date': order.delivery_date.isoformat() if order.delivery_date else None,
-                'special_requests': order.special_requests,
-                'total_price': order.total_price,
-                'status': order.status,
-                'created_at': order.created_at.isoformat() if order.created_at else None,
-                'cake_name': order.cake.name if order.cake else 'Unknown Cake'
-            })
+        # Plain rows with the cake name joined in, encoded without ORM objects
+        orders = query_service.order_rows(serializers.ORDER.names).filter(
+            Order.user_id == user_id_int
+        ).order_by(Order.created_at.desc()).all()
+        
+        orders_data = serializers.ORDER.many(orders)
         
         return jsonify(orders_data)
         
@@ -148,28 +146,17 @@ def get_user_orders():
 @jwt_required()
 def get_order(id):
     try:
-        order = Order.query.get_or_404(id)
+        names = serializers.ORDER.names + ['user_id']
+        order = query_service.order_rows(names).filter(Order.id == id).first()
+        if not order:
+            return jsonify({'message': 'Order not found'}), 404
         user_id = get_jwt_identity()
         
         # Check if user owns this order
         if order.user_id != int(user_id):
             return jsonify({'message': 'Access denied'}), 403
         
-        # Manually serialize the order
-        order_data = {
-            'id': order.id,
-            'cake_id': order.cake_id,
-            'quantity': order.quantity,
-            'customer_name': order.customer_name,
-            'customer_email': order.customer_email,
-            'customer_phone': order.customer_phone,
-            'delivery_date': order.delivery_date.isoformat() if order.delivery_date else None,
-            'special_requests': order.special_requests,
-            'total_price': order.total_price,
-            'status': order.status,
-            'created_at': order.created_at.isoformat() if order.created_at else None,
-            'cake_name': order.cake.name if order.cake else 'Unknown Cake'
-        }
+        order_data = serializers.ORDER.encode(order)
         
         return jsonify(order_data)
         
@@ -193,12 +180,16 @@ def cancel_order(id):
         if order.status not in ['pending', 'confirmed']:
             return jsonify({'message': 'Cannot cancel order in current status'}), 400
         
-        # Update order status to cancelled
-        order.status = 'cancelled'
+        # Update order status to cancelled, giving its cakes back to the date
+        order_service.change_status(order, 'cancelled')
         db.session.commit()
+        production_service.invalidate(order.delivery_date)
         
         return jsonify({'message': 'Order cancelled successfully'})
         
+    except order_service.OrderError as e:
+        db.session.rollback()
+        return jsonify({'message': e.message}), e.status
     except Exception as e:
         db.session.rollback()
         print(f"Error cancelling order: {str(e)}")
@@ -1,10 +1,13 @@
 # backend/extensions.py
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
-from flask_marshmallow import Marshmallow
 from flask_jwt_extended import JWTManager
+from services.cache_service import CacheService
+from services.password_service import PasswordHasher
+from services.startup_service import LazyMigrate
 
 db = SQLAlchemy()
-migrate = Migrate()
-ma = Marshmallow()
-jwt = JWTManager()
\ No newline at end of file
+# Imports Flask-Migrate/Alembic only when a `flask db` command runs
+migrate = LazyMigrate()
+jwt = JWTManager()
+cache = CacheService()
+password_hasher = PasswordHasher()
@@ -0,0 +1,47 @@
+# backend/gunicorn.conf.py
+# Production server settings: gunicorn -c gunicorn.conf.py wsgi:app
+#
+# Every value can be overridden from the environment (or the command line).
+# Worker processes share nothing but what they inherit at fork, so with
+# more than one worker point CACHE_REDIS_URL and RATE_LIMIT_REDIS_URL at
+# Redis to keep cache invalidation and rate limits consistent across them.
+# Prometheus metrics stay per worker (see services/metrics_service.py).
+import multiprocessing
+import os
+
+bind = os.environ.get('SERVER_BIND', '0.0.0.0:' + os.environ.get('PORT', '5000'))
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+# Threaded workers keep connections alive and overlap database waits
+worker_class = 'gthread'
+threads = int(os.environ.get('SERVER_THREADS', 4))
+keepalive = int(os.environ.get('SERVER_KEEPALIVE', 5))
+timeout = int(os.environ.get('SERVER_TIMEOUT', 30))
+graceful_timeout = int(os.environ.get('SERVER_GRACEFUL_TIMEOUT', 30))
+
+# Build the app and import the models once in the master; workers share
+# those pages copy-on-write instead of each importing everything again
+preload_app = True
+
+# Replace each worker after about this many requests (0 disables) to bound
+# slow memory growth; the jitter keeps workers from all restarting at once.
+# A recycled worker finishes its in-flight requests first.
+max_requests = int(os.environ.get('SERVER_MAX_REQUESTS', 10000))
+max_requests_jitter = int(os.environ.get('SERVER_MAX_REQUESTS_JITTER', max_requests // 10))
+
+accesslog = os.environ.get('SERVER_ACCESS_LOG')  # '-' for stdout
+errorlog = '-'
+loglevel = os.environ.get('SERVER_LOG_LEVEL', 'info')
+
+
+def post_fork(server, worker):
+    from wsgi import app
+    from services import warmup_service
+    warmup_service.reset_after_fork(app)
+
+
+def post_worker_init(worker):
+    # Runs before the worker accepts its first connection
+    from wsgi import app
+    from services import warmup_service
+    report = warmup_service.warm_up(app)
+    worker.log.info('Worker %s warmed up: %s', worker.pid, report)
@@ -42,7 +42,7 @@ from models.User import User
 
 def make_user_admin(email):
     # Create your Flask application
-    app = create_app()
+    app = create_app(register_blueprints=False)
     
     # Run this code within the application context (required for database operations)
     with app.app_context():
@@ -0,0 +1,34 @@
+"""Add keyset pagination indexes on order and user
+
+Revision ID: 3f9c1b7d2a64
+Revises: e531fd834bc8
+Create Date: 2026-10-18 10:12:31.418207
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9c1b7d2a64'
+down_revision = 'e531fd834bc8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('order', schema=None) as batch_op:
+        batch_op.create_index('ix_order_created_at_id', ['created_at', 'id'], unique=False)
+        batch_op.create_index('ix_order_status_created_at', ['status', 'created_at'], unique=False)
+
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_user_created_at'), ['created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_user_created_at'))
+
+    with op.batch_alter_table('order', schema=None) as batch_op:
+        batch_op.drop_index('ix_order_status_created_at')
+        batch_op.drop_index('ix_order_created_at_id')
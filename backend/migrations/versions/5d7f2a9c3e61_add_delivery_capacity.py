@@ -0,0 +1,36 @@
+"""Add delivery_capacity table
+
+Revision ID: 5d7f2a9c3e61
+Revises: 9a3e5f1c7b24
+Create Date: 2026-10-18 22:41:05.126734
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d7f2a9c3e61'
+down_revision = '9a3e5f1c7b24'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('delivery_capacity',
+    sa.Column('delivery_date', sa.Date(), nullable=False),
+    sa.Column('capacity', sa.Integer(), nullable=True),
+    sa.Column('booked', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('delivery_date')
+    )
+    # Count the cakes already booked by existing orders
+    op.execute(
+        'INSERT INTO delivery_capacity (delivery_date, booked) '
+        'SELECT delivery_date, SUM(quantity) FROM "order" '
+        "WHERE status != 'cancelled' GROUP BY delivery_date"
+    )
+
+
+def downgrade():
+    op.drop_table('delivery_capacity')
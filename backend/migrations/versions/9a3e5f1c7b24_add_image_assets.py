@@ -0,0 +1,56 @@
+"""Add image_asset table and uploaded image columns
+
+Revision ID: 9a3e5f1c7b24
+Revises: cde5fc57cd89
+Create Date: 2026-10-18 21:12:40.318265
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a3e5f1c7b24'
+down_revision = 'cde5fc57cd89'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('image_asset',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('source_hash', sa.String(length=64), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('width', sa.Integer(), nullable=True),
+    sa.Column('height', sa.Integer(), nullable=True),
+    sa.Column('variants', sa.Text(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('queued_at', sa.DateTime(), nullable=True),
+    sa.Column('processed_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('source_hash')
+    )
+    with op.batch_alter_table('cake', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('image_hash', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('image_variants', sa.Text(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_cake_image_hash'), ['image_hash'], unique=False)
+
+    with op.batch_alter_table('customization_options', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('image_hash', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('image_variants', sa.Text(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_customization_options_image_hash'), ['image_hash'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('customization_options', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_customization_options_image_hash'))
+        batch_op.drop_column('image_variants')
+        batch_op.drop_column('image_hash')
+
+    with op.batch_alter_table('cake', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_cake_image_hash'))
+        batch_op.drop_column('image_variants')
+        batch_op.drop_column('image_hash')
+
+    op.drop_table('image_asset')
@@ -0,0 +1,39 @@
+"""Add idempotency_key status so keys are claimed before the request runs
+
+Revision ID: b6d2f8a4c1e7
+Revises: e8b1c6d4a2f9
+Create Date: 2026-10-18 23:58:04.117362
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6d2f8a4c1e7'
+down_revision = 'e8b1c6d4a2f9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('idempotency_key', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('status', sa.String(length=20), nullable=False, server_default='completed'))
+        batch_op.alter_column('status_code',
+               existing_type=sa.Integer(),
+               nullable=True)
+        batch_op.alter_column('body',
+               existing_type=sa.LargeBinary(),
+               nullable=True)
+
+
+def downgrade():
+    op.execute("DELETE FROM idempotency_key WHERE status = 'in_progress'")
+    with op.batch_alter_table('idempotency_key', schema=None) as batch_op:
+        batch_op.alter_column('body',
+               existing_type=sa.LargeBinary(),
+               nullable=False)
+        batch_op.alter_column('status_code',
+               existing_type=sa.Integer(),
+               nullable=False)
+        batch_op.drop_column('status')
@@ -0,0 +1,42 @@
+"""Add full-text search indexes on cake and customization_options
+
+Revision ID: cde5fc57cd89
+Revises: c4d81e5a9b37
+Create Date: 2026-10-18 19:41:07.532614
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'cde5fc57cd89'
+down_revision = 'c4d81e5a9b37'
+branch_labels = None
+depends_on = None
+
+# Must stay identical to CAKE_SEARCH_DOCUMENT / OPTION_SEARCH_DOCUMENT in the models
+CAKE_SEARCH_DOCUMENT = "to_tsvector('english', coalesce(name, '') || ' ' || coalesce(description, ''))"
+OPTION_SEARCH_DOCUMENT = (
+    "to_tsvector('english', coalesce(category, '') || ' ' || coalesce(name, '') || ' ' || coalesce(description, ''))"
+)
+
+
+def upgrade():
+    # GIN indexes over tsvector are PostgreSQL only; other databases use the
+    # in-memory search index
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.create_index('ix_cake_search', 'cake', [sa.text(CAKE_SEARCH_DOCUMENT)], unique=False,
+                    postgresql_using='gin')
+    op.create_index('ix_customization_options_search', 'customization_options',
+                    [sa.text(OPTION_SEARCH_DOCUMENT)], unique=False, postgresql_using='gin')
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.drop_index('ix_customization_options_search', table_name='customization_options')
+    op.drop_index('ix_cake_search', table_name='cake')
@@ -0,0 +1,26 @@
+"""Add order delivery date index for bake sheets
+
+Revision ID: e8b1c6d4a2f9
+Revises: 5d7f2a9c3e61
+Create Date: 2026-10-18 23:27:51.904417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8b1c6d4a2f9'
+down_revision = '5d7f2a9c3e61'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('order', schema=None) as batch_op:
+        batch_op.create_index('ix_order_delivery_date_status', ['delivery_date', 'status'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('order', schema=None) as batch_op:
+        batch_op.drop_index('ix_order_delivery_date_status')
@@ -1,5 +1,4 @@
-from extensions import db
-from werkzeug.security import generate_password_hash, check_password_hash
+from extensions import db, password_hasher
 import json
 
 class User(db.Model):
@@ -14,7 +13,7 @@ class User(db.Model):
     address = db.Column(db.Text)
     preferences = db.Column(db.Text)  # JSON string for storing user preferences
     is_admin = db.Column(db.Boolean, default=False)
-    created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+    created_at = db.Column(db.DateTime, default=db.func.current_timestamp(), index=True)
     updated_at = db.Column(db.DateTime, default=db.func.current_timestamp(), 
                           onupdate=db.func.current_timestamp())
     
@@ -22,10 +21,13 @@ class User(db.Model):
     orders = db.relationship('Order', backref='user', lazy=True)
     
     def set_password(self, password):   
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
     
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return password_hasher.verify(self.password_hash, password)
+    
+    def password_needs_rehash(self):
+        return password_hasher.needs_rehash(self.password_hash)
     
     def set_preferences(self, preferences_dict):
         if preferences_dict:
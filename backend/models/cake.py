@@ -1,12 +1,24 @@
 # backend/models/cake.py
 from extensions import db
 
+# Full-text document for catalog search (services/search_service.py). The
+# query has to use this exact expression for PostgreSQL to use the index.
+CAKE_SEARCH_DOCUMENT = "to_tsvector('english', coalesce(name, '') || ' ' || coalesce(description, ''))"
+
 class Cake(db.Model):
+    __table_args__ = (
+        db.Index('ix_cake_search', db.text(CAKE_SEARCH_DOCUMENT), postgresql_using='gin').ddl_if(dialect='postgresql'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text, nullable=False)
     price = db.Column(db.Float, nullable=False)
     image_url = db.Column(db.String(200))
+    # Uploaded image (see services/image_service.py): the ImageAsset source
+    # hash and a copy of its variants, so listings need no join
+    image_hash = db.Column(db.String(64), index=True)
+    image_variants = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
     updated_at = db.Column(db.DateTime, default=db.func.current_timestamp(), 
                           onupdate=db.func.current_timestamp())
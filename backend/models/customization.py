@@ -33,8 +33,18 @@
 
 from extensions import db
 
+# Full-text document for option search (services/search_service.py); must
+# match the ix_customization_options_search index expression
+OPTION_SEARCH_DOCUMENT = (
+    "to_tsvector('english', coalesce(category, '') || ' ' || coalesce(name, '') || ' ' || coalesce(description, ''))"
+)
+
 class CustomizationOption(db.Model):
     __tablename__ = 'customization_options'
+    __table_args__ = (
+        db.Index('ix_customization_options_search', db.text(OPTION_SEARCH_DOCUMENT),
+                 postgresql_using='gin').ddl_if(dialect='postgresql'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     
@@ -47,6 +57,9 @@ class CustomizationOption(db.Model):
     # Optional Fields for richer customization options
     description = db.Column(db.Text, nullable=True) # Detailed notes for complex options
     image_url = db.Column(db.String(255), nullable=True) # URL for visual display
+    # Uploaded image: ImageAsset source hash and a copy of its variants
+    image_hash = db.Column(db.String(64), nullable=True, index=True)
+    image_variants = db.Column(db.Text, nullable=True)
 
     def __repr__(self):
         return f"<CustomizationOption {self.category}: {self.name}>"
@@ -0,0 +1,20 @@
+# backend/models/delivery_capacity.py
+from extensions import db
+
+class DeliveryCapacity(db.Model):
+    """How many cakes can be, and have been, booked for one delivery date.
+
+    Rows are created the first time a date is booked or given its own
+    capacity; `booked` only changes through services/capacity_service.py.
+    """
+    __tablename__ = 'delivery_capacity'
+
+    delivery_date = db.Column(db.Date, primary_key=True)
+    # NULL means the default, DELIVERY_DAILY_CAPACITY
+    capacity = db.Column(db.Integer)
+    # Cakes (order quantities) of the date's orders that aren't cancelled
+    booked = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=db.func.current_timestamp(), onupdate=db.func.current_timestamp())
+
+    def __repr__(self):
+        return f'<DeliveryCapacity {self.delivery_date} {self.booked}/{self.capacity}>'
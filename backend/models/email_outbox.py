@@ -0,0 +1,25 @@
+# backend/models/email_outbox.py
+from extensions import db
+
+class EmailOutbox(db.Model):
+    """Outgoing email waiting to be (or already) sent by services/email_service.py."""
+    __tablename__ = 'email_outbox'
+    # The dispatcher polls for due messages by (status, next_attempt_at)
+    __table_args__ = (
+        db.Index('ix_email_outbox_status_next_attempt', 'status', 'next_attempt_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    to_address = db.Column(db.String(255), nullable=False)
+    reply_to = db.Column(db.String(255))
+    subject = db.Column(db.String(255), nullable=False)
+    body = db.Column(db.Text, nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='pending')  # pending, sending, sent, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=db.func.current_timestamp())
+    last_error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+    sent_at = db.Column(db.DateTime)
+
+    def __repr__(self):
+        return f'<EmailOutbox {self.id} {self.status} to {self.to_address}>'
@@ -0,0 +1,18 @@
+# backend/models/idempotency_key.py
+from extensions import db
+
+class IdempotencyKey(db.Model):
+    """Claim on, then stored first response for, an Idempotency-Key (database backend)."""
+    __tablename__ = 'idempotency_key'
+
+    # '<user id or guest>:<path>:<client key>'
+    key = db.Column(db.String(400), primary_key=True)
+    fingerprint = db.Column(db.String(64), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='in_progress')  # in_progress, completed
+    # Set once the request that claimed the key has its response
+    status_code = db.Column(db.Integer)
+    body = db.Column(db.LargeBinary)
+    created_at = db.Column(db.DateTime, default=db.func.current_timestamp(), index=True)
+
+    def __repr__(self):
+        return f'<IdempotencyKey {self.key}>'
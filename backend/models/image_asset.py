@@ -0,0 +1,26 @@
+# backend/models/image_asset.py
+from extensions import db
+
+class ImageAsset(db.Model):
+    """An uploaded image and the resized variants made from it.
+
+    Keyed by the SHA-256 of the uploaded bytes, so uploading the same file
+    again reuses the variants instead of processing it twice.
+    """
+    __tablename__ = 'image_asset'
+
+    id = db.Column(db.Integer, primary_key=True)
+    source_hash = db.Column(db.String(64), unique=True, nullable=False)
+    # 'pending' (queued or processing), 'ready' or 'failed'
+    status = db.Column(db.String(20), nullable=False, default='pending')
+    width = db.Column(db.Integer)
+    height = db.Column(db.Integer)
+    # JSON list of {"url", "width", "type"}, smallest first within each type
+    variants = db.Column(db.Text)
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+    queued_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+    processed_at = db.Column(db.DateTime)
+
+    def __repr__(self):
+        return f'<ImageAsset {self.source_hash[:12]} {self.status}>'
@@ -27,6 +27,14 @@
 from extensions import db
 
 class Order(db.Model):
+    # Composite indexes back keyset pagination on (created_at, id), the
+    # status-filtered admin listing and the bake sheet's delivery date range
+    __table_args__ = (
+        db.Index('ix_order_created_at_id', 'created_at', 'id'),
+        db.Index('ix_order_status_created_at', 'status', 'created_at'),
+        db.Index('ix_order_delivery_date_status', 'delivery_date', 'status'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
     cake_id = db.Column(db.Integer, db.ForeignKey('cake.id'), nullable=False)
@@ -1,28 +1,38 @@
 # backend/seed.py
 import sys
 import os
+import argparse
 from datetime import datetime, timedelta
 import random
 
 # Add the current directory to the Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+import bulk_seed
 from app import create_app
 from extensions import db
 from models.cake import Cake
+from models.delivery_capacity import DeliveryCapacity
+from models.email_outbox import EmailOutbox
+from models.idempotency_key import IdempotencyKey
 from models.User import User
 from models.order import Order
+from models.order_customization import OrderCustomization
+from services import capacity_service
+
+def clear_data():
+    print("Clearing existing data...")
+    # One TRUNCATE / bulk DELETE per table; order customizations reference
+    # orders, so they have to go first
+    bulk_seed.clear_tables(db.engine, [OrderCustomization, EmailOutbox, IdempotencyKey, DeliveryCapacity,
+                                       Order, Cake, User])
 
 def create_sample_data():
-    app = create_app()
+    app = create_app(register_blueprints=False)
     
     with app.app_context():
         # Clear existing data
-        print("Clearing existing data...")
-        db.session.query(Order).delete()
-        db.session.query(Cake).delete()
-        db.session.query(User).delete()
-        db.session.commit()
+        clear_data()
         
         # Create sample cakes
         print("Creating sample cakes...")
@@ -184,6 +194,11 @@ def create_sample_data():
         db.session.commit()
         print(f"Created {len(orders)} sample orders")
         
+        # The orders bypassed the capacity service, so count their cakes now
+        days = capacity_service.recount()
+        db.session.commit()
+        print(f"Recounted delivery capacity for {days} dates")
+        
         print("Seed data created successfully!")
         
         # Print login information for testing
@@ -194,4 +209,14 @@ def create_sample_data():
         print("\nYou can now log in with any of these accounts to test the application.")
 
 if __name__ == "__main__":
-    create_sample_data()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Seed the database')
+    parser.add_argument('--synthetic', action='store_true',
+                        help='generate a large dataset for benchmarks instead of the sample data '
+                             '(same as running bulk_seed.py; see its --help for sizes)')
+    args, _ = parser.parse_known_args()
+
+    if args.synthetic:
+        sys.argv.remove('--synthetic')
+        bulk_seed.main()
+    else:
+        create_sample_data()
\ No newline at end of file
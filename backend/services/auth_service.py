@@ -0,0 +1,58 @@
+# backend/services/auth_service.py
+from functools import wraps
+from flask import jsonify
+from flask_jwt_extended import get_jwt, get_jwt_identity, verify_jwt_in_request
+from extensions import db
+from models.User import User
+from services.cache_service import LRUCache
+
+# user id -> is_admin, re-read from the database at most once per TTL so a
+# role change (e.g. by make_admin.py, which runs in its own process) takes
+# effect within ADMIN_ROLE_CACHE_TTL seconds
+role_cache = LRUCache(max_entries=1024, ttl=60)
+
+
+def init_app(app):
+    role_cache.ttl = app.config.get('ADMIN_ROLE_CACHE_TTL', 60)
+    role_cache.clear()
+
+
+def role_claims(user):
+    """Claims embedded in access tokens at login/registration time."""
+    return {'is_admin': bool(user.is_admin)}
+
+
+def is_admin(user_id):
+    cached = role_cache.get(user_id)
+    if cached is not None:
+        return cached
+    admin = db.session.query(User.is_admin).filter(User.id == user_id).scalar()
+    admin = bool(admin)
+    role_cache.set(user_id, admin)
+    return admin
+
+
+def admin_required(fn):
+    """Like @jwt_required(), but also requires the caller to be an admin.
+
+    Tokens whose role claim says the caller is not an admin are rejected
+    without touching the database. Admin tokens are confirmed against the
+    role cache, so warm requests make no extra queries and revoked admins
+    are locked out once their cache entry expires.
+    """
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        verify_jwt_in_request()
+
+        claim = get_jwt().get('is_admin')
+        try:
+            user_id = int(get_jwt_identity())
+        except (TypeError, ValueError):
+            return jsonify({'message': 'Admin access required'}), 403
+
+        # Tokens issued before role claims existed fall back to the lookup
+        if claim is False or not is_admin(user_id):
+            return jsonify({'message': 'Admin access required'}), 403
+        return fn(*args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,218 @@
+# backend/services/cache_service.py
+import calendar
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from datetime import datetime, timezone
+from flask import current_app, request
+from werkzeug.http import generate_etag
+
+# Namespaces whose version counter is bumped on every write
+CATALOG_NAMESPACE = 'catalog'
+CUSTOMIZATIONS_NAMESPACE = 'customizations'
+
+# A serialized response body plus the validators used for conditional GETs
+CachedPayload = namedtuple('CachedPayload', ['body', 'etag', 'last_modified'])
+
+
+class LRUCache:
+    """Thread-safe in-process LRU cache with a per-entry TTL."""
+
+    def __init__(self, max_entries=256, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class RedisBackend:
+    """Shared cache backend for multi-process deployments (needs `redis`)."""
+
+    def __init__(self, url):
+        import redis  # Optional dependency, only needed when CACHE_REDIS_URL is set
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key):
+        return self._client.get(key)
+
+    def set(self, key, value, ttl=None):
+        self._client.set(key, value, ex=ttl)
+
+    def incr(self, key):
+        return self._client.incr(key)
+
+
+class CacheService:
+    """Versioned cache for serialized API payloads.
+
+    Entries are stored under `<namespace>:v<version>:<key>`, so bumping a
+    namespace's version invalidates every entry in it at once. Lookups go
+    to the in-process LRU first, then to the shared backend if configured.
+    """
+
+    def __init__(self):
+        self.local = LRUCache()
+        self.shared = None
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.local = LRUCache(
+            max_entries=app.config.get('CACHE_MAX_ENTRIES', 256),
+            ttl=app.config.get('CACHE_TTL_SECONDS', 300)
+        )
+        redis_url = app.config.get('CACHE_REDIS_URL')
+        self.shared = RedisBackend(redis_url) if redis_url else None
+        self._versions = {}
+        app.extensions['cache_service'] = self
+
+    def version(self, namespace):
+        if self.shared is not None:
+            value = self.shared.get(f'version:{namespace}')
+            return int(value) if value is not None else 0
+        return self._versions.get(namespace, 0)
+
+    def bump(self, namespace):
+        if self.shared is not None:
+            return self.shared.incr(f'version:{namespace}')
+        with self._lock:
+            self._versions[namespace] = self._versions.get(namespace, 0) + 1
+            return self._versions[namespace]
+
+    def get_or_build(self, namespace, key, builder):
+        """Return the CachedPayload for `key`, calling `builder()` on a miss.
+
+        `builder` returns `(body_bytes, last_modified)`; `last_modified` may
+        be None. The version is read before building, so a payload built
+        from data older than a concurrent write is stored under the old
+        version and never served after the bump.
+        """
+        version = self.version(namespace)
+        payload = self.peek(namespace, key, version)
+        if payload is None:
+            payload = self.put(namespace, key, version, *builder())
+        return payload
+
+    def peek(self, namespace, key, version):
+        """The CachedPayload stored for `key` at `version`, or None."""
+        full_key = f'{namespace}:v{version}:{key}'
+
+        payload = self.local.get(full_key)
+        if payload is not None:
+            return payload
+
+        if self.shared is not None:
+            value = self.shared.get(full_key)
+            if value is not None:
+                payload = _unpack(value)
+                self.local.set(full_key, payload)
+                return payload
+        return None
+
+    def put(self, namespace, key, version, body, last_modified=None):
+        """Store `body` for `key` at `version`, which must have been read
+        before the data in `body` was."""
+        full_key = f'{namespace}:v{version}:{key}'
+        payload = CachedPayload(body, generate_etag(body), last_modified)
+        self.local.set(full_key, payload)
+        if self.shared is not None:
+            self.shared.set(full_key, _pack(payload), ttl=self.local.ttl)
+        return payload
+
+    def clear(self):
+        self.local.clear()
+
+
+class MaterializedPayload:
+    """One precomputed payload that writers rebuild eagerly.
+
+    Admin write handlers call `rebuild()` after committing; it bumps the
+    namespace version, builds the new payload and swaps it in with a single
+    reference assignment, so readers never see a half-built value and
+    `get()` is a plain memory lookup. A copy built for an older version
+    (e.g. after a write in another worker sharing the version counter) or
+    older than the cache TTL is rebuilt on the next read.
+    """
+
+    def __init__(self, cache, namespace, builder):
+        self.cache = cache
+        self.namespace = namespace
+        self.builder = builder
+        self._state = None  # (version, built_at, CachedPayload)
+        self._lock = threading.Lock()
+
+    def _build(self, version):
+        body, last_modified = self.builder()
+        payload = CachedPayload(body, generate_etag(body), last_modified)
+        with self._lock:
+            # A slower concurrent build must not replace a newer one
+            if self._state is None or self._state[0] <= version:
+                self._state = (version, time.monotonic(), payload)
+        return payload
+
+    def get(self):
+        state = self._state
+        if state is not None:
+            version, built_at, payload = state
+            fresh = time.monotonic() - built_at < self.cache.local.ttl
+            if fresh and version == self.cache.version(self.namespace):
+                return payload
+        return self._build(self.cache.version(self.namespace))
+
+    def rebuild(self):
+        return self._build(self.cache.bump(self.namespace))
+
+
+# The shared backend only stores bytes, so the Last-Modified timestamp is
+# kept on a header line in front of the body (naive datetimes are UTC)
+def _pack(payload):
+    stamp = str(calendar.timegm(payload.last_modified.utctimetuple())) if payload.last_modified else ''
+    return stamp.encode('ascii') + b'\n' + payload.body
+
+
+def _unpack(value):
+    stamp, body = value.split(b'\n', 1)
+    last_modified = datetime.fromtimestamp(int(stamp), timezone.utc) if stamp else None
+    return CachedPayload(body, generate_etag(body), last_modified)
+
+
+def cached_json_response(payload):
+    """Build a JSON response for a CachedPayload, answering 304 when the
+    client's If-None-Match / If-Modified-Since validators still match."""
+    response = current_app.response_class(payload.body, mimetype='application/json')
+    response.set_etag(payload.etag)
+    if payload.last_modified is not None:
+        response.last_modified = payload.last_modified
+    # Let browsers keep the payload but revalidate it on every use
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
@@ -0,0 +1,237 @@
+# backend/services/capacity_service.py
+# Delivery-date capacity
+#
+# Each delivery date has one delivery_capacity row with the number of cakes
+# booked for it and, optionally, its own capacity (NULL falls back to
+# DELIVERY_DAILY_CAPACITY). An order books its quantity with one
+# conditional UPDATE:
+#
+#     UPDATE delivery_capacity SET booked = booked + :quantity
+#     WHERE delivery_date = :date AND booked + :quantity <= capacity
+#
+# so the check and the increment are a single statement. Concurrent orders
+# for the same date queue on the row lock and each re-evaluates the
+# condition against the committed count, so a burst can neither overbook a
+# date nor lose an increment. The UPDATE runs inside the order's own
+# transaction: if the order fails afterwards, the rollback gives the cakes
+# back. Cancelling an order subtracts its quantity again, once: the status
+# change is itself a conditional UPDATE (see change_status).
+from collections import defaultdict
+from datetime import date, timedelta
+from flask import current_app
+from sqlalchemy import case, func, insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.attributes import set_committed_value
+from extensions import db
+from models.delivery_capacity import DeliveryCapacity
+from models.order import Order
+
+# Orders in any other status hold their cakes' capacity
+RELEASED_STATUSES = ('cancelled',)
+
+
+class StatusConflict(Exception):
+    """The order's status was changed by another request first."""
+
+    def __init__(self, order_id):
+        super().__init__(f'Order {order_id} was updated by another request; reload it and try again')
+        self.order_id = order_id
+
+
+class DateFullyBooked(Exception):
+    """Not enough capacity left on a delivery date."""
+
+    def __init__(self, delivery_date):
+        super().__init__(f'Delivery date {delivery_date.isoformat()} is fully booked')
+        self.delivery_date = delivery_date
+
+
+def default_capacity():
+    return current_app.config['DELIVERY_DAILY_CAPACITY']
+
+
+def _capacity():
+    return func.coalesce(DeliveryCapacity.capacity, default_capacity())
+
+
+def _ensure_days(days):
+    """Create an empty row for each of `days` that doesn't have one yet."""
+    rows = [{'delivery_date': day, 'booked': 0} for day in days]
+    if not rows:
+        return
+    dialect = db.engine.dialect.name
+    if dialect in ('postgresql', 'sqlite'):
+        upsert = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+        db.session.execute(
+            upsert(DeliveryCapacity).on_conflict_do_nothing(index_elements=['delivery_date']), rows
+        )
+        return
+    for row in rows:
+        try:
+            with db.session.begin_nested():
+                db.session.execute(insert(DeliveryCapacity), [row])
+        except IntegrityError:
+            pass
+
+
+def _book(delivery_date, quantity):
+    """The conditional UPDATE; True when the cakes fitted."""
+    result = db.session.execute(
+        update(DeliveryCapacity)
+        .where(DeliveryCapacity.delivery_date == delivery_date,
+               DeliveryCapacity.booked + quantity <= _capacity())
+        .values(booked=DeliveryCapacity.booked + quantity)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+def reserve(delivery_date, quantity):
+    """Book `quantity` cakes on `delivery_date` or raise DateFullyBooked.
+
+    One statement when the date already has a row, which is the usual case;
+    the first booking of a date creates the row first.
+    """
+    if _book(delivery_date, quantity):
+        return
+    _ensure_days([delivery_date])
+    if not _book(delivery_date, quantity):
+        raise DateFullyBooked(delivery_date)
+
+
+def reserve_many(requests):
+    """Book a list of (delivery_date, quantity); returns which ones fitted.
+
+    All of a date's requests are booked with one UPDATE. If together they
+    don't fit, they are booked one at a time, in order, and the ones that
+    no longer fit are refused. Dates are locked in ascending order so two
+    batches can't deadlock each other.
+    """
+    fitted = [True] * len(requests)
+    by_day = defaultdict(list)
+    for position, (delivery_date, _) in enumerate(requests):
+        by_day[delivery_date].append(position)
+
+    days = sorted(by_day)
+    _ensure_days(days)
+    for day in days:
+        positions = by_day[day]
+        if _book(day, sum(requests[position][1] for position in positions)):
+            continue
+        for position in positions:
+            fitted[position] = _book(day, requests[position][1])
+    return fitted
+
+
+def release(delivery_date, quantity):
+    """Give back the cakes of a cancelled order."""
+    db.session.execute(
+        update(DeliveryCapacity)
+        .where(DeliveryCapacity.delivery_date == delivery_date)
+        .values(booked=case((DeliveryCapacity.booked > quantity, DeliveryCapacity.booked - quantity), else_=0))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def change_status(order, status):
+    """Set an order's status, releasing or re-booking its capacity.
+
+    The status is switched with a conditional UPDATE (WHERE status is
+    still the one this request read), and capacity only moves when that
+    UPDATE won: two concurrent cancels of one order release its cakes
+    once, and the loser gets StatusConflict. Moving an order back out of
+    'cancelled' books its cakes again and raises DateFullyBooked when the
+    date has filled up in the meantime. Returns True when the status
+    changed. Does not commit.
+    """
+    previous = order.status
+    if previous == status:
+        return False
+    result = db.session.execute(
+        update(Order)
+        .where(Order.id == order.id, Order.status == previous)
+        .values(status=status)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        raise StatusConflict(order.id)
+    # Already written; keep the loaded object in step without a second UPDATE
+    set_committed_value(order, 'status', status)
+
+    was_released = previous in RELEASED_STATUSES
+    is_released = status in RELEASED_STATUSES
+    if is_released and not was_released:
+        release(order.delivery_date, order.quantity)
+    elif was_released and not is_released:
+        reserve(order.delivery_date, order.quantity)
+    return True
+
+
+def set_capacity(delivery_date, capacity):
+    """Give one date its own capacity (None restores the default). Does not commit."""
+    _ensure_days([delivery_date])
+    db.session.execute(
+        update(DeliveryCapacity)
+        .where(DeliveryCapacity.delivery_date == delivery_date)
+        .values(capacity=capacity)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def availability(start, days):
+    """Capacity, booked and remaining cakes for `days` dates from `start`.
+
+    One range scan of the primary key; dates without a row have nothing
+    booked and the default capacity.
+    """
+    end = start + timedelta(days=days - 1)
+    rows = {
+        row.delivery_date: row
+        for row in db.session.query(DeliveryCapacity.delivery_date, DeliveryCapacity.capacity,
+                                    DeliveryCapacity.booked)
+        .filter(DeliveryCapacity.delivery_date.between(start, end))
+    }
+    fallback = default_capacity()
+    calendar = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        row = rows.get(day)
+        capacity = fallback if row is None or row.capacity is None else row.capacity
+        booked = row.booked if row is not None else 0
+        remaining = max(capacity - booked, 0)
+        calendar.append({
+            'date': day.isoformat(),
+            'capacity': capacity,
+            'booked': booked,
+            'remaining': remaining,
+            'available': remaining > 0,
+        })
+    return calendar
+
+
+def first_bookable_date():
+    """Orders must be for a date after today."""
+    return date.today() + timedelta(days=1)
+
+
+def recount():
+    """Rebuild every date's booked count from the orders.
+
+    For data written around the service, e.g. by bulk_seed.py. Does not
+    commit.
+    """
+    totals = (
+        db.session.query(Order.delivery_date, func.sum(Order.quantity))
+        .filter(Order.status.notin_(RELEASED_STATUSES))
+        .group_by(Order.delivery_date)
+        .all()
+    )
+    db.session.execute(update(DeliveryCapacity).values(booked=0).execution_options(synchronize_session=False))
+    _ensure_days([day for day, _ in totals])
+    if totals:
+        db.session.execute(
+            update(DeliveryCapacity),
+            [{'delivery_date': day, 'booked': int(total)} for day, total in totals]
+        )
+    return len(totals)
@@ -0,0 +1,133 @@
+# backend/services/db_service.py
+# Engine/pool configuration, read-replica sessions and pool metrics
+import threading
+import time
+from flask import current_app
+from flask_sqlalchemy.query import Query
+from flask_sqlalchemy.session import _app_ctx_id
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import QueuePool
+from extensions import db
+
+REPLICA_BIND = 'replica'
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long callers wait for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._stats_lock = threading.Lock()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - start
+            with self._stats_lock:
+                self.checkouts += 1
+                self.total_wait += waited
+                self.max_wait = max(self.max_wait, waited)
+
+
+def engine_options(app, uri):
+    """SQLAlchemy create_engine() options for `uri` built from the DB_* settings.
+
+    In-memory SQLite keeps Flask-SQLAlchemy's StaticPool, so it only gets
+    the pre-ping/recycle options. The statement timeout is applied on
+    PostgreSQL connections only.
+    """
+    config = app.config
+    url = make_url(uri)
+    options = {
+        'pool_pre_ping': config.get('DB_POOL_PRE_PING', True),
+        'pool_recycle': config.get('DB_POOL_RECYCLE', 1800),
+    }
+
+    if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+        return options
+
+    options.update(
+        poolclass=TimedQueuePool,
+        pool_size=config.get('DB_POOL_SIZE', 10),
+        max_overflow=config.get('DB_MAX_OVERFLOW', 20),
+        pool_timeout=config.get('DB_POOL_TIMEOUT', 30),
+    )
+
+    statement_timeout = config.get('DB_STATEMENT_TIMEOUT_MS')
+    if url.get_backend_name() == 'postgresql' and statement_timeout:
+        options['connect_args'] = {'options': f'-c statement_timeout={int(statement_timeout)}'}
+
+    return options
+
+
+def configure_engines(app):
+    """Fill SQLALCHEMY_ENGINE_OPTIONS and the replica bind from the DB_*
+    settings. Must run before db.init_app(); explicit
+    SQLALCHEMY_ENGINE_OPTIONS entries win over the derived ones."""
+    options = engine_options(app, app.config['SQLALCHEMY_DATABASE_URI'])
+    options.update(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+
+    replica_url = app.config.get('DATABASE_REPLICA_URL')
+    if replica_url:
+        binds = dict(app.config.get('SQLALCHEMY_BINDS') or {})
+        binds[REPLICA_BIND] = {'url': replica_url, **engine_options(app, replica_url)}
+        app.config['SQLALCHEMY_BINDS'] = binds
+
+
+def init_app(app):
+    """Set up the replica session; call after db.init_app()."""
+    if REPLICA_BIND not in (app.config.get('SQLALCHEMY_BINDS') or {}):
+        return
+
+    with app.app_context():
+        engine = db.engines[REPLICA_BIND]
+    replica = scoped_session(
+        sessionmaker(bind=engine, query_cls=Query, autoflush=False),
+        scopefunc=_app_ctx_id
+    )
+    app.extensions['read_replica'] = replica
+
+    @app.teardown_appcontext
+    def remove_replica_session(exc):
+        replica.remove()
+
+
+def read_session():
+    """Session for list and statistics queries.
+
+    Uses the read replica when DATABASE_REPLICA_URL is configured and the
+    primary session otherwise. Reads that must see the caller's own
+    writes (e.g. "my orders") should keep using db.session.
+    """
+    replica = current_app.extensions.get('read_replica')
+    return replica() if replica is not None else db.session
+
+
+def pool_metrics():
+    """Pool usage for every configured engine, keyed by bind name."""
+    metrics = {}
+    for key, engine in db.engines.items():
+        pool = engine.pool
+        stats = {'pool': type(pool).__name__}
+        if isinstance(pool, QueuePool):
+            stats.update(
+                size=pool.size(),
+                checked_in=pool.checkedin(),
+                checked_out=pool.checkedout(),
+                overflow=pool.overflow(),
+            )
+        if isinstance(pool, TimedQueuePool):
+            stats.update(
+                checkouts=pool.checkouts,
+                total_wait_seconds=round(pool.total_wait, 6),
+                max_wait_seconds=round(pool.max_wait, 6),
+            )
+        metrics[key or 'primary'] = stats
+    return metrics
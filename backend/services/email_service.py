@@ -0,0 +1,321 @@
+# backend/services/email_service.py
+# Outbound email: messages are written to the email_outbox table in the
+# caller's transaction and sent later by a background dispatcher
+import random
+import smtplib
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+from flask import current_app
+from sqlalchemy import insert
+from extensions import db
+from models.email_outbox import EmailOutbox
+
+# Longest wait between two attempts at the same message
+MAX_RETRY_DELAY = 3600
+
+# Messages LocalTransport keeps; older ones are dropped
+LOCAL_SENT_LIMIT = 1000
+
+
+class SMTPTransport:
+    """Sends a batch of messages over one SMTP connection."""
+
+    def __init__(self, config):
+        self.host = config.get('MAIL_SERVER', 'localhost')
+        self.port = config.get('MAIL_PORT', 25)
+        self.use_tls = config.get('MAIL_USE_TLS', False)
+        self.username = config.get('MAIL_USERNAME')
+        self.password = config.get('MAIL_PASSWORD')
+        self.timeout = config.get('MAIL_TIMEOUT', 10)
+
+    def send_many(self, messages):
+        """Send every message; returns {message_id: error or None}.
+
+        A connection or login failure fails the whole batch, while a
+        rejected recipient only fails that message.
+        """
+        try:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        except (OSError, smtplib.SMTPException) as e:
+            return {message_id: str(e) for message_id, _ in messages}
+
+        results = {}
+        try:
+            if self.use_tls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password)
+            for message_id, message in messages:
+                try:
+                    smtp.send_message(message)
+                    results[message_id] = None
+                except smtplib.SMTPRecipientsRefused as e:
+                    results[message_id] = str(e)
+        except (OSError, smtplib.SMTPException) as e:
+            for message_id, _ in messages:
+                results.setdefault(message_id, str(e))
+        finally:
+            try:
+                smtp.quit()
+            except (OSError, smtplib.SMTPException):
+                pass
+        return results
+
+
+class LocalTransport:
+    """In-process stand-in for an SMTP server, for development and tests.
+
+    The last LOCAL_SENT_LIMIT sent messages are kept in `sent`. Set
+    `fail_next` to make that many upcoming sends fail, to exercise the
+    retry path. Nothing is delivered, so the dispatcher only accepts it
+    when TESTING or DEBUG is set.
+    """
+
+    def __init__(self, config=None):
+        self.sent = deque(maxlen=LOCAL_SENT_LIMIT)
+        self.fail_next = 0
+        self._lock = threading.Lock()
+
+    def send_many(self, messages):
+        results = {}
+        with self._lock:
+            for message_id, message in messages:
+                if self.fail_next > 0:
+                    self.fail_next -= 1
+                    results[message_id] = 'Simulated delivery failure'
+                    continue
+                self.sent.append(message)
+                results[message_id] = None
+        return results
+
+
+TRANSPORTS = {
+    'smtp': SMTPTransport,
+    'local': LocalTransport,
+}
+
+
+def outbox_row(to_address, subject, body, reply_to=None):
+    """Column values for one queued message, for bulk inserts."""
+    return {
+        'to_address': to_address,
+        'reply_to': reply_to,
+        'subject': subject,
+        'body': body,
+        'status': 'pending',
+        'attempts': 0,
+        'next_attempt_at': datetime.now(),
+    }
+
+
+def enqueue(*rows):
+    """Insert outbox_row() values into the outbox in the current session.
+
+    Nothing is sent until the caller commits, so a message is never sent
+    for a rolled-back order. Call notify() after the commit to wake the
+    dispatcher instead of waiting for its next poll.
+    """
+    if rows:
+        db.session.execute(insert(EmailOutbox), list(rows))
+
+
+# Message builders -----------------------------------------------------------
+
+def order_confirmation(order):
+    """Outbox row for a new order; `order` is an encoded ORDER dict."""
+    body = (
+        f"Hi {order['customer_name']},\n\n"
+        f"Thank you for your order #{order['id']}: {order['quantity']} x {order['cake_name']}, "
+        f"for delivery on {order['delivery_date']}.\n"
+        f"Total: KSh {order['total_price']:,.2f}\n\n"
+        "We will confirm the details shortly."
+    )
+    return outbox_row(order['customer_email'], f"Order #{order['id']} received", body)
+
+
+def order_status_changed(order):
+    body = (
+        f"Hi {order.customer_name},\n\n"
+        f"Your order #{order.id} is now {order.status}."
+    )
+    return outbox_row(order.customer_email, f'Order #{order.id} is {order.status}', body)
+
+
+def contact_message(name, email, message):
+    recipient = current_app.config.get('MAIL_CONTACT_RECIPIENT') or current_app.config.get('MAIL_DEFAULT_SENDER')
+    body = f"Contact form submission from {name} ({email}):\n\n{message}"
+    return outbox_row(recipient, f'Contact form: {name}', body, reply_to=email)
+
+
+# Dispatcher -----------------------------------------------------------------
+
+class EmailDispatcher:
+    """Sends due outbox messages on a small thread pool.
+
+    A dispatcher thread claims up to MAIL_BATCH_SIZE due messages per
+    worker, marks them 'sending' with a lease and hands each batch to a
+    pool thread that sends it over a single connection. Failed messages
+    are retried with exponential backoff (MAIL_RETRY_BASE_SECONDS,
+    doubling, with jitter) until MAIL_MAX_ATTEMPTS, then marked 'failed'.
+    Messages left 'sending' by a crashed process are picked up again
+    once their lease expires, so mail survives restarts. The thread is
+    started by the first request or notify(), not at import time.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.transport = None
+        self._executor = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.shutdown()
+        config = app.config
+        self.app = app
+        backend = config.get('MAIL_BACKEND', 'smtp')
+        if backend == 'local' and not (config.get('TESTING') or config.get('DEBUG')):
+            raise RuntimeError("MAIL_BACKEND 'local' delivers nothing; it needs TESTING or DEBUG")
+        self.transport = TRANSPORTS[backend](config)
+        self.sender = config.get('MAIL_DEFAULT_SENDER', 'orders@localhost')
+        self.workers = config.get('MAIL_WORKERS', 2)
+        self.batch_size = config.get('MAIL_BATCH_SIZE', 50)
+        self.max_attempts = config.get('MAIL_MAX_ATTEMPTS', 5)
+        self.retry_base = config.get('MAIL_RETRY_BASE_SECONDS', 30)
+        self.poll_seconds = config.get('MAIL_POLL_SECONDS', 5)
+        self.lease_seconds = config.get('MAIL_LEASE_SECONDS', 300)
+        self.enabled = config.get('MAIL_WORKER_ENABLED', True)
+        app.extensions['email_dispatcher'] = self
+        if self.enabled:
+            app.before_request(self.start)
+
+    def start(self):
+        if self._thread is not None or not self.enabled:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop = threading.Event()
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='email-send')
+            self._thread = threading.Thread(
+                target=self._run, args=(self.app, self._stop, self._executor),
+                name='email-dispatcher', daemon=True
+            )
+            self._thread.start()
+
+    def notify(self):
+        """Wake the dispatcher after committing new outbox messages."""
+        self.start()
+        self._wakeup.set()
+
+    def shutdown(self):
+        with self._lock:
+            self._stop.set()
+            self._wakeup.set()
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+            self._thread = None
+            self._executor = None
+
+    def _run(self, app, stop, executor):
+        while not stop.is_set():
+            claimed = 0
+            try:
+                with app.app_context():
+                    claimed = self.dispatch_due(executor)
+            except Exception as e:
+                print(f"Error dispatching email: {str(e)}")
+            # Keep going while there is a backlog, otherwise sleep until woken
+            if claimed < self.batch_size * self.workers:
+                self._wakeup.wait(self.poll_seconds)
+                self._wakeup.clear()
+
+    def claim(self, limit):
+        """Lease up to `limit` due messages to this process."""
+        now = datetime.now()
+        rows = EmailOutbox.query.filter(
+            EmailOutbox.status.in_(('pending', 'sending')),
+            EmailOutbox.next_attempt_at <= now
+        ).order_by(EmailOutbox.id).limit(limit).with_for_update(skip_locked=True).all()
+
+        claimed = []
+        for row in rows:
+            row.status = 'sending'
+            row.next_attempt_at = now + timedelta(seconds=self.lease_seconds)
+            claimed.append((row.id, row.attempts, self._build_message(row)))
+        db.session.commit()
+        return claimed
+
+    def _build_message(self, row):
+        message = EmailMessage()
+        message['From'] = self.sender
+        message['To'] = row.to_address
+        message['Subject'] = row.subject
+        if row.reply_to:
+            message['Reply-To'] = row.reply_to
+        message.set_content(row.body)
+        return message
+
+    def dispatch_due(self, executor=None):
+        """Claim and send one round of due messages; returns how many were claimed.
+
+        Without an executor the batches are sent on the calling thread.
+        """
+        claimed = self.claim(self.batch_size * self.workers)
+        batches = [claimed[i:i + self.batch_size] for i in range(0, len(claimed), self.batch_size)]
+        if executor is None:
+            for batch in batches:
+                self._send_batch(batch)
+        else:
+            for future in [executor.submit(self._send_batch, batch) for batch in batches]:
+                future.result()
+        return len(claimed)
+
+    def flush(self):
+        """Send everything that is due now on the calling thread (scripts and tests)."""
+        total = 0
+        while True:
+            claimed = self.dispatch_due()
+            total += claimed
+            if claimed == 0:
+                return total
+
+    def retry_delay(self, attempts):
+        delay = min(self.retry_base * 2 ** (attempts - 1), MAX_RETRY_DELAY)
+        return delay * random.uniform(0.8, 1.2)
+
+    def _send_batch(self, batch):
+        results = self.transport.send_many([(message_id, message) for message_id, _, message in batch])
+        now = datetime.now()
+
+        with self.app.app_context():
+            for message_id, attempts, _ in batch:
+                error = results.get(message_id, 'No result from transport')
+                values = {'attempts': attempts + 1}
+                if error is None:
+                    values.update(status='sent', sent_at=now, last_error=None)
+                elif attempts + 1 >= self.max_attempts:
+                    values.update(status='failed', last_error=error)
+                else:
+                    values.update(
+                        status='pending', last_error=error,
+                        next_attempt_at=now + timedelta(seconds=self.retry_delay(attempts + 1))
+                    )
+                EmailOutbox.query.filter(EmailOutbox.id == message_id).update(values)
+            db.session.commit()
+
+
+dispatcher = EmailDispatcher()
+
+
+def init_app(app):
+    dispatcher.init_app(app)
+
+
+def notify():
+    dispatcher.notify()
@@ -0,0 +1,103 @@
+# backend/services/export_service.py
+# Streams orders out of the database as NDJSON or CSV.
+#
+# Rows are read through a server-side cursor (stream_results + yield_per)
+# as plain Core rows, so memory stays flat no matter how many orders are
+# exported and no ORM objects are built.
+#
+# CSV cells that a spreadsheet would read as a formula (=, +, -, @, tab,
+# carriage return) are prefixed with a quote: customer names and special
+# requests are free text.
+import csv
+import io
+import json
+from datetime import timedelta
+from sqlalchemy import select
+from services.db_service import read_session
+from services.serializers import orjson
+from models.cake import Cake
+from models.order import Order
+from models.User import User
+
+EXPORT_COLUMNS = [
+    'id', 'user_id', 'cake_id', 'quantity', 'customer_name', 'customer_email',
+    'customer_phone', 'delivery_date', 'special_requests', 'total_price', 'status',
+    'created_at', 'cake_name', 'user_email'
+]
+
+# Rows fetched from the cursor, and CSV rows encoded, per chunk
+CHUNK_SIZE = 1000
+
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def order_export_query(status=None, start_date=None, end_date=None):
+    """Orders joined with cake name and user email, oldest first.
+
+    `start_date` and `end_date` are inclusive dates matched against
+    `created_at`.
+    """
+    query = select(
+        Order.id, Order.user_id, Order.cake_id, Order.quantity, Order.customer_name,
+        Order.customer_email, Order.customer_phone, Order.delivery_date,
+        Order.special_requests, Order.total_price, Order.status, Order.created_at,
+        Cake.name.label('cake_name'), User.email.label('user_email')
+    ).outerjoin(Cake, Order.cake_id == Cake.id).outerjoin(User, Order.user_id == User.id)
+
+    if status:
+        query = query.where(Order.status == status)
+    if start_date:
+        query = query.where(Order.created_at >= start_date)
+    if end_date:
+        query = query.where(Order.created_at < end_date + timedelta(days=1))
+
+    return query.order_by(Order.created_at, Order.id)
+
+
+def iter_order_rows(query):
+    result = read_session().execute(
+        query.execution_options(stream_results=True, yield_per=CHUNK_SIZE)
+    )
+    for row in result:
+        yield [
+            value.isoformat() if hasattr(value, 'isoformat') else value
+            for value in row
+        ]
+
+
+def _dumps(value):
+    return orjson.dumps(value) if orjson is not None else json.dumps(value).encode()
+
+
+def ndjson_chunks(rows):
+    lines = []
+    for row in rows:
+        lines.append(_dumps(dict(zip(EXPORT_COLUMNS, row))))
+        if len(lines) == CHUNK_SIZE:
+            yield b'\n'.join(lines) + b'\n'
+            lines = []
+
+    if lines:
+        yield b'\n'.join(lines) + b'\n'
+
+
+def csv_cell(value):
+    """`value`, quoted so spreadsheets show it as text rather than run it as a formula."""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def csv_chunks(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+
+    for count, row in enumerate(rows, start=1):
+        writer.writerow([csv_cell(value) for value in row])
+        if count % CHUNK_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue()
@@ -0,0 +1,207 @@
+# backend/services/idempotency_service.py
+import hashlib
+import threading
+from collections import namedtuple
+from datetime import datetime, timedelta
+from functools import wraps
+from flask import current_app, jsonify, make_response, request
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import delete, insert, or_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from extensions import db
+from models.idempotency_key import IdempotencyKey
+from services.cache_service import LRUCache
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+MAX_KEY_LENGTH = 255
+
+# The first response for a key plus a hash of the request body it answered.
+# status_code and body are None while that request is still running.
+StoredResponse = namedtuple('StoredResponse', ['fingerprint', 'status_code', 'body'])
+
+
+class MemoryStore:
+    """Bounded in-process store; the least recently used keys are dropped first."""
+
+    def __init__(self, max_entries=10000, ttl=86400):
+        self.entries = LRUCache(max_entries=max_entries, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def claim(self, key, fingerprint):
+        """None when this request now owns `key`, else what the key holds."""
+        with self._lock:
+            stored = self.entries.get(key)
+            if stored is None:
+                self.entries.set(key, StoredResponse(fingerprint, None, None))
+            return stored
+
+    def complete(self, key, response):
+        self.entries.set(key, response)
+
+    def release(self, key):
+        self.entries.delete(key)
+
+
+class DatabaseStore:
+    """Stores claims and responses in the idempotency_key table so every
+    worker process sees them. A key is claimed by inserting its row before
+    the view runs; the insert is the lock, so of two processes racing on
+    one key only one runs the view. Claims whose request died without
+    finishing are taken over after `lease` seconds. Rows older than the TTL
+    are ignored and purged every `purge_every` writes."""
+
+    def __init__(self, ttl=86400, lease=60, purge_every=1000):
+        self.ttl = ttl
+        self.lease = lease
+        self.purge_every = purge_every
+        self._writes = 0
+
+    def _insert(self, row):
+        """INSERT the claim unless the key exists; True when it was inserted."""
+        dialect = db.engine.dialect.name
+        if dialect in ('postgresql', 'sqlite'):
+            upsert = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+            result = db.session.execute(upsert(IdempotencyKey).values(row).on_conflict_do_nothing(index_elements=['key']))
+            return result.rowcount == 1
+        try:
+            with db.session.begin_nested():
+                db.session.execute(insert(IdempotencyKey).values(row))
+            return True
+        except IntegrityError:
+            return False
+
+    def _take_over(self, key, fingerprint, now):
+        """Reclaim an expired key or an abandoned claim; True when it worked."""
+        result = db.session.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.key == key,
+                   or_(IdempotencyKey.created_at < now - timedelta(seconds=self.ttl),
+                       (IdempotencyKey.status == 'in_progress')
+                       & (IdempotencyKey.created_at < now - timedelta(seconds=self.lease))))
+            .values(fingerprint=fingerprint, status='in_progress', status_code=None, body=None,
+                    created_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+
+    def claim(self, key, fingerprint):
+        """None when this request now owns `key`, else what the key holds.
+
+        Commits, so the claim is visible to other processes before the
+        view runs.
+        """
+        now = datetime.now()
+        row = {'key': key, 'fingerprint': fingerprint, 'status': 'in_progress', 'created_at': now}
+        if self._insert(row) or self._take_over(key, fingerprint, now):
+            db.session.commit()
+            return None
+        db.session.commit()
+        stored = db.session.get(IdempotencyKey, key)
+        if stored is None:
+            # Released between the INSERT and the read; a retry claims it
+            return StoredResponse(fingerprint, None, None)
+        return StoredResponse(stored.fingerprint, stored.status_code, stored.body)
+
+    def complete(self, key, response):
+        """Store the response on this request's claim."""
+        db.session.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.key == key, IdempotencyKey.status == 'in_progress',
+                   IdempotencyKey.fingerprint == response.fingerprint)
+            .values(status='completed', status_code=response.status_code, body=response.body)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+
+        self._writes += 1
+        if self._writes % self.purge_every == 0:
+            self.purge()
+
+    def release(self, key):
+        """Drop this request's claim so the client can retry the key."""
+        db.session.rollback()
+        db.session.execute(
+            delete(IdempotencyKey)
+            .where(IdempotencyKey.key == key, IdempotencyKey.status == 'in_progress')
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+
+    def purge(self):
+        cutoff = datetime.now() - timedelta(seconds=self.ttl)
+        IdempotencyKey.query.filter(IdempotencyKey.created_at < cutoff).delete()
+        db.session.commit()
+
+
+STORES = {
+    'memory': lambda config: MemoryStore(
+        config.get('IDEMPOTENCY_MAX_KEYS', 10000), config.get('IDEMPOTENCY_TTL_SECONDS', 86400)
+    ),
+    'database': lambda config: DatabaseStore(
+        config.get('IDEMPOTENCY_TTL_SECONDS', 86400), config.get('IDEMPOTENCY_LEASE_SECONDS', 60)
+    ),
+}
+
+
+def init_app(app):
+    backend = app.config.get('IDEMPOTENCY_BACKEND', 'memory')
+    app.extensions['idempotency_store'] = STORES[backend](app.config)
+
+
+def _scoped_key(key):
+    # Keys are only unique per client, so scope them to the caller and route
+    identity = get_jwt_identity() or 'guest'
+    return f'{identity}:{request.path}:{key}'
+
+
+def idempotent(fn):
+    """Replay the first response for a repeated Idempotency-Key header.
+
+    Requests without the header run normally. The first request with a
+    key claims it, runs the view and stores any non-5xx response; repeats
+    with the same body get that response back (marked Idempotent-Replayed)
+    without running the view again, and repeats with a different body get
+    a 422. A repeat that arrives while the first request is still running
+    gets a 409 and can retry. A 5xx or an exception frees the key again.
+    Apply below @jwt_required so the caller is known.
+    """
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return fn(*args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return jsonify({'message': f'{IDEMPOTENCY_HEADER} must be at most {MAX_KEY_LENGTH} characters'}), 422
+
+        store = current_app.extensions['idempotency_store']
+        scoped_key = _scoped_key(key)
+        fingerprint = hashlib.sha256(request.get_data()).hexdigest()
+
+        stored = store.claim(scoped_key, fingerprint)
+        if stored is None:
+            try:
+                response = make_response(fn(*args, **kwargs))
+            except Exception:
+                store.release(scoped_key)
+                raise
+            if response.status_code < 500:
+                store.complete(scoped_key, StoredResponse(fingerprint, response.status_code, response.get_data()))
+            else:
+                store.release(scoped_key)
+            return response
+
+        if stored.fingerprint != fingerprint:
+            return jsonify({'message': f'{IDEMPOTENCY_HEADER} was already used for a different request'}), 422
+        if stored.status_code is None:
+            response = jsonify({'message': f'A request with this {IDEMPOTENCY_HEADER} is still being processed'})
+            response.status_code = 409
+            response.headers['Retry-After'] = '1'
+            return response
+
+        response = current_app.response_class(stored.body, status=stored.status_code, mimetype='application/json')
+        response.headers[REPLAYED_HEADER] = 'true'
+        return response
+
+    return wrapper
@@ -0,0 +1,361 @@
+# backend/services/image_service.py
+# Uploaded images for cakes and customization options.
+#
+# The request thread only checks an upload (byte size, and the format and
+# pixel count from its header) and stores it under its SHA-256. Decoding,
+# resizing and encoding run on a small thread pool. Each variant is written
+# under the hash of its own bytes, so a URL always names the same content
+# and can be cached forever (see controllers/media_controller.py). When a
+# job finishes, every cake and option pointing at the source hash gets the
+# variant list and the listing caches are bumped.
+#
+# Pillow is imported on first use, so processes that never see an upload
+# don't pay for it on start-up.
+import hashlib
+import io
+import json
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from sqlalchemy.exc import IntegrityError
+from extensions import db, cache
+from models.cake import Cake
+from models.customization import CustomizationOption
+from models.image_asset import ImageAsset
+from services import serializers
+from services.cache_service import CATALOG_NAMESPACE, CUSTOMIZATIONS_NAMESPACE
+
+# Upload formats we decode ('MPO' is what many phone cameras write)
+ACCEPTED_FORMATS = {'JPEG', 'MPO', 'PNG', 'WEBP', 'AVIF', 'GIF'}
+
+# Output formats: Pillow writer, file extension, MIME type and save options
+OUTPUT_FORMATS = {
+    'avif': ('AVIF', 'avif', 'image/avif', {'speed': 8}),
+    'webp': ('WEBP', 'webp', 'image/webp', {'method': 4}),
+    'jpeg': ('JPEG', 'jpg', 'image/jpeg', {'optimize': True, 'progressive': True}),
+}
+
+# Preferred type for the plain image_url kept for clients without srcset
+FALLBACK_TYPES = ('image/webp', 'image/jpeg', 'image/avif')
+
+# Models that can point at an image, with the cache namespace they list in
+OWNERS = ((Cake, CATALOG_NAMESPACE), (CustomizationOption, CUSTOMIZATIONS_NAMESPACE))
+
+EXIF_ORIENTATION = 0x0112
+
+
+class ImageError(Exception):
+    """The upload is missing, too big or not an image we accept."""
+
+
+class ImageQueueFull(Exception):
+    """Raised when too many images are already waiting to be processed."""
+
+
+def available_formats(names):
+    """The configured output formats this Pillow build can encode."""
+    from PIL import features
+
+    return [name for name in names if name in OUTPUT_FORMATS and
+            (name == 'jpeg' or features.check(name))]
+
+
+def variant_widths(width, widths):
+    """Every configured width below `width`, plus the largest width the
+    image can fill without being upscaled."""
+    largest = min(width, max(widths))
+    return sorted({target for target in widths if target < largest} | {largest})
+
+
+def render_variants(data, widths, formats, quality):
+    """Decode `data` and encode it at each target width in each format.
+
+    Returns `(width, height, [(width, height, format, bytes), ...])`, where
+    the first two are the size of the (orientation-corrected) original.
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(io.BytesIO(data)) as image:
+        raw_width, raw_height = image.size
+        rotated = image.getexif().get(EXIF_ORIENTATION) in (5, 6, 7, 8)
+        width, height = (raw_height, raw_width) if rotated else (raw_width, raw_height)
+        targets = variant_widths(width, widths)
+
+        # JPEG can decode straight to 1/2, 1/4 or 1/8 scale, which is much
+        # cheaper than decoding everything and then resizing (no-op for others)
+        scale = targets[-1] / width
+        image.draft('RGB', (math.ceil(raw_width * scale), math.ceil(raw_height * scale)))
+
+        current = ImageOps.exif_transpose(image)
+        has_alpha = current.mode in ('RGBA', 'LA', 'PA') or (
+            current.mode == 'P' and 'transparency' in current.info)
+        mode = 'RGBA' if has_alpha else 'RGB'
+        if current.mode != mode:
+            current = current.convert(mode)
+
+        rendered = []
+        # Largest first, each size resized from the previous one
+        for target in reversed(targets):
+            if target != current.width:
+                target_height = max(1, round(current.height * target / current.width))
+                current = current.resize((target, target_height), Image.Resampling.LANCZOS, reducing_gap=3.0)
+            for name in formats:
+                writer, _, _, options = OUTPUT_FORMATS[name]
+                frame = current.convert('RGB') if writer == 'JPEG' and has_alpha else current
+                buffer = io.BytesIO()
+                frame.save(buffer, writer, quality=quality, **options)
+                rendered.append((current.width, current.height, name, buffer.getvalue()))
+
+    return width, height, rendered
+
+
+def fallback_url(variants):
+    """Largest variant of the most widely supported type."""
+    for content_type in FALLBACK_TYPES:
+        matching = [variant for variant in variants if variant['type'] == content_type]
+        if matching:
+            return max(matching, key=lambda variant: variant['width'])['url']
+    return None
+
+
+def asset_data(asset):
+    return {
+        'source_hash': asset.source_hash,
+        'status': asset.status,
+        'width': asset.width,
+        'height': asset.height,
+        'variants': serializers.json_list(asset.variants),
+        'error': asset.error,
+    }
+
+
+def _write_atomic(path, data):
+    if os.path.exists(path):
+        return
+    temporary = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(temporary, 'wb') as f:
+        f.write(data)
+    os.replace(temporary, path)
+
+
+class ImageProcessor:
+    """Turns uploads into resized variants on a dedicated thread pool.
+
+    Pillow releases the GIL while decoding, resizing and encoding, so a
+    few threads process images in parallel without a separate process.
+    At most IMAGE_QUEUE_LIMIT jobs may be queued or running; further
+    uploads fail fast with ImageQueueFull. With IMAGE_WORKERS = 0 images
+    are processed inline, before upload() returns.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.storage_dir = None
+        self.base_url = '/api/media'
+        self.widths = [320, 640, 960, 1280]
+        self.requested_formats = ['webp']
+        self.quality = 75
+        self.max_bytes = 15 * 1024 * 1024
+        self.max_pixels = 50_000_000
+        self.job_timeout = 300
+        self.queue_limit = 0
+        self._executor = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        config = app.config
+        self.app = app
+        self.storage_dir = config.get('IMAGE_STORAGE_DIR') or os.path.join(app.instance_path, 'images')
+        self.base_url = config.get('IMAGE_BASE_URL', '/api/media').rstrip('/')
+        self.widths = config.get('IMAGE_VARIANT_WIDTHS', self.widths)
+        self.requested_formats = config.get('IMAGE_FORMATS', ['avif', 'webp'])
+        self.quality = config.get('IMAGE_QUALITY', 75)
+        self.max_bytes = config.get('IMAGE_MAX_UPLOAD_BYTES', self.max_bytes)
+        self.max_pixels = config.get('IMAGE_MAX_PIXELS', self.max_pixels)
+        self.job_timeout = config.get('IMAGE_JOB_TIMEOUT_SECONDS', 300)
+        self.queue_limit = config.get('IMAGE_QUEUE_LIMIT', 16)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        workers = config.get('IMAGE_WORKERS', 2)
+        if workers > 0:
+            self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='image-process')
+        app.extensions['image_processor'] = self
+
+    # Storage -----------------------------------------------------------------
+
+    @property
+    def variants_dir(self):
+        return os.path.join(self.storage_dir, 'variants')
+
+    def original_path(self, source_hash):
+        return os.path.join(self.storage_dir, 'originals', source_hash)
+
+    def save_variant(self, name, data):
+        extension, content_type = OUTPUT_FORMATS[name][1:3]
+        filename = f'{hashlib.sha256(data).hexdigest()[:24]}.{extension}'
+        _write_atomic(os.path.join(self.variants_dir, filename), data)
+        return f'{self.base_url}/{filename}', content_type
+
+    # Upload (request thread) -------------------------------------------------
+
+    def read_upload(self, file):
+        if file is None:
+            raise ImageError('No image uploaded (expected a multipart "image" field)')
+        data = file.stream.read(self.max_bytes + 1)
+        if not data:
+            raise ImageError('The uploaded image is empty')
+        if len(data) > self.max_bytes:
+            raise ImageError(f'Images may be at most {self.max_bytes // (1024 * 1024)} MB')
+
+        # Image.open only parses the header; the pixels are decoded later
+        from PIL import Image, UnidentifiedImageError
+
+        try:
+            with Image.open(io.BytesIO(data)) as image:
+                image_format, (width, height) = image.format, image.size
+        except (UnidentifiedImageError, OSError, Image.DecompressionBombError):
+            raise ImageError('The uploaded file is not a supported image')
+        if image_format not in ACCEPTED_FORMATS:
+            raise ImageError(f'Unsupported image format: {image_format}')
+        if width * height > self.max_pixels:
+            raise ImageError('The uploaded image has too many pixels')
+        return data
+
+    def upload(self, target, file):
+        """Store an uploaded image for `target` (a Cake or CustomizationOption).
+
+        Commits the change. The returned ImageAsset is 'ready' when the same
+        file was processed before; otherwise it is 'pending' and the
+        variants are attached to `target` once the background job is done.
+        """
+        data = self.read_upload(file)
+        source_hash = hashlib.sha256(data).hexdigest()
+        os.makedirs(os.path.dirname(self.original_path(source_hash)), exist_ok=True)
+        _write_atomic(self.original_path(source_hash), data)
+
+        for attempt in range(2):
+            asset = ImageAsset.query.filter_by(source_hash=source_hash).first()
+            now = datetime.now()
+            queue = asset is None or asset.status == 'failed' or (
+                asset.status == 'pending' and asset.queued_at < now - timedelta(seconds=self.job_timeout))
+            if asset is None:
+                asset = ImageAsset(source_hash=source_hash)
+                db.session.add(asset)
+            if queue:
+                asset.status, asset.error, asset.queued_at = 'pending', None, now
+                # Take a queue slot before committing, so a full queue
+                # leaves nothing behind that no job will ever finish
+                self._reserve()
+
+            target.image_hash = source_hash
+            if asset.status == 'ready':
+                variants = serializers.json_list(asset.variants)
+                target.image_variants = asset.variants
+                target.image_url = fallback_url(variants)
+            try:
+                db.session.commit()
+                break
+            except IntegrityError:
+                # The same file was uploaded concurrently; use that asset
+                db.session.rollback()
+                if queue:
+                    self._release()
+                if attempt:
+                    raise
+        if asset.status == 'ready':
+            cache.bump(self._namespace(target))
+        if queue:
+            self._submit(source_hash)
+        return asset
+
+    def _namespace(self, target):
+        for model, namespace in OWNERS:
+            if isinstance(target, model):
+                return namespace
+
+    # Processing (pool threads) -----------------------------------------------
+
+    def _reserve(self):
+        if self._executor is None:
+            return
+        with self._lock:
+            if self._pending >= self.queue_limit:
+                raise ImageQueueFull()
+            self._pending += 1
+
+    def _release(self, *_):
+        if self._executor is None:
+            return
+        with self._lock:
+            self._pending -= 1
+
+    def _submit(self, source_hash):
+        if self._executor is None:
+            self.process(source_hash)
+            return
+        self._executor.submit(self._run, source_hash).add_done_callback(self._release)
+
+    def _run(self, source_hash):
+        with self.app.app_context():
+            self.process(source_hash)
+
+    def process(self, source_hash):
+        """Render, store and attach the variants of one uploaded image.
+        Must be called inside an app context."""
+        try:
+            with open(self.original_path(source_hash), 'rb') as f:
+                data = f.read()
+            formats = available_formats(self.requested_formats) or ['jpeg']
+            width, height, rendered = render_variants(data, self.widths, formats, self.quality)
+            os.makedirs(self.variants_dir, exist_ok=True)
+            variants = []
+            # Grouped by format in order of preference, smallest first
+            for variant_width, _, name, body in sorted(rendered, key=lambda item: (formats.index(item[2]), item[0])):
+                url, content_type = self.save_variant(name, body)
+                variants.append({'url': url, 'width': variant_width, 'type': content_type})
+        except Exception as e:
+            print(f"Error processing image {source_hash}: {str(e)}")
+            db.session.rollback()
+            ImageAsset.query.filter_by(source_hash=source_hash).update(
+                {'status': 'failed', 'error': str(e)[:500], 'processed_at': datetime.now()})
+            db.session.commit()
+            return
+
+        payload = json.dumps(variants)
+        ImageAsset.query.filter_by(source_hash=source_hash).update({
+            'status': 'ready', 'width': width, 'height': height, 'variants': payload,
+            'error': None, 'processed_at': datetime.now(),
+        })
+        # Only rows still pointing at this upload; a newer upload wins
+        touched = []
+        for model, namespace in OWNERS:
+            updated = model.query.filter(model.image_hash == source_hash).update(
+                {'image_variants': payload, 'image_url': fallback_url(variants)},
+                synchronize_session=False
+            )
+            if updated:
+                touched.append(namespace)
+        db.session.commit()
+        for namespace in touched:
+            cache.bump(namespace)
+
+    def wait(self):
+        """Block until every queued job has finished (scripts and benchmarks)."""
+        while self._pending:
+            time.sleep(0.01)
+
+
+image_processor = ImageProcessor()
+
+
+def init_app(app):
+    image_processor.init_app(app)
+
+
+def upload(target, file):
+    return image_processor.upload(target, file)
@@ -0,0 +1,236 @@
+# backend/services/metrics_service.py
+# Per-request timing, SQL counting and Prometheus metrics
+#
+# Metrics live in the memory of the worker process that handled the
+# request; nothing is shared between gunicorn workers. Every series carries
+# a worker="<pid>" label, so the series of different workers (and of a
+# worker that replaced a recycled one) never look like one counter going
+# backwards. Aggregate across workers in the query, e.g.
+# sum without (worker) (rate(http_requests_total[5m])).
+import hmac
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+slow_query_log = logging.getLogger('cakes.slow_query')
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class Histogram:
+    """Prometheus-style cumulative histogram with one series per label set."""
+
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self._series = {}  # labels -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self, label_names, constant=()):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            series = {labels: list(values) for labels, values in self._series.items()}
+        for labels, values in sorted(series.items()):
+            label_text = _labels(label_names, constant + labels)
+            cumulative = 0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{label_text},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{label_text},le="+Inf"}} {values[-1]}')
+            lines.append(f'{self.name}_sum{{{label_text}}} {round(values[-2], 6)}')
+            lines.append(f'{self.name}_count{{{label_text}}} {values[-1]}')
+        return lines
+
+
+class Counter:
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help_text = help_text
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels=(), amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self, label_names, constant=()):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        with self._lock:
+            values = dict(self._values)
+        for labels, value in sorted(values.items()):
+            label_text = _labels(label_names, constant + labels)
+            lines.append(f'{self.name}{{{label_text}}} {value}' if label_text else f'{self.name} {value}')
+        return lines
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values):
+    return ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+
+
+WORKER_LABEL = ('worker',)
+ROUTE_LABELS = ('route', 'method')
+
+requests_total = Counter('http_requests_total', 'Requests handled, by route, method and status.')
+request_duration = Histogram('http_request_duration_seconds', 'Wall time per request.', DURATION_BUCKETS)
+sql_queries = Histogram('http_request_sql_queries', 'SQL statements executed per request.', QUERY_COUNT_BUCKETS)
+sql_duration = Histogram('http_request_sql_duration_seconds', 'Time spent in SQL per request.', DURATION_BUCKETS)
+serialization_duration = Histogram(
+    'http_request_serialization_seconds', 'Time spent encoding JSON per request.', DURATION_BUCKETS
+)
+response_size = Histogram('http_response_size_bytes', 'Response body size.', SIZE_BUCKETS)
+slow_queries_total = Counter('db_slow_queries_total', 'SQL statements slower than SLOW_QUERY_MS.')
+
+# Minimum statement time (seconds) that gets logged; set from SLOW_QUERY_MS
+slow_query_seconds = 0.2
+
+
+class RequestMetrics:
+    __slots__ = ('start', 'sql_count', 'sql_time', 'serialization_time')
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.serialization_time = 0.0
+
+
+def current_metrics():
+    if has_request_context():
+        return g.get('_request_metrics')
+    return None
+
+
+# SQL timing hooks, registered once on the Engine class so they also cover
+# the replica engine and engines created by later create_app() calls. The
+# start time lives on the per-statement execution context, so a statement
+# that raises (and never reaches the after hook) leaves nothing behind on
+# the pooled connection.
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_start
+    metrics = current_metrics()
+    if metrics is not None:
+        metrics.sql_count += 1
+        metrics.sql_time += elapsed
+    if elapsed >= slow_query_seconds:
+        slow_queries_total.inc()
+        slow_query_log.warning('Slow query (%.1f ms): %s', elapsed * 1000, statement)
+
+
+def _install_engine_hooks():
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+def _timed_dumps(dumps):
+    def wrapper(obj, **kwargs):
+        start = time.perf_counter()
+        try:
+            return dumps(obj, **kwargs)
+        finally:
+            metrics = current_metrics()
+            if metrics is not None:
+                metrics.serialization_time += time.perf_counter() - start
+    return wrapper
+
+
+def render_metrics():
+    """This worker's metrics in Prometheus text format."""
+    worker = (str(os.getpid()),)
+    lines = requests_total.render(WORKER_LABEL + ROUTE_LABELS + ('status',), worker)
+    for histogram in (request_duration, sql_queries, sql_duration, serialization_duration, response_size):
+        lines.extend(histogram.render(WORKER_LABEL + ROUTE_LABELS, worker))
+    lines.extend(slow_queries_total.render(WORKER_LABEL, worker))
+    return '\n'.join(lines) + '\n'
+
+
+def init_app(app):
+    """Instrument every request of `app`.
+
+    Each response gets a Server-Timing header (total, db, serialize) and
+    is recorded per route template in the histograms served at
+    METRICS_PATH in Prometheus text format (to callers presenting
+    METRICS_TOKEN). METRICS_PATH only reports the worker process that
+    answers it. Statements slower than SLOW_QUERY_MS are logged with
+    their SQL text (not their parameters).
+    """
+    global slow_query_seconds
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+
+    slow_query_seconds = app.config.get('SLOW_QUERY_MS', 200) / 1000
+    _install_engine_hooks()
+    app.json.dumps = _timed_dumps(app.json.dumps)
+
+    @app.before_request
+    def start_request_metrics():
+        g._request_metrics = RequestMetrics()
+
+    @app.after_request
+    def record_request_metrics(response):
+        metrics = g.pop('_request_metrics', None)
+        if metrics is None:
+            return response
+
+        elapsed = time.perf_counter() - metrics.start
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        labels = (route, request.method)
+
+        requests_total.inc(labels + (response.status_code,))
+        request_duration.observe(labels, elapsed)
+        sql_queries.observe(labels, metrics.sql_count)
+        sql_duration.observe(labels, metrics.sql_time)
+        serialization_duration.observe(labels, metrics.serialization_time)
+        if not response.is_streamed:
+            response_size.observe(labels, response.calculate_content_length() or 0)
+
+        response.headers['Server-Timing'] = (
+            f'total;dur={elapsed * 1000:.2f}, '
+            f'db;dur={metrics.sql_time * 1000:.2f};desc="{metrics.sql_count} queries", '
+            f'serialize;dur={metrics.serialization_time * 1000:.2f}'
+        )
+        return response
+
+    # The metrics expose per-route traffic and pool internals, so scrapers
+    # must send METRICS_TOKEN as a bearer token; without one the endpoint
+    # isn't served at all
+    token = app.config.get('METRICS_TOKEN')
+    if not token:
+        return
+    expected = f'Bearer {token}'.encode()
+
+    def metrics():
+        given = request.headers.get('Authorization', '').encode()
+        if not hmac.compare_digest(given, expected):
+            return app.response_class('Unauthorized\n', status=401, mimetype='text/plain',
+                                      headers={'WWW-Authenticate': 'Bearer'})
+        return app.response_class(render_metrics(), mimetype='text/plain; version=0.0.4')
+
+    app.add_url_rule(app.config.get('METRICS_PATH', '/metrics'), 'metrics', metrics)
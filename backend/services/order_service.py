@@ -0,0 +1,199 @@
+# backend/services/order_service.py
+from datetime import datetime
+from sqlalchemy import insert
+from extensions import db
+from models.order import Order
+from models.order_customization import OrderCustomization
+from services import capacity_service, email_service, production_service, serializers
+from services.price_service import QuoteError, parse_selection, price_engine
+
+REQUIRED_FIELDS = ['cake_id', 'quantity', 'customer_name', 'customer_email',
+                   'customer_phone', 'delivery_date']
+
+
+class OrderError(Exception):
+    """An order payload that cannot be accepted, with the HTTP status to return."""
+
+    def __init__(self, message, status=422):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+def parse_order(data):
+    """Validate one order payload and return its cleaned values.
+
+    Raises OrderError for missing fields, bad dates or malformed ids. Does
+    not touch the database; cakes and options are checked when pricing.
+    """
+    if not isinstance(data, dict):
+        raise OrderError('Order must be a JSON object')
+
+    for field in REQUIRED_FIELDS:
+        if field not in data or not data[field]:
+            raise OrderError(f'Missing required field: {field}')
+
+    try:
+        delivery_date = datetime.strptime(data['delivery_date'], '%Y-%m-%d').date()
+    except (ValueError, TypeError):
+        raise OrderError('Invalid date format. Use YYYY-MM-DD')
+
+    if delivery_date <= datetime.now().date():
+        raise OrderError('Delivery date must be in the future')
+
+    try:
+        cake_id, quantity, customization_ids = parse_selection(data)
+    except QuoteError as e:
+        raise OrderError(e.message, e.status)
+
+    return {
+        'cake_id': cake_id,
+        'quantity': quantity,
+        'customer_name': data['customer_name'],
+        'customer_email': data['customer_email'],
+        'customer_phone': data['customer_phone'],
+        'delivery_date': delivery_date,
+        'special_requests': data.get('special_requests', ''),
+        'customization_ids': customization_ids,
+    }
+
+
+def fully_booked(error):
+    return OrderError(str(error), 409)
+
+
+def _error_result(index, error):
+    return {'index': index, 'status': 'error', 'code': error.status, 'message': error.message}
+
+
+def _order_values(order, user_id, quote):
+    values = {key: value for key, value in order.items() if key != 'customization_ids'}
+    values.update(user_id=user_id, total_price=quote['total_price'])
+    return values
+
+
+def create_order(data, user_id=None):
+    """Validate, price and save one order with its customizations.
+
+    The total comes from the price engine (cake plus selected options,
+    per cake); the cakes are booked against the delivery date's capacity,
+    and the chosen options (as OrderCustomization rows) and the
+    confirmation email are stored in the same commit. Returns the
+    encoded order.
+    """
+    order = parse_order(data)
+    try:
+        quote = price_engine.quote(order['cake_id'], order['quantity'], order['customization_ids'])
+    except QuoteError as e:
+        raise OrderError(e.message, e.status)
+
+    try:
+        capacity_service.reserve(order['delivery_date'], order['quantity'])
+    except capacity_service.DateFullyBooked as e:
+        db.session.rollback()
+        raise fully_booked(e)
+
+    new_order = Order(**_order_values(order, user_id, quote))
+    new_order.customizations = [
+        OrderCustomization(customization_option_id=option_id) for option_id in order['customization_ids']
+    ]
+    db.session.add(new_order)
+    db.session.flush()
+
+    # The confirmation email is queued in the same transaction as the order
+    order_data = serializers.ORDER.encode_object(new_order, cake_name=quote['cake_name'])
+    email_service.enqueue(email_service.order_confirmation(order_data))
+    db.session.commit()
+    email_service.notify()
+    production_service.invalidate(order['delivery_date'])
+
+    return order_data
+
+
+def create_orders_batch(payloads, user_id=None):
+    """Validate and insert many orders in a single transaction.
+
+    Every payload is validated and priced in one pass against the price
+    engine's in-memory table, so no cake or option queries are issued.
+    Their cakes are booked against the delivery dates' capacity with one
+    UPDATE per date; orders that no longer fit get a 409 error result.
+    The valid orders, their OrderCustomization rows and their confirmation
+    emails are written with bulk INSERTs in one commit. Returns one result
+    per payload, in order; invalid payloads get an error result and do not
+    block the others.
+    """
+    results = [None] * len(payloads)
+    prices = price_engine.table()
+
+    priced = []
+    for index, data in enumerate(payloads):
+        try:
+            order = parse_order(data)
+            quote = prices.quote(order['cake_id'], order['quantity'], order['customization_ids'])
+        except (OrderError, QuoteError) as e:
+            results[index] = _error_result(index, e)
+            continue
+        priced.append((index, order, quote))
+
+    if not priced:
+        return results
+
+    fitted = capacity_service.reserve_many([(order['delivery_date'], order['quantity']) for _, order, _ in priced])
+    accepted = []
+    for entry, fits in zip(priced, fitted):
+        if fits:
+            accepted.append(entry)
+        else:
+            index, order, _ = entry
+            error = fully_booked(capacity_service.DateFullyBooked(order['delivery_date']))
+            results[index] = _error_result(index, error)
+
+    if not accepted:
+        db.session.rollback()
+        return results
+
+    order_rows = [_order_values(order, user_id, quote) for _, order, quote in accepted]
+
+    inserted = db.session.execute(
+        insert(Order).returning(Order.id, Order.status, Order.created_at, sort_by_parameter_order=True),
+        order_rows
+    ).all()
+
+    link_rows = [
+        {'order_id': new_order.id, 'customization_option_id': option_id}
+        for (_, order, _), new_order in zip(accepted, inserted)
+        for option_id in order['customization_ids']
+    ]
+    if link_rows:
+        db.session.execute(insert(OrderCustomization), link_rows)
+
+    created = []
+    for (index, _, quote), row, new_order in zip(accepted, order_rows, inserted):
+        values = dict(row, id=new_order.id, status=new_order.status,
+                      created_at=new_order.created_at, cake_name=quote['cake_name'])
+        order_data = serializers.ORDER.encode([values[name] for name in serializers.ORDER.names])
+        results[index] = {'index': index, 'status': 'created', 'order': order_data}
+        created.append(order_data)
+
+    email_service.enqueue(*[email_service.order_confirmation(order_data) for order_data in created])
+    db.session.commit()
+    email_service.notify()
+    production_service.invalidate(*[order['delivery_date'] for _, order, _ in accepted])
+
+    return results
+
+
+def change_status(order, status):
+    """Set an order's status, keeping its delivery date's capacity in step.
+
+    Raises OrderError (409) when another request changed the status first,
+    or when a cancelled order is reinstated on a date that has filled up
+    since. Does not commit; call
+    production_service.invalidate() for the order's date after committing.
+    """
+    try:
+        return capacity_service.change_status(order, status)
+    except capacity_service.StatusConflict as e:
+        raise OrderError(str(e), 409)
+    except capacity_service.DateFullyBooked as e:
+        raise fully_booked(e)
@@ -0,0 +1,131 @@
+# backend/services/pagination.py
+# Keyset (cursor) pagination on (created_at, id), newest first.
+#
+# Each page is an indexed range scan that starts where the previous page
+# ended, so deep pages cost the same as the first one and no COUNT(*) is
+# needed. Cursors are opaque url-safe tokens.
+#
+# Page sizes are clamped to 1..MAX_PER_PAGE, so a client can't ask for the
+# whole table in one response.
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import String, literal, text, tuple_
+
+
+DEFAULT_PER_PAGE = 20
+MAX_PER_PAGE = 100
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class InvalidPageSize(ValueError):
+    pass
+
+
+def clamp_per_page(per_page):
+    return min(max(per_page, 1), MAX_PER_PAGE)
+
+
+def per_page_arg(args, default=DEFAULT_PER_PAGE):
+    """The `per_page` query parameter, clamped; raises InvalidPageSize when it isn't an integer."""
+    value = args.get('per_page')
+    if value is None or value == '':
+        return default
+    try:
+        return clamp_per_page(int(value))
+    except ValueError as e:
+        raise InvalidPageSize(f'per_page must be an integer: {value}') from e
+
+
+def encode_cursor(created_at, id, direction):
+    raw = json.dumps([created_at.isoformat() if created_at else None, id, direction])
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        created_at, id, direction = json.loads(base64.urlsafe_b64decode(padded))
+        if direction not in ('next', 'prev'):
+            raise ValueError(direction)
+        return datetime.fromisoformat(created_at), int(id), direction
+    except (ValueError, TypeError, json.JSONDecodeError) as e:
+        raise InvalidCursor(f'Invalid cursor: {token}') from e
+
+
+def _cursor_value(query, created_at):
+    # SQLite keeps datetimes as text: CURRENT_TIMESTAMP defaults have no
+    # fraction while SQLAlchemy writes microseconds, so compare against the
+    # matching text form instead of the DateTime bind format
+    if query.session.get_bind().dialect.name == 'sqlite':
+        return literal(created_at.isoformat(sep=' '), String)
+    return created_at
+
+
+def keyset_page(query, model, cursor=None, per_page=DEFAULT_PER_PAGE):
+    """Return one page of `query` ordered by (created_at, id) descending.
+
+    `cursor` is a token from a previous page's `next_cursor` or
+    `prev_cursor`; empty means the first page. Returns a dict with
+    `items`, `next_cursor` and `prev_cursor` (None when there is no such
+    page). Raises InvalidCursor for malformed tokens. `per_page` is
+    clamped to 1..MAX_PER_PAGE.
+    """
+    per_page = clamp_per_page(per_page)
+    key = tuple_(model.created_at, model.id)
+    direction = 'next'
+
+    if cursor:
+        created_at, id, direction = decode_cursor(cursor)
+        created_at = _cursor_value(query, created_at)
+        if direction == 'next':
+            query = query.filter(key < tuple_(created_at, id))
+        else:
+            query = query.filter(key > tuple_(created_at, id))
+
+    if direction == 'next':
+        query = query.order_by(model.created_at.desc(), model.id.desc())
+    else:
+        query = query.order_by(model.created_at.asc(), model.id.asc())
+
+    # Fetch one extra row to learn whether another page exists
+    rows = query.limit(per_page + 1).all()
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if direction == 'prev':
+        rows.reverse()
+
+    next_cursor = prev_cursor = None
+    if rows:
+        first, last = rows[0], rows[-1]
+        if direction == 'next':
+            next_cursor = encode_cursor(last.created_at, last.id, 'next') if has_more else None
+            prev_cursor = encode_cursor(first.created_at, first.id, 'prev') if cursor else None
+        else:
+            next_cursor = encode_cursor(last.created_at, last.id, 'next')
+            prev_cursor = encode_cursor(first.created_at, first.id, 'prev') if has_more else None
+
+    return {'items': rows, 'next_cursor': next_cursor, 'prev_cursor': prev_cursor}
+
+
+def count_total(query, mode):
+    """Total row count for a listing.
+
+    mode 'exact' runs COUNT(*); 'approximate' reads the planner's row
+    estimate on PostgreSQL (no table scan) and falls back to an exact
+    count on other databases. Any other mode returns None.
+    """
+    query = query.order_by(None)
+    dialect = query.session.get_bind().dialect
+    if mode == 'approximate' and dialect.name == 'postgresql':
+        statement = query.enable_eagerloads(False).statement.compile(
+            dialect=dialect, compile_kwargs={'literal_binds': True}
+        )
+        plan = query.session.execute(text(f'EXPLAIN (FORMAT JSON) {statement}')).scalar()
+        return int(plan[0]['Plan']['Plan Rows'])
+    if mode in ('exact', 'approximate'):
+        return query.count()
+    return None
@@ -0,0 +1,72 @@
+# backend/services/password_service.py
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from werkzeug.security import generate_password_hash, check_password_hash
+
+# werkzeug's own default, spelled out so stored hashes can be compared to it
+DEFAULT_METHOD = 'scrypt:32768:8:1'
+
+
+class HashingBusy(Exception):
+    """Raised when too many hash operations are already queued."""
+
+
+@lru_cache(maxsize=8)
+def _stored_prefix(method):
+    # werkzeug expands short specs ('pbkdf2:sha256') with its default cost
+    # parameters, so hash once to learn the exact prefix it will store
+    return generate_password_hash('', method=method, salt_length=1).split('$', 1)[0]
+
+
+class PasswordHasher:
+    """Hashes and verifies passwords on a small dedicated thread pool.
+
+    Password hashing is deliberately CPU-heavy. Running it on at most
+    PASSWORD_HASH_WORKERS threads caps how much CPU a login burst can take
+    from other requests, and once PASSWORD_HASH_QUEUE_LIMIT operations are
+    waiting, new ones fail fast with HashingBusy instead of piling up.
+    Without init_app (e.g. in scripts) hashing runs inline.
+    """
+
+    def __init__(self):
+        self.method = DEFAULT_METHOD
+        self.salt_length = 16
+        self.queue_limit = 0
+        self._executor = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.method = app.config.get('PASSWORD_HASH_METHOD', DEFAULT_METHOD)
+        self.salt_length = app.config.get('PASSWORD_HASH_SALT_LENGTH', 16)
+        self.queue_limit = app.config.get('PASSWORD_HASH_QUEUE_LIMIT', 32)
+        workers = app.config.get('PASSWORD_HASH_WORKERS', 2)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+        app.extensions['password_hasher'] = self
+
+    def _run(self, fn, *args):
+        if self._executor is None:
+            return fn(*args)
+
+        with self._lock:
+            if self._pending >= self.queue_limit:
+                raise HashingBusy()
+            self._pending += 1
+        try:
+            return self._executor.submit(fn, *args).result()
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method, self.salt_length)
+
+    def verify(self, password_hash, password):
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """True if the hash was made with a different method or cost."""
+        return password_hash.split('$', 1)[0] != _stored_prefix(self.method)
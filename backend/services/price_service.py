@@ -0,0 +1,133 @@
+# backend/services/price_service.py
+import threading
+import time
+from collections import namedtuple
+from extensions import db, cache
+from models.cake import Cake
+from models.customization import CustomizationOption
+from services.cache_service import CATALOG_NAMESPACE, CUSTOMIZATIONS_NAMESPACE
+
+CakePrice = namedtuple('CakePrice', ['id', 'name', 'price'])
+OptionPrice = namedtuple('OptionPrice', ['id', 'category', 'name', 'price'])
+
+
+class QuoteError(Exception):
+    """A selection that cannot be priced, with the HTTP status to return."""
+
+    def __init__(self, message, status=422):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+def parse_selection(data):
+    """Return (cake_id, quantity, option_ids) from an order or quote payload.
+
+    Quantity defaults to 1 and repeated option ids are dropped, keeping
+    the order the client sent them in.
+    """
+    customizations = data.get('customizations')
+    if customizations is None:
+        customizations = []
+    # Iterating a string or object would silently price the wrong options
+    if not isinstance(customizations, list):
+        raise QuoteError('customizations must be a list of option ids')
+
+    try:
+        cake_id = int(data['cake_id'])
+        quantity = int(data.get('quantity') or 1)
+        option_ids = list(dict.fromkeys(int(option_id) for option_id in customizations))
+    except KeyError:
+        raise QuoteError('Missing required field: cake_id')
+    except (ValueError, TypeError):
+        raise QuoteError('cake_id, quantity and customizations must be integers')
+
+    if quantity < 1:
+        raise QuoteError('Quantity must be at least 1')
+
+    return cake_id, quantity, option_ids
+
+
+class PriceTable:
+    """Immutable snapshot of every cake price and active option price."""
+
+    def __init__(self, cakes, options):
+        self.cakes = {cake.id: cake for cake in cakes}
+        self.options = {option.id: option for option in options}
+
+    @classmethod
+    def load(cls):
+        cakes = [CakePrice(*row) for row in db.session.query(Cake.id, Cake.name, Cake.price)]
+        options = [
+            OptionPrice(*row) for row in db.session.query(
+                CustomizationOption.id, CustomizationOption.category,
+                CustomizationOption.name, CustomizationOption.price
+            ).filter(CustomizationOption.active == True)
+        ]
+        return cls(cakes, options)
+
+    def quote(self, cake_id, quantity, option_ids=()):
+        """Price `quantity` cakes with the given options applied to each.
+
+        Raises QuoteError for an unknown cake or an unknown/inactive option.
+        """
+        cake = self.cakes.get(cake_id)
+        if cake is None:
+            raise QuoteError('Cake not found', 404)
+
+        unknown = [option_id for option_id in option_ids if option_id not in self.options]
+        if unknown:
+            raise QuoteError(f'Unknown customization options: {unknown}')
+
+        options = [self.options[option_id] for option_id in option_ids]
+        unit_price = cake.price + sum(option.price or 0 for option in options)
+        return {
+            'cake_id': cake.id,
+            'cake_name': cake.name,
+            'quantity': quantity,
+            'base_price': cake.price,
+            'customizations': [option._asdict() for option in options],
+            'unit_price': round(unit_price, 2),
+            'total_price': round(unit_price * quantity, 2)
+        }
+
+
+class PriceEngine:
+    """Serves quotes from an in-memory PriceTable.
+
+    The table is tied to the catalog and customization cache versions,
+    which every cake and option write already bumps, so the first quote
+    after a write reloads it with two SELECTs and every other quote is a
+    dictionary lookup. Like MaterializedPayload, the table is swapped in
+    with one reference assignment and also reloaded after the cache TTL.
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+        self._state = None  # (versions, built_at, PriceTable)
+        self._lock = threading.Lock()
+
+    def _versions(self):
+        return (self.cache.version(CATALOG_NAMESPACE), self.cache.version(CUSTOMIZATIONS_NAMESPACE))
+
+    def table(self):
+        versions = self._versions()
+        state = self._state
+        if state is not None and state[0] == versions and time.monotonic() - state[1] < self.cache.local.ttl:
+            return state[2]
+
+        table = PriceTable.load()
+        with self._lock:
+            # A slower concurrent load must not replace a newer one
+            if self._state is None or self._state[0] <= versions:
+                self._state = (versions, time.monotonic(), table)
+        return table
+
+    def quote(self, cake_id, quantity, option_ids=()):
+        return self.table().quote(cake_id, quantity, option_ids)
+
+    def invalidate(self):
+        self._state = None
+
+
+price_engine = PriceEngine(cache)
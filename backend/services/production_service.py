@@ -0,0 +1,168 @@
+# backend/services/production_service.py
+# Bake sheets: what the kitchen has to produce for each delivery date.
+#
+# A date's sheet lists the cakes ordered for it (orders and quantity per
+# cake) and the customization options chosen (orders, and cakes to apply
+# the option to). A whole date range is aggregated by one statement: the
+# cake totals grouped by date and cake, UNION ALL the option totals
+# grouped by date and option.
+#
+# Every date's sheet is cached on its own, under a namespace per date that
+# is bumped after an order for that date is placed, cancelled or
+# reinstated, so a range request only queries the dates that changed.
+# The catalog versions are part of the key, so renaming a cake or option
+# refreshes the names. Cancelled orders are left out.
+import csv
+import io
+import json
+from datetime import timedelta
+from sqlalchemy import String, cast, func, literal, null, select, union_all
+from extensions import db, cache
+from models.cake import Cake
+from models.customization import CustomizationOption
+from models.order import Order
+from models.order_customization import OrderCustomization
+from services.cache_service import CATALOG_NAMESPACE, CUSTOMIZATIONS_NAMESPACE
+from services.capacity_service import RELEASED_STATUSES
+from services.export_service import csv_cell
+from services.serializers import orjson
+
+BAKE_SHEET_NAMESPACE = 'bake-sheet'
+
+CSV_COLUMNS = ['delivery_date', 'kind', 'item_id', 'category', 'name', 'orders', 'quantity']
+
+
+def _dumps(value):
+    return orjson.dumps(value) if orjson is not None else json.dumps(value, separators=(',', ':')).encode()
+
+
+def _loads(body):
+    return orjson.loads(body) if orjson is not None else json.loads(body)
+
+
+def _namespace(day):
+    return f'{BAKE_SHEET_NAMESPACE}:{day.isoformat()}'
+
+
+def invalidate(*days):
+    """Drop the cached sheets of `days`; call after committing order changes."""
+    for day in set(days):
+        cache.bump(_namespace(day))
+
+
+def bake_sheet_query(start, end):
+    """Totals per (date, cake) and per (date, option) from `start` to `end`."""
+    counted = [Order.delivery_date.between(start, end), Order.status.notin_(RELEASED_STATUSES)]
+
+    cakes = (
+        select(
+            literal('cake').label('kind'), Order.delivery_date, Order.cake_id.label('item_id'),
+            cast(null(), String).label('category'), Cake.name,
+            func.count(Order.id).label('orders'), func.sum(Order.quantity).label('quantity')
+        )
+        .outerjoin(Cake, Order.cake_id == Cake.id)
+        .where(*counted)
+        .group_by(Order.delivery_date, Order.cake_id, Cake.name)
+    )
+    options = (
+        select(
+            literal('option').label('kind'), Order.delivery_date,
+            OrderCustomization.customization_option_id.label('item_id'),
+            CustomizationOption.category, CustomizationOption.name,
+            func.count(OrderCustomization.id).label('orders'), func.sum(Order.quantity).label('quantity')
+        )
+        .select_from(OrderCustomization)
+        .join(Order, OrderCustomization.order_id == Order.id)
+        .outerjoin(CustomizationOption, OrderCustomization.customization_option_id == CustomizationOption.id)
+        .where(*counted)
+        .group_by(Order.delivery_date, OrderCustomization.customization_option_id,
+                  CustomizationOption.category, CustomizationOption.name)
+    )
+    return union_all(cakes, options)
+
+
+def _empty_sheet(day):
+    return {'date': day.isoformat(), 'orders': 0, 'cakes_total': 0, 'cakes': [], 'customizations': []}
+
+
+def _build_sheets(start, end):
+    """Uncached sheets for every date from `start` to `end`, by date."""
+    sheets = {}
+    day = start
+    while day <= end:
+        sheets[day] = _empty_sheet(day)
+        day += timedelta(days=1)
+
+    for row in db.session.execute(bake_sheet_query(start, end)):
+        sheet = sheets[row.delivery_date]
+        if row.kind == 'cake':
+            sheet['cakes'].append({'cake_id': row.item_id, 'name': row.name,
+                                   'orders': row.orders, 'quantity': int(row.quantity)})
+            sheet['orders'] += row.orders
+            sheet['cakes_total'] += int(row.quantity)
+        else:
+            sheet['customizations'].append({'option_id': row.item_id, 'category': row.category,
+                                            'name': row.name, 'orders': row.orders,
+                                            'quantity': int(row.quantity)})
+
+    # Biggest batches first
+    for sheet in sheets.values():
+        sheet['cakes'].sort(key=lambda item: (-item['quantity'], item['name'] or ''))
+        sheet['customizations'].sort(key=lambda item: (item['category'] or '', -item['quantity'],
+                                                       item['name'] or ''))
+    return sheets
+
+
+def sheet_bodies(start, end):
+    """The JSON-encoded sheet of each date from `start` to `end`, in order.
+
+    Cached dates are read from the cache; the rest are built by one query
+    spanning the first to the last missing date.
+    """
+    days = [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+    key = f'c{cache.version(CATALOG_NAMESPACE)}.o{cache.version(CUSTOMIZATIONS_NAMESPACE)}'
+    # Versions are read before querying, so a sheet built while an order
+    # changes is stored under the old version and never served after it
+    versions = {day: cache.version(_namespace(day)) for day in days}
+
+    bodies = {}
+    for day in days:
+        payload = cache.peek(_namespace(day), key, versions[day])
+        if payload is not None:
+            bodies[day] = payload.body
+
+    missing = [day for day in days if day not in bodies]
+    if missing:
+        for day, sheet in _build_sheets(missing[0], missing[-1]).items():
+            body = _dumps(sheet)
+            cache.put(_namespace(day), key, versions[day], body)
+            bodies[day] = body
+
+    return [bodies[day] for day in days]
+
+
+def json_body(start, end):
+    """The response body for a range: raw cached sheets spliced together."""
+    return b''.join([
+        b'{"start_date":"', start.isoformat().encode(), b'","end_date":"', end.isoformat().encode(),
+        b'","days":[', b','.join(sheet_bodies(start, end)), b']}'
+    ])
+
+
+def csv_chunks(start, end):
+    """One CSV line per cake and per option, a chunk per date."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_COLUMNS)
+
+    for body in sheet_bodies(start, end):
+        sheet = _loads(body)
+        for item in sheet['cakes']:
+            writer.writerow([sheet['date'], 'cake', item['cake_id'], '', csv_cell(item['name']),
+                             item['orders'], item['quantity']])
+        for item in sheet['customizations']:
+            writer.writerow([sheet['date'], 'option', item['option_id'], csv_cell(item['category']),
+                             csv_cell(item['name']), item['orders'], item['quantity']])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
@@ -0,0 +1,64 @@
+# backend/services/query_service.py
+# Query builders that load everything a listing needs up front, so the
+# controllers run a fixed number of queries per page instead of one per row
+from sqlalchemy import func
+from extensions import db
+from models.cake import Cake
+from models.customization import CustomizationOption
+from models.order import Order
+from models.User import User
+
+# Joined columns that listings select next to the order's own columns
+ORDER_JOINED_COLUMNS = {
+    'cake_name': Cake.name,
+    'user_email': User.email,
+}
+
+
+def order_rows(names, session=None):
+    """Column query returning order rows with values in `names` order.
+
+    `names` is usually an encoder's field list from services.serializers;
+    the cake and user are outer-joined only when their columns are asked
+    for, so each listing is a single SELECT. `session` defaults to
+    db.session; pass db_service.read_session() to read from the replica.
+    """
+    columns = [
+        ORDER_JOINED_COLUMNS[name].label(name) if name in ORDER_JOINED_COLUMNS
+        else getattr(Order, name)
+        for name in names
+    ]
+    query = (session or db.session).query(*columns).select_from(Order)
+    if 'cake_name' in names:
+        query = query.outerjoin(Cake, Order.cake_id == Cake.id)
+    if 'user_email' in names:
+        query = query.outerjoin(User, Order.user_id == User.id)
+    return query
+
+
+def model_rows(model, names, session=None):
+    """Column query over `model` returning values in `names` order."""
+    return (session or db.session).query(*[getattr(model, name) for name in names])
+
+
+def user_rows(names, session=None):
+    # order_count is filled in separately by order_counts_for()
+    return model_rows(User, [name for name in names if name != 'order_count'], session)
+
+
+def cake_rows(names, session=None):
+    return model_rows(Cake, names, session)
+
+
+def customization_rows(names, session=None):
+    return model_rows(CustomizationOption, names, session)
+
+
+def order_counts_for(user_ids, session=None):
+    """Return {user_id: order_count} for the given users in one grouped query."""
+    if not user_ids:
+        return {}
+    rows = (session or db.session).query(Order.user_id, func.count(Order.id)).filter(
+        Order.user_id.in_(user_ids)
+    ).group_by(Order.user_id).all()
+    return dict(rows)
@@ -0,0 +1,173 @@
+# backend/services/rate_limit_service.py
+import math
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import jsonify, request
+from flask_jwt_extended import get_jwt_identity
+
+PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+
+def parse_limit(spec):
+    """Turn '10/minute' into (capacity, tokens added per second)."""
+    count, _, period = spec.partition('/')
+    count = int(count)
+    seconds = PERIODS[period.strip().rstrip('s')]
+    return count, count / seconds
+
+
+class MemoryBackend:
+    """Token buckets kept in this process.
+
+    A bucket holds up to `capacity` tokens and refills continuously, so a
+    '10/minute' limit allows a burst of 10 and then one request every six
+    seconds: a sliding one-minute window rather than a fixed one that
+    resets on the minute. The least recently used buckets are dropped
+    beyond `max_keys`; a dropped bucket simply starts full again.
+    """
+
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key, capacity, rate, cost=1):
+        """Take `cost` tokens; returns (allowed, seconds until allowed)."""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                tokens = capacity
+                if len(self._buckets) >= self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                tokens = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+                self._buckets.move_to_end(key)
+
+            if tokens >= cost:
+                self._buckets[key] = (tokens - cost, now)
+                return True, 0
+            self._buckets[key] = (tokens, now)
+            return False, (cost - tokens) / rate
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class RedisBackend:
+    """Token buckets shared by every worker process (needs `redis`).
+
+    The refill-and-take step runs as one Lua script, so concurrent
+    requests from different processes cannot overspend a bucket.
+    """
+
+    SCRIPT = """
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local cost = tonumber(ARGV[3])
+    local clock = redis.call('TIME')
+    local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+    local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+    local tokens = capacity
+    if bucket[1] then
+        tokens = math.min(capacity, tonumber(bucket[1]) + (now - tonumber(bucket[2])) * rate)
+    end
+    local allowed = 0
+    if tokens >= cost then
+        tokens = tokens - cost
+        allowed = 1
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+    return {allowed, tostring(tokens)}
+    """
+
+    def __init__(self, url):
+        import redis  # Optional dependency, only needed when RATE_LIMIT_REDIS_URL is set
+        self._client = redis.Redis.from_url(url)
+        self._script = self._client.register_script(self.SCRIPT)
+
+    def hit(self, key, capacity, rate, cost=1):
+        allowed, tokens = self._script(keys=[f'ratelimit:{key}'], args=[capacity, rate, cost])
+        if allowed:
+            return True, 0
+        return False, (cost - float(tokens)) / rate
+
+    def clear(self):
+        pass
+
+
+class RateLimiter:
+    """Applies the per-blueprint RATE_LIMITS to decorated views."""
+
+    def __init__(self):
+        self.enabled = True
+        self.backend = MemoryBackend()
+        self.limits = {}
+
+    def init_app(self, app):
+        self.enabled = app.config.get('RATE_LIMIT_ENABLED', True)
+        redis_url = app.config.get('RATE_LIMIT_REDIS_URL')
+        self.backend = RedisBackend(redis_url) if redis_url else \
+            MemoryBackend(app.config.get('RATE_LIMIT_MAX_KEYS', 100000))
+        self.limits = {
+            blueprint: parse_limit(spec)
+            for blueprint, spec in (app.config.get('RATE_LIMITS') or {}).items() if spec
+        }
+        app.extensions['rate_limiter'] = self
+
+    def hit(self, key, limit, cost=1):
+        capacity, rate = limit
+        # A request costing more than the whole bucket could never pass
+        return self.backend.hit(key, capacity, rate, min(cost, capacity))
+
+
+limiter = RateLimiter()
+
+
+def init_app(app):
+    limiter.init_app(app)
+
+
+def client_key():
+    """The signed-in user's id, falling back to the client IP for guests."""
+    try:
+        identity = get_jwt_identity()
+    except RuntimeError:
+        # No @jwt_required on this view, so there is no identity to read
+        identity = None
+    return f'user:{identity}' if identity else f'ip:{request.remote_addr}'
+
+
+def too_many_requests(retry_after):
+    response = jsonify({'message': 'Too many requests, please try again later'})
+    response.status_code = 429
+    response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+    return response
+
+
+def rate_limited(cost=1):
+    """Limit a view with its blueprint's entry in RATE_LIMITS.
+
+    Buckets are per client (user id, else IP) and per endpoint. `cost` is
+    the number of tokens a request takes, or a function of no arguments
+    returning it, so expensive requests (e.g. a batch of orders) use up
+    more of the budget. Apply below @jwt_required so signed-in users get
+    their own bucket instead of sharing their IP's.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            limit = limiter.limits.get(request.blueprint)
+            if limiter.enabled and limit is not None:
+                amount = cost() if callable(cost) else cost
+                allowed, retry_after = limiter.hit(f'{request.endpoint}:{client_key()}', limit, amount)
+                if not allowed:
+                    return too_many_requests(retry_after)
+            return fn(*args, **kwargs)
+
+        return wrapper
+    return decorator
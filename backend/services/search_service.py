@@ -0,0 +1,350 @@
+# backend/services/search_service.py
+# Text search over cakes and customization options with price-range and
+# category facets.
+#
+# On PostgreSQL the text match uses the GIN-indexed tsvector expressions
+# declared on the models, and the page of hits, the total and every facet
+# count come back from one UNION ALL query. Other databases (SQLite in
+# development and tests) search an in-memory inverted index that is
+# rebuilt whenever the catalog or customization cache version changes.
+import bisect
+import re
+import threading
+import time
+from collections import Counter, namedtuple
+from flask import current_app
+from sqlalchemy import Integer, String, case, cast, func, literal, literal_column, null, select, union_all
+from extensions import db, cache
+from models.cake import Cake, CAKE_SEARCH_DOCUMENT
+from models.customization import CustomizationOption, OPTION_SEARCH_DOCUMENT
+from services.cache_service import CATALOG_NAMESPACE, CUSTOMIZATIONS_NAMESPACE
+from services import db_service, query_service, serializers
+
+TOKEN = re.compile(r'\w+')
+MAX_TERMS = 8
+SORTS = ('relevance', 'price_asc', 'price_desc', 'name')
+
+SearchParams = namedtuple('SearchParams', ['terms', 'min_price', 'max_price', 'category', 'sort', 'limit', 'offset'])
+
+
+class SearchError(Exception):
+    """Invalid search parameters; the message is safe to return (HTTP 400)."""
+
+
+class SearchTarget:
+    """A searchable model: its list encoder, text fields and facets.
+
+    `text_fields` are (column, weight) pairs for the in-memory index, where
+    a hit in a heavier field ranks higher. `document` is the SQL tsvector
+    expression the PostgreSQL index was built on.
+    """
+
+    def __init__(self, name, model, encoder, document, namespace, text_fields, conditions=(), has_category=False):
+        self.name = name
+        self.model = model
+        self.encoder = encoder
+        self.document = document
+        self.namespace = namespace
+        self.text_fields = text_fields
+        self.conditions = conditions
+        self.has_category = has_category
+
+    def rows(self, session=None):
+        return query_service.model_rows(self.model, self.encoder.names, session).filter(*self.conditions)
+
+
+CAKES = SearchTarget(
+    'cakes', Cake, serializers.CAKE, CAKE_SEARCH_DOCUMENT, CATALOG_NAMESPACE,
+    [('name', 2), ('description', 1)]
+)
+CUSTOMIZATIONS = SearchTarget(
+    'customizations', CustomizationOption, serializers.CUSTOMIZATION_OPTION, OPTION_SEARCH_DOCUMENT,
+    CUSTOMIZATIONS_NAMESPACE, [('name', 2), ('category', 2), ('description', 1)],
+    conditions=(CustomizationOption.active == True,), has_category=True
+)
+
+
+def _number(value, name):
+    if value in (None, ''):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        raise SearchError(f'{name} must be a number')
+
+
+def parse_params(args, target):
+    """Validate the query string of a search request into SearchParams."""
+    config = current_app.config
+    terms = tuple(TOKEN.findall(args.get('q', '').lower()))[:MAX_TERMS]
+    min_price = _number(args.get('min_price'), 'min_price')
+    max_price = _number(args.get('max_price'), 'max_price')
+    if min_price is not None and max_price is not None and min_price > max_price:
+        raise SearchError('min_price cannot be greater than max_price')
+
+    sort = args.get('sort') or 'relevance'
+    if sort not in SORTS:
+        raise SearchError(f'sort must be one of: {", ".join(SORTS)}')
+
+    try:
+        limit = int(args.get('limit', config.get('SEARCH_DEFAULT_LIMIT', 20)))
+        offset = int(args.get('offset', 0))
+    except ValueError:
+        raise SearchError('limit and offset must be integers')
+    if limit < 1 or offset < 0:
+        raise SearchError('limit must be at least 1 and offset cannot be negative')
+
+    category = (args.get('category') or None) if target.has_category else None
+    return SearchParams(terms, min_price, max_price, category, sort,
+                        min(limit, config.get('SEARCH_MAX_LIMIT', 100)), offset)
+
+
+def price_ranges(bounds):
+    """[(min, max), ...] for the facet buckets; the last one is open-ended."""
+    edges = [0] + list(bounds)
+    return list(zip(edges, edges[1:] + [None]))
+
+
+def build_result(target, params, bounds, hits, total, price_counts, category_counts):
+    facets = {
+        'price': [
+            {'min': low, 'max': high, 'count': price_counts.get(index, 0)}
+            for index, (low, high) in enumerate(price_ranges(bounds))
+        ]
+    }
+    if target.has_category:
+        facets['category'] = [
+            {'value': value, 'count': count}
+            for value, count in sorted(category_counts.items(), key=lambda item: (-item[1], item[0]))
+        ]
+    return {
+        'results': target.encoder.many(hits),
+        'total': total,
+        'limit': params.limit,
+        'offset': params.offset,
+        'facets': facets,
+    }
+
+
+class SearchIndex:
+    """Inverted index over one target's rows (encoder-ordered tuples).
+
+    Terms match as word prefixes, so "choc" finds "chocolate"; every term
+    has to match. A row's score is the sum of the weights of the fields
+    its matching words occur in.
+    """
+
+    def __init__(self, target, rows):
+        self.target = target
+        self.rows = rows
+        names = target.encoder.names
+        self._id = names.index('id')
+        self._name = names.index('name')
+        self._price = names.index('price')
+        self._category = names.index('category') if target.has_category else None
+
+        postings = {}
+        for position, row in enumerate(rows):
+            for field, weight in target.text_fields:
+                for word in TOKEN.findall((row[names.index(field)] or '').lower()):
+                    entry = postings.setdefault(word, {})
+                    entry[position] = entry.get(position, 0) + weight
+        self.postings = postings
+        self.vocabulary = sorted(postings)
+
+    def scores(self, terms):
+        """{row position: score} for the rows matching every term."""
+        result = None
+        for term in terms:
+            matches = {}
+            vocabulary = self.vocabulary
+            index = bisect.bisect_left(vocabulary, term)
+            while index < len(vocabulary) and vocabulary[index].startswith(term):
+                word = vocabulary[index]
+                index += 1
+                for position, weight in self.postings[word].items():
+                    matches[position] = matches.get(position, 0) + weight
+            result = matches if result is None else \
+                {position: score + matches[position] for position, score in result.items() if position in matches}
+            if not result:
+                break
+        return result or {}
+
+    def _sort_key(self, params, scores):
+        name, price, row_id = self._name, self._price, self._id
+        if params.sort == 'price_asc':
+            return lambda row: (row[price] or 0, row[row_id])
+        if params.sort == 'price_desc':
+            return lambda row: (-(row[price] or 0), row[row_id])
+        if params.sort == 'relevance' and params.terms:
+            return lambda row: (-scores[row[row_id]], row[name], row[row_id])
+        return lambda row: (row[name], row[row_id])
+
+    def search(self, params, bounds):
+        if params.terms:
+            matched = self.scores(params.terms)
+            candidates = [self.rows[position] for position in matched]
+            scores = {self.rows[position][self._id]: score for position, score in matched.items()}
+        else:
+            candidates, scores = self.rows, {}
+
+        price, category = self._price, self._category
+        # Each facet counts rows passing every filter except its own, so the
+        # UI can show what widening that filter would add
+        hits, price_counts, category_counts = [], Counter(), Counter()
+        for row in candidates:
+            value = row[price] or 0
+            in_price = (params.min_price is None or value >= params.min_price) and \
+                       (params.max_price is None or value <= params.max_price)
+            in_category = params.category is None or row[category] == params.category
+            if in_category:
+                price_counts[bisect.bisect_right(bounds, value)] += 1
+            if in_price and category is not None:
+                category_counts[row[category]] += 1
+            if in_price and in_category:
+                hits.append(row)
+
+        hits.sort(key=self._sort_key(params, scores))
+        page = hits[params.offset:params.offset + params.limit]
+        return build_result(self.target, params, bounds, page, len(hits), price_counts, category_counts)
+
+
+class MemorySearch:
+    """Keeps one SearchIndex per target, tied to the target's cache version.
+
+    Like the PriceEngine's table, an index is rebuilt with one SELECT on
+    the first search after a catalog write (or after the cache TTL) and
+    swapped in with a single reference assignment.
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+        self._states = {}  # target name -> (version, built_at, SearchIndex)
+        self._lock = threading.Lock()
+
+    def index(self, target):
+        version = self.cache.version(target.namespace)
+        state = self._states.get(target.name)
+        if state is not None and state[0] == version and time.monotonic() - state[1] < self.cache.local.ttl:
+            return state[2]
+
+        index = SearchIndex(target, [tuple(row) for row in target.rows().all()])
+        with self._lock:
+            # A slower concurrent build must not replace a newer one
+            state = self._states.get(target.name)
+            if state is None or state[0] <= version:
+                self._states[target.name] = (version, time.monotonic(), index)
+        return index
+
+    def invalidate(self):
+        self._states = {}
+
+
+memory_search = MemorySearch(cache)
+
+
+def _order_by(params, matched):
+    if params.sort == 'price_asc':
+        return [matched.c.price.asc(), matched.c.id]
+    if params.sort == 'price_desc':
+        return [matched.c.price.desc(), matched.c.id]
+    if params.sort == 'relevance' and params.terms:
+        return [matched.c.rank.desc(), matched.c.name, matched.c.id]
+    return [matched.c.name, matched.c.id]
+
+
+def sql_search(target, params, bounds, session=None):
+    """Search with PostgreSQL full-text search in a single statement.
+
+    The text match runs once in a CTE; UNION ALL branches over it return
+    the page of hits (with their position), the filtered total and the
+    price and category facet counts.
+    """
+    model = target.model
+    price = func.coalesce(model.price, 0)
+    conditions = list(target.conditions)
+    rank = literal(0.0)
+    if params.terms:
+        document = literal_column(target.document)
+        query = func.to_tsquery('english', ' & '.join(f'{term}:*' for term in params.terms))
+        conditions.append(document.op('@@')(query))
+        rank = func.ts_rank(document, query)
+
+    bucket = case(*[(price < bound, index) for index, bound in enumerate(bounds)], else_=len(bounds))
+    matched = select(
+        *[getattr(model, name) for name in target.encoder.names],
+        rank.label('rank'), bucket.label('bucket')
+    ).where(*conditions).cte('matched')
+
+    in_price = []
+    if params.min_price is not None:
+        in_price.append(func.coalesce(matched.c.price, 0) >= params.min_price)
+    if params.max_price is not None:
+        in_price.append(func.coalesce(matched.c.price, 0) <= params.max_price)
+    in_category = [matched.c.category == params.category] if params.category is not None else []
+
+    columns = [matched.c[name] for name in target.encoder.names]
+    empty = [cast(null(), column.type) for column in columns]
+
+    def branch(kind, position, facet_value, facet_count, values):
+        return [literal(kind, String).label('kind'), position.label('position'),
+                facet_value.label('facet_value'), facet_count.label('facet_count'), *values]
+
+    order = _order_by(params, matched)
+    page = select(*columns, func.row_number().over(order_by=order).label('position')).where(
+        *in_price, *in_category
+    ).order_by(*order).limit(params.limit).offset(params.offset).subquery('page')
+
+    branches = [
+        select(*branch('hit', page.c.position, cast(null(), String), cast(null(), Integer),
+                       [page.c[name] for name in target.encoder.names])),
+        select(*branch('total', cast(null(), Integer), cast(null(), String), func.count(), empty)).where(
+            *in_price, *in_category
+        ),
+        select(*branch('price', cast(null(), Integer), cast(matched.c.bucket, String), func.count(), empty)).where(
+            *in_category
+        ).group_by(matched.c.bucket),
+    ]
+    if target.has_category:
+        branches.append(
+            select(*branch('category', cast(null(), Integer), matched.c.category, func.count(), empty)).where(
+                *in_price
+            ).group_by(matched.c.category)
+        )
+
+    hits, total, price_counts, category_counts = [], 0, {}, {}
+    for row in (session or db.session).execute(union_all(*branches)):
+        if row.kind == 'hit':
+            hits.append((row.position, tuple(row[4:])))
+        elif row.kind == 'total':
+            total = row.facet_count
+        elif row.kind == 'price':
+            price_counts[int(row.facet_value)] = row.facet_count
+        else:
+            category_counts[row.facet_value] = row.facet_count
+    hits.sort()
+    return build_result(target, params, bounds, [values for _, values in hits], total, price_counts, category_counts)
+
+
+def backend_name():
+    backend = current_app.config.get('SEARCH_BACKEND', 'auto')
+    if backend == 'auto':
+        return 'postgres' if db.engine.dialect.name == 'postgresql' else 'memory'
+    return backend
+
+
+def prime():
+    """Build the in-memory indexes ahead of the first search (no-op on PostgreSQL)."""
+    if backend_name() == 'memory':
+        for target in (CAKES, CUSTOMIZATIONS):
+            memory_search.index(target)
+
+
+def search(target, args):
+    """Run a search request for `target`; `args` is the request's query string."""
+    params = parse_params(args, target)
+    bounds = sorted(current_app.config.get('SEARCH_PRICE_BUCKETS') or (25, 50, 100))
+
+    if backend_name() == 'postgres':
+        return sql_search(target, params, bounds, db_service.read_session())
+    return memory_search.index(target).search(params, bounds)
@@ -0,0 +1,119 @@
+# backend/services/serializers.py
+# Row-to-JSON encoders for list endpoints.
+#
+# Each encoder generates a plain Python function once, at import time, that
+# turns a tuple or Core row (fields in a fixed order) into a dict. List
+# endpoints select just these columns and skip both ORM instance
+# construction and Marshmallow's per-field dispatch.
+import json
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # Falls back to the stdlib encoder
+    orjson = None
+
+
+def iso_or_none(value):
+    return value.isoformat() if value is not None else None
+
+
+def json_list(value):
+    """Decode a JSON list stored in a text column (None becomes [])."""
+    if not value:
+        return []
+    return orjson.loads(value) if orjson is not None else json.loads(value)
+
+
+def or_default(default):
+    def convert(value):
+        return value if value is not None else default
+    return convert
+
+
+class RowEncoder:
+    """Encodes rows whose values are in the order of `fields`.
+
+    `fields` is a list of names or `(name, converter)` pairs. The generated
+    `encode(row)` indexes the row positionally, so it accepts tuples,
+    SQLAlchemy Core rows and column-query results alike.
+    """
+
+    def __init__(self, fields):
+        fields = [field if isinstance(field, tuple) else (field, None) for field in fields]
+        self.names = [name for name, _ in fields]
+
+        namespace = {}
+        items = []
+        for index, (name, converter) in enumerate(fields):
+            if converter is None:
+                items.append(f'{name!r}: row[{index}]')
+            else:
+                namespace[f'convert_{index}'] = converter
+                items.append(f'{name!r}: convert_{index}(row[{index}])')
+        source = 'def encode(row):\n    return {' + ', '.join(items) + '}\n'
+        exec(source, namespace)
+        self.encode = namespace['encode']
+
+    def many(self, rows):
+        encode = self.encode
+        return [encode(row) for row in rows]
+
+    def encode_object(self, obj, **values):
+        """Encode a single ORM instance; `values` supplies fields that are
+        not attributes of `obj` (e.g. a joined cake name)."""
+        return self.encode([values[name] if name in values else getattr(obj, name)
+                            for name in self.names])
+
+
+ORDER = RowEncoder([
+    'id', 'cake_id', 'quantity', 'customer_name', 'customer_email', 'customer_phone',
+    ('delivery_date', iso_or_none), 'special_requests', 'total_price', 'status',
+    ('created_at', iso_or_none), ('cake_name', or_default('Unknown Cake'))
+])
+
+ADMIN_ORDER = RowEncoder([
+    'id', 'user_id', 'cake_id', 'quantity', 'customer_name', 'customer_email',
+    'customer_phone', ('delivery_date', iso_or_none), 'special_requests', 'total_price',
+    'status', ('created_at', iso_or_none), ('cake_name', or_default('Unknown Cake')),
+    ('user_email', or_default('Guest'))
+])
+
+ADMIN_USER = RowEncoder([
+    'id', 'name', 'email', 'phone', 'is_admin', ('created_at', iso_or_none), 'order_count'
+])
+
+CAKE = RowEncoder(['id', 'name', 'description', 'price', 'image_url', ('image_variants', json_list)])
+
+ADMIN_CAKE = RowEncoder([
+    'id', 'name', 'description', 'price', 'image_url', ('image_variants', json_list),
+    ('created_at', iso_or_none), ('updated_at', iso_or_none)
+])
+
+CUSTOMIZATION_OPTION = RowEncoder([
+    'id', 'category', 'name', 'price', 'active', 'description', 'image_url',
+    ('image_variants', json_list)
+])
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson when it is installed.
+
+    Dates still go through Flask's default hook, so responses look the same
+    as with the stdlib provider.
+    """
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None:
+            return super().dumps(obj, **kwargs)
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
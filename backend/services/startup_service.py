@@ -0,0 +1,115 @@
+# backend/services/startup_service.py
+# Cold-start bookkeeping for create_app()
+#
+# StartupTimer splits the time from the first import of app.py to the end
+# of create_app() into phases; the report is kept in
+# app.extensions['startup'] and logged when STARTUP_TIMING is on, together
+# with the time until the first request is served.
+#
+# LazyMigrate stands in for Flask-Migrate: importing flask_migrate pulls in
+# Alembic (and Mako), which every web worker and CLI script would otherwise
+# pay for on start-up, so the real extension is only loaded when a
+# `flask db ...` command runs.
+import logging
+import time
+
+import click
+
+startup_log = logging.getLogger('cakes.startup')
+
+LOG_FORMAT = '[%(asctime)s] %(levelname)s in %(name)s: %(message)s'
+
+
+def _enable_log():
+    """Make sure the INFO lines reach stderr (gunicorn's error log).
+
+    Nothing configures the root logger, so without a handler and level of
+    its own the logger would fall through to Python's last-resort handler,
+    which drops anything below WARNING.
+    """
+    startup_log.setLevel(logging.INFO)
+    if not startup_log.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        startup_log.addHandler(handler)
+        startup_log.propagate = False
+
+
+class StartupTimer:
+    """Record named phases as the time elapsed since the previous mark."""
+
+    def __init__(self, started=None):
+        self.started = started or time.perf_counter()
+        self._last = self.started
+        self.phases = {}
+
+    def mark(self, name):
+        now = time.perf_counter()
+        self.phases[name] = round((now - self._last) * 1000, 2)
+        self._last = now
+
+    def report(self):
+        return {
+            'phases_ms': dict(self.phases),
+            'total_ms': round((self._last - self.started) * 1000, 2),
+        }
+
+
+def init_app(app, timer):
+    report = timer.report()
+    app.extensions['startup'] = report
+    if not app.config.get('STARTUP_TIMING'):
+        return
+
+    _enable_log()
+    phases = ' '.join(f'{name}={ms}ms' for name, ms in report['phases_ms'].items())
+    startup_log.info('create_app %sms (%s)', report['total_ms'], phases)
+
+    served = []
+
+    @app.after_request
+    def log_first_request(response):
+        if not served:
+            served.append(True)
+            report['first_request_ms'] = round((time.perf_counter() - timer.started) * 1000, 2)
+            startup_log.info('first request served %sms after start-up', report['first_request_ms'])
+        return response
+
+
+class LazyCommandGroup(click.Group):
+    """A CLI group whose real implementation is imported on first use.
+
+    `flask --help` lists it without importing anything; running one of its
+    commands hands parsing over to the group returned by `load()`.
+    """
+
+    def __init__(self, name, load, **attrs):
+        super().__init__(name, **attrs)
+        self._load = load
+
+    def make_context(self, info_name, args, parent=None, **extra):
+        return self._load().make_context(info_name, args, parent=parent, **extra)
+
+
+class LazyMigrate:
+    """Drop-in for flask_migrate.Migrate that defers importing Alembic."""
+
+    def __init__(self, directory='migrations', command='db'):
+        self.directory = directory
+        self.command = command
+        self.migrate = None
+
+    def init_app(self, app, db):
+        def load():
+            from flask_migrate import Migrate
+            from flask_migrate.cli import db as db_cli_group
+
+            if self.migrate is None:
+                self.migrate = Migrate(directory=self.directory, command=self.command)
+            # Sets app.extensions['migrate'], which migrations/env.py reads
+            self.migrate.init_app(app, db)
+            return db_cli_group
+
+        app.cli.add_command(
+            LazyCommandGroup(self.command, load, help='Perform database migrations.')
+        )
@@ -0,0 +1,45 @@
+# backend/services/stats_service.py
+from datetime import datetime, timedelta
+from sqlalchemy import case, func, select
+from services.db_service import read_session
+from models.order import Order
+from models.User import User
+
+ORDER_STATUSES = ['pending', 'confirmed', 'completed', 'cancelled']
+REVENUE_STATUSES = ['completed', 'confirmed']
+
+
+def dashboard_stats_query(since):
+    """Build one SELECT that returns every dashboard aggregate.
+
+    Order aggregates use conditional COUNT/SUM over a single scan of the
+    order table, and the user total is folded in as a scalar subquery, so
+    the whole dashboard costs one database round trip.
+    """
+    status_counts = [
+        func.count(case((Order.status == status, 1))).label(status)
+        for status in ORDER_STATUSES
+    ]
+    return select(
+        select(func.count(User.id)).scalar_subquery().label('total_users'),
+        func.count(Order.id).label('total_orders'),
+        *status_counts,
+        func.count(case((Order.created_at >= since, 1))).label('recent_orders'),
+        func.coalesce(
+            func.sum(case((Order.status.in_(REVENUE_STATUSES), Order.total_price), else_=0)),
+            0
+        ).label('total_revenue')
+    ).select_from(Order)
+
+
+def get_dashboard_stats(recent_days=7):
+    since = datetime.now() - timedelta(days=recent_days)
+    row = read_session().execute(dashboard_stats_query(since)).one()
+
+    return {
+        'total_users': row.total_users,
+        'total_orders': row.total_orders,
+        'orders_by_status': {status: getattr(row, status) for status in ORDER_STATUSES},
+        'recent_orders': row.recent_orders,
+        'total_revenue': float(row.total_revenue or 0)
+    }
@@ -0,0 +1,71 @@
+# backend/services/warmup_service.py
+# Process start-up for the production server (see gunicorn.conf.py).
+#
+# The master process builds the app and primes the in-process caches once
+# before forking, so every worker starts with them already in memory
+# (shared copy-on-write). Each worker then drops the database connections
+# it inherited, opens its own pool connections and re-primes anything
+# stale before it accepts its first request.
+import time
+from extensions import db
+from services import search_service
+from services.price_service import price_engine
+
+
+def prime_caches(app):
+    """Load the catalog, customization menu, price table and search indexes.
+
+    Calls the payload builders directly rather than issuing requests, so
+    no request hooks (e.g. the email dispatcher's start) run in the master.
+    """
+    # Imported here: the controllers are registered by create_app()
+    from controllers.cake_controller import catalog_payload
+    from controllers.customization_controller import customization_menu
+
+    with app.app_context():
+        catalog_payload()
+        customization_menu.get()
+        price_engine.table()
+        search_service.prime()
+
+
+def reset_after_fork(app):
+    """Forget connections inherited from the parent without closing them,
+    since the parent (or a sibling) may still be using the sockets."""
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+
+def open_connections(app, count):
+    """Fill each engine's pool with up to `count` live connections."""
+    opened = 0
+    with app.app_context():
+        for engine in db.engines.values():
+            # Check them out together so the pool has to create each one
+            size = getattr(engine.pool, 'size', lambda: count)()
+            connections = []
+            try:
+                for _ in range(min(count, size)):
+                    connection = engine.connect()
+                    connection.exec_driver_sql('SELECT 1')
+                    connections.append(connection)
+            finally:
+                for connection in connections:
+                    connection.close()
+            opened += len(connections)
+    return opened
+
+
+def warm_up(app):
+    """Prepare a freshly started worker; returns timings for the log."""
+    start = time.perf_counter()
+    opened = open_connections(app, app.config.get('SERVER_WARM_CONNECTIONS', 4))
+    connected = time.perf_counter()
+    prime_caches(app)
+    primed = time.perf_counter()
+    return {
+        'connections': opened,
+        'connect_ms': round((connected - start) * 1000, 1),
+        'prime_ms': round((primed - connected) * 1000, 1),
+    }
@@ -0,0 +1,14 @@
+# backend/wsgi.py
+# WSGI entry point for production servers:
+#   gunicorn -c gunicorn.conf.py wsgi:app
+import gc
+
+from app import app
+from services import warmup_service
+
+# Imported once in the gunicorn master (preload_app): prime the caches
+# here so the workers fork with them in memory, then move everything
+# allocated so far out of the garbage collector's reach. Collections in
+# the workers would otherwise touch these objects and un-share their pages.
+warmup_service.prime_caches(app)
+gc.freeze()
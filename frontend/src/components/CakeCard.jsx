@@ -1,4 +1,5 @@
 import React from "react";
+import ResponsiveImage from "./ResponsiveImage";
 import "./CakeCard.css";
 
 const CakeCard = ({ cake, onClick, isDarkMode }) => {
@@ -7,7 +8,13 @@ const CakeCard = ({ cake, onClick, isDarkMode }) => {
       className={`cake-card ${isDarkMode ? "dark" : ""}`}
       onClick={() => onClick && onClick(cake)}
     >
-      <img src={cake.image} alt={cake.name} />
+      <ResponsiveImage
+        src={cake.image_url}
+        variants={cake.image_variants}
+        sizes="(max-width: 600px) 100vw, 320px"
+        alt={cake.name}
+        className="cake-image"
+      />
       <div className="cake-info">
         <h3>{cake.name}</h3>
         <p>{cake.description}</p>
@@ -0,0 +1,34 @@
+import React from "react";
+import { mediaUrl } from "../utils/api";
+
+// Most efficient first; the browser uses the first type it supports
+const VARIANT_TYPES = ["image/avif", "image/webp"];
+
+const srcSetFor = (variants, type) =>
+  variants
+    .filter((variant) => variant.type === type)
+    .map((variant) => `${mediaUrl(variant.url)} ${variant.width}w`)
+    .join(", ");
+
+// Renders an uploaded image's variants (image_variants from the API) as a
+// <picture>, so the browser downloads only the width the layout needs.
+// Images given as a plain URL have no variants and fall back to src.
+const ResponsiveImage = ({ src, variants = [], sizes, alt, ...imgProps }) => (
+  <picture>
+    {VARIANT_TYPES.map((type) => {
+      const srcSet = srcSetFor(variants || [], type);
+      return (
+        srcSet && <source key={type} type={type} srcSet={srcSet} sizes={sizes} />
+      );
+    })}
+    <img
+      src={mediaUrl(src)}
+      alt={alt}
+      loading="lazy"
+      decoding="async"
+      {...imgProps}
+    />
+  </picture>
+);
+
+export default ResponsiveImage;
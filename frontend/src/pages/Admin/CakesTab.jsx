@@ -1,5 +1,11 @@
 import { useState } from "react";
-import { createCake, updateCake, deleteCake } from "../../utils/api";
+import {
+  createCake,
+  updateCake,
+  deleteCake,
+  uploadCakeImage,
+} from "../../utils/api";
+import ResponsiveImage from "../../components/ResponsiveImage";
 
 const CakesTab = ({ cakes, onRefresh }) => {
   const [isAdding, setIsAdding] = useState(false);
@@ -10,18 +16,27 @@ const CakesTab = ({ cakes, onRefresh }) => {
     price: "",
     image_url: "",
   });
+  // Uploaded after the cake is saved; resized on the server in the background
+  const [imageFile, setImageFile] = useState(null);
 
   const formatPrice = (price) => `KSh ${price.toLocaleString("en-KE")}`;
 
   const handleSubmit = async (e) => {
     e.preventDefault();
     try {
+      let cakeId;
       if (editingCake) {
         await updateCake(editingCake.id, formData);
+        cakeId = editingCake.id;
       } else {
-        await createCake(formData);
+        const data = await createCake(formData);
+        cakeId = data.cake.id;
+      }
+      if (imageFile) {
+        await uploadCakeImage(cakeId, imageFile);
       }
       setFormData({ name: "", description: "", price: "", image_url: "" });
+      setImageFile(null);
       setEditingCake(null);
       setIsAdding(false);
       onRefresh();
@@ -36,8 +51,9 @@ const CakesTab = ({ cakes, onRefresh }) => {
       name: cake.name,
       description: cake.description,
       price: cake.price,
-      image_url: cake.image_url,
+      image_url: cake.image_url || "",
     });
+    setImageFile(null);
     setIsAdding(true);
   };
 
@@ -105,7 +121,15 @@ const CakesTab = ({ cakes, onRefresh }) => {
               onChange={(e) =>
                 setFormData({ ...formData, image_url: e.target.value })
               }
-              required
+              required={!imageFile && !editingCake}
+            />
+          </div>
+          <div className="form-group">
+            <label>Or upload an image:</label>
+            <input
+              type="file"
+              accept="image/jpeg,image/png,image/webp,image/avif"
+              onChange={(e) => setImageFile(e.target.files[0] || null)}
             />
           </div>
           <button type="submit">
@@ -117,7 +141,12 @@ const CakesTab = ({ cakes, onRefresh }) => {
       <div className="cakes-grid">
         {cakes.map((cake) => (
           <div key={cake.id} className="cake-card">
-            <img src={cake.image_url} alt={cake.name} />
+            <ResponsiveImage
+              src={cake.image_url}
+              variants={cake.image_variants}
+              sizes="300px"
+              alt={cake.name}
+            />
             <div className="cake-info">
               <h4>{cake.name}</h4>
               <p>{cake.description}</p>
@@ -1,7 +1,8 @@
 // frontend/src/pages/Admin/CustomizationOptions.jsx
 import { useEffect, useState, useCallback } from "react";
 import { useNavigate } from "react-router-dom";
-import api from "../../utils/api";
+import api, { uploadCustomizationImage } from "../../utils/api";
+import ResponsiveImage from "../../components/ResponsiveImage";
 import { useAuth } from "../../contexts/AuthContext";
 import "./CustomizationOptions.css";
 
@@ -40,6 +41,8 @@ export default function CustomizationOptions() {
     image_url: "",
     is_active: true,
   });
+  // Uploaded after saving; the server resizes it in the background
+  const [imageFile, setImageFile] = useState(null);
 
   const loadItems = useCallback(async () => {
     setLoading(true);
@@ -92,6 +95,7 @@ export default function CustomizationOptions() {
         price: Number(f.price ?? f.extra_price ?? 0),
         description: f.description ?? "",
         image_url: f.image_url ?? f.image ?? "",
+        image_variants: f.image_variants ?? [],
         is_active: f.is_active ?? f.active ?? true,
         created_at: f.created_at ?? f.createdAt ?? null,
       }));
@@ -129,6 +133,7 @@ export default function CustomizationOptions() {
       image_url: "",
       is_active: true,
     });
+    setImageFile(null);
     setIsModalOpen(true);
   }
 
@@ -144,6 +149,7 @@ export default function CustomizationOptions() {
       image_url: item.image_url ?? "",
       is_active: !!item.is_active,
     });
+    setImageFile(null);
     setIsModalOpen(true);
   }
 
@@ -181,10 +187,16 @@ export default function CustomizationOptions() {
         is_active: !!form.is_active,
       };
 
+      let optionId;
       if (editing) {
         await api.put(`/admin/customizations/${editing.id}`, payload);
+        optionId = editing.id;
       } else {
-        await api.post("/admin/customizations", payload);
+        const resp = await api.post("/admin/customizations", payload);
+        optionId = resp.data.id;
+      }
+      if (imageFile) {
+        await uploadCustomizationImage(optionId, imageFile);
       }
 
       await loadItems();
@@ -275,8 +287,10 @@ export default function CustomizationOptions() {
                     <div className="option-card-top">
                       {opt.image_url ? (
                         // image preview
-                        <img
+                        <ResponsiveImage
                           src={opt.image_url}
+                          variants={opt.image_variants}
+                          sizes="120px"
                           alt={opt.name}
                           className="option-image"
                           onError={(e) => {
@@ -386,6 +400,15 @@ export default function CustomizationOptions() {
                 />
               </label>
 
+              <label>
+                Or upload an image
+                <input
+                  type="file"
+                  accept="image/jpeg,image/png,image/webp,image/avif"
+                  onChange={(e) => setImageFile(e.target.files[0] || null)}
+                />
+              </label>
+
               <label>
                 Description
                 <textarea
@@ -1,49 +1,93 @@
-import React, { useEffect, useState } from "react";
+import React, { useEffect, useRef, useState } from "react";
 import { useTheme } from "../contexts/ThemeContext";
 import CakeCard from "../components/CakeCard";
-import { fetchAdminCakes } from "../utils/api"; // <-- using your existing API util
+import { searchCakes } from "../utils/api";
 import "./CakePortfolio.css";
 
+const PAGE_SIZE = 24;
+
+const SORT_OPTIONS = [
+  { value: "relevance", label: "Best match" },
+  { value: "price_asc", label: "Price: low to high" },
+  { value: "price_desc", label: "Price: high to low" },
+  { value: "name", label: "Name" },
+];
+
+const priceLabel = (range) =>
+  range.max === null ? `$${range.min}+` : `$${range.min} - $${range.max}`;
+
 const CakePortfolio = () => {
   const { isDarkMode } = useTheme();
   const [cakes, setCakes] = useState([]);
-  const [filteredCakes, setFilteredCakes] = useState([]);
+  const [total, setTotal] = useState(0);
+  const [priceFacets, setPriceFacets] = useState([]);
   const [search, setSearch] = useState("");
-  const [category, setCategory] = useState("all");
+  const [query, setQuery] = useState("");
+  const [sort, setSort] = useState("relevance");
+  const [priceRange, setPriceRange] = useState("");
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState("");
+  // Only the latest request may update the list, so a slow response for an
+  // older query can't overwrite newer results
+  const requestId = useRef(0);
+
+  // Wait for a pause in typing before searching
+  useEffect(() => {
+    const timer = setTimeout(() => setQuery(search.trim()), 250);
+    return () => clearTimeout(timer);
+  }, [search]);
+
+  const buildParams = (offset) => {
+    const params = { q: query, sort, limit: PAGE_SIZE, offset };
+    if (priceRange !== "") {
+      const range = priceFacets[Number(priceRange)];
+      if (range) {
+        params.min_price = range.min;
+        if (range.max !== null) params.max_price = range.max;
+      }
+    }
+    return params;
+  };
 
   useEffect(() => {
     const loadCakes = async () => {
+      const id = ++requestId.current;
       try {
         setLoading(true);
-        const data = await fetchAdminCakes();
-        setCakes(data);
-        setFilteredCakes(data);
+        setError("");
+        const data = await searchCakes(buildParams(0));
+        if (id !== requestId.current) return;
+        setCakes(data.results);
+        setTotal(data.total);
+        setPriceFacets(data.facets.price);
       } catch (err) {
+        if (id !== requestId.current) return;
         console.error("Failed to load cakes:", err);
         setError("Could not fetch cakes. Please try again later.");
       } finally {
-        setLoading(false);
+        if (id === requestId.current) setLoading(false);
       }
     };
 
     loadCakes();
-  }, []);
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [query, sort, priceRange]);
 
-  useEffect(() => {
-    let results = cakes.filter((cake) =>
-      cake.name.toLowerCase().includes(search.toLowerCase())
-    );
-
-    if (category !== "all") {
-      results = results.filter(
-        (cake) => cake.category?.toLowerCase() === category.toLowerCase()
-      );
+  const loadMore = async () => {
+    const id = requestId.current;
+    try {
+      setLoadingMore(true);
+      const data = await searchCakes(buildParams(cakes.length));
+      if (id !== requestId.current) return;
+      setCakes((current) => [...current, ...data.results]);
+      setTotal(data.total);
+    } catch (err) {
+      console.error("Failed to load more cakes:", err);
+    } finally {
+      setLoadingMore(false);
     }
-
-    setFilteredCakes(results);
-  }, [search, category, cakes]);
+  };
 
   const handleCardClick = (cake) => {
     alert(`Clicked on ${cake.name}`); // you can replace this with a modal later
@@ -66,15 +110,28 @@ const CakePortfolio = () => {
         />
 
         <select
-          value={category}
-          onChange={(e) => setCategory(e.target.value)}
+          value={priceRange}
+          onChange={(e) => setPriceRange(e.target.value)}
+          className="filter-select"
+        >
+          <option value="">Any price</option>
+          {priceFacets.map((range, index) => (
+            <option key={index} value={index}>
+              {priceLabel(range)} ({range.count})
+            </option>
+          ))}
+        </select>
+
+        <select
+          value={sort}
+          onChange={(e) => setSort(e.target.value)}
           className="filter-select"
         >
-          <option value="all">All</option>
-          <option value="chocolate">Chocolate</option>
-          <option value="vanilla">Vanilla</option>
-          <option value="red velvet">Red Velvet</option>
-          <option value="fruit">Fruit</option>
+          {SORT_OPTIONS.map((option) => (
+            <option key={option.value} value={option.value}>
+              {option.label}
+            </option>
+          ))}
         </select>
       </div>
 
@@ -82,17 +139,26 @@ const CakePortfolio = () => {
         <p className="loading">Loading cakes...</p>
       ) : error ? (
         <p className="error">{error}</p>
-      ) : filteredCakes.length > 0 ? (
-        <div className="cake-grid">
-          {filteredCakes.map((cake) => (
-            <CakeCard
-              key={cake.id}
-              cake={cake}
-              isDarkMode={isDarkMode}
-              onClick={handleCardClick}
-            />
-          ))}
-        </div>
+      ) : cakes.length > 0 ? (
+        <>
+          <div className="cake-grid">
+            {cakes.map((cake) => (
+              <CakeCard
+                key={cake.id}
+                cake={cake}
+                isDarkMode={isDarkMode}
+                onClick={handleCardClick}
+              />
+            ))}
+          </div>
+          {cakes.length < total && (
+            <div className="load-more">
+              <button onClick={loadMore} disabled={loadingMore}>
+                {loadingMore ? "Loading..." : `Show more (${total - cakes.length} left)`}
+              </button>
+            </div>
+          )}
+        </>
       ) : (
         <p className="no-results">No cakes found.</p>
       )}
@@ -1,6 +1,12 @@
-import { useState, useEffect } from "react";
+import { useState, useEffect, useRef } from "react";
 import { useAuth } from "../contexts/AuthContext";
-import { submitOrder, fetchCakes, fetchCustomizations } from "../utils/api";
+import {
+  submitOrder,
+  fetchCakes,
+  fetchCustomizations,
+  fetchDeliveryAvailability,
+} from "../utils/api";
+import ResponsiveImage from "../components/ResponsiveImage";
 import "./Order.css";
 
 // Define which categories allow multiple selections (e.g., Topping, Art)
@@ -24,8 +30,13 @@ const OrderPage = () => {
   const [cakes, setCakes] = useState([]);
   const [customizations, setCustomizations] = useState([]);
   const [selectedCustomizations, setSelectedCustomizations] = useState({});
+  // Remaining cakes per delivery date, keyed by YYYY-MM-DD
+  const [availability, setAvailability] = useState({});
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState("");
+  // Idempotency key for the order being submitted; reused on retries of
+  // the same payload so a lost response can't create a duplicate order
+  const pendingOrder = useRef({ key: null, body: null });
 
   const formatPrice = (price) =>
     `KSh ${parseFloat(price).toLocaleString("en-KE")}`;
@@ -64,8 +75,26 @@ const OrderPage = () => {
     };
 
     fetchData();
+    loadAvailability();
   }, [currentUser]);
 
+  const loadAvailability = async () => {
+    try {
+      const data = await fetchDeliveryAvailability();
+      setAvailability(
+        Object.fromEntries(data.days.map((day) => [day.date, day.remaining]))
+      );
+    } catch (err) {
+      // The server still checks capacity when the order is placed
+      console.error("Error fetching delivery availability:", err);
+    }
+  };
+
+  // Cakes still free on the chosen date, or undefined when unknown
+  const remainingOnDate = availability[orderData.delivery_date];
+  const dateIsFull =
+    remainingOnDate !== undefined && remainingOnDate < orderData.quantity;
+
   const handleChange = (e) => {
     const { name, value, type } = e.target;
     const val = type === "number" ? Number(value) : value;
@@ -134,6 +163,15 @@ const OrderPage = () => {
   const resetForm = () => {
     setOrderData(initialOrderData);
     setSelectedCustomizations({});
+    pendingOrder.current = { key: null, body: null };
+  };
+
+  const idempotencyKeyFor = (payload) => {
+    const body = JSON.stringify(payload);
+    if (pendingOrder.current.body !== body) {
+      pendingOrder.current = { key: crypto.randomUUID(), body };
+    }
+    return pendingOrder.current.key;
   };
 
   const handleSubmit = async (e) => {
@@ -147,6 +185,11 @@ const OrderPage = () => {
         setLoading(false);
         return;
       }
+      if (dateIsFull) {
+        setError("That delivery date is fully booked. Please pick another.");
+        setLoading(false);
+        return;
+      }
       if (
         !orderData.customer_name ||
         !orderData.customer_email ||
@@ -174,7 +217,7 @@ const OrderPage = () => {
         total_price: calculateTotal(),
       };
 
-      await submitOrder(payload);
+      await submitOrder(payload, idempotencyKeyFor(payload));
       // NOTE: Using alert() is generally discouraged, replacing with console log for safety
       console.log("Order placed successfully!");
       alert(
@@ -182,6 +225,7 @@ const OrderPage = () => {
       );
 
       resetForm();
+      loadAvailability();
     } catch (err) {
       const errorMessage =
         err.response?.data?.message ||
@@ -257,6 +301,13 @@ const OrderPage = () => {
                 max={formatDate(maxDate)}
                 required
               />
+              {dateIsFull && (
+                <p className="error-message">
+                  {remainingOnDate > 0
+                    ? `Only ${remainingOnDate} more cake(s) can be delivered on this date.`
+                    : "This date is fully booked. Please pick another."}
+                </p>
+              )}
             </div>
           </div>
 
@@ -300,8 +351,10 @@ const OrderPage = () => {
                           }
                         >
                           {option.image_url && (
-                            <img
+                            <ResponsiveImage
                               src={option.image_url}
+                              variants={option.image_variants}
+                              sizes="64px"
                               alt={option.name}
                               className="customization-img"
                               // Placeholder if image fails to load
@@ -60,8 +60,24 @@ export const fetchCakes = async () => {
   return response.data;
 };
 
+// Server-side search: { q, min_price, max_price, sort, limit, offset }.
+// Returns { results, total, limit, offset, facets: { price: [...] } }
+export const searchCakes = async (params) => {
+  const response = await api.get("/cakes/search", { params });
+  return response.data;
+};
+
+// Remaining delivery capacity: { start, default_capacity,
+// days: [{ date, capacity, booked, remaining, available }] }
+export const fetchDeliveryAvailability = async () => {
+  const response = await api.get("/delivery/availability");
+  return response.data;
+};
+
 // Orders API calls
-export const submitOrder = async (orderData) => {
+// Pass the same idempotencyKey when retrying an order so the server
+// returns the first result instead of placing a duplicate
+export const submitOrder = async (orderData, idempotencyKey) => {
   try {
     // Ensure delivery_date is properly formatted
     const formattedData = {
@@ -69,7 +85,8 @@ export const submitOrder = async (orderData) => {
       delivery_date: orderData.deliveryDate || orderData.delivery_date,
     };
 
-    const response = await api.post("/orders", formattedData);
+    const headers = idempotencyKey ? { "Idempotency-Key": idempotencyKey } : {};
+    const response = await api.post("/orders", formattedData, { headers });
     return response.data;
   } catch (error) {
     console.error("Order submission error:", error.response?.data);
@@ -196,6 +213,33 @@ export const deleteCake = async (cakeId) => {
   }
 };
 
+// Image uploads (multipart field "image"). The server answers 202 and
+// makes the resized variants in the background; the cake or option lists
+// them in image_variants once they are ready
+const uploadImage = async (path, file) => {
+  const form = new FormData();
+  form.append("image", file);
+  try {
+    const response = await api.post(path, form, {
+      headers: { "Content-Type": "multipart/form-data" },
+    });
+    return response.data;
+  } catch (error) {
+    console.error("Error uploading image:", error.response?.data);
+    throw error;
+  }
+};
+
+export const uploadCakeImage = (cakeId, file) =>
+  uploadImage(`/admin/cakes/${cakeId}/image`, file);
+
+export const uploadCustomizationImage = (optionId, file) =>
+  uploadImage(`/admin/customizations/${optionId}/image`, file);
+
+// Uploaded image URLs are relative to the API server, not this site
+export const mediaUrl = (url) =>
+  url ? new URL(url, new URL(API_BASE_URL, window.location.origin)).href : url;
+
 export const fetchAdminUsers = async (params = {}) => {
   try {
     const response = await api.get("/admin/users", { params });
@@ -0,0 +1,144 @@
+# tests/conftest.py
+# Shared fixtures. One app is built for the whole session on an in-memory
+# SQLite database; every test starts from empty tables and empty caches.
+import os
+import sys
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+import pytest
+
+# This line helps Python find the application files, which import each other from backend/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from app import create_app
+from config import Config
+from extensions import db, cache
+from models.cake import Cake
+from models.customization import CustomizationOption
+from models.User import User
+from services import auth_service, email_service, idempotency_service
+from services.cache_service import CATALOG_NAMESPACE, CUSTOMIZATIONS_NAMESPACE
+
+
+class TestingConfig(Config):
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    TESTING = True
+    MAIL_BACKEND = 'local'
+    # Tests send queued mail themselves with email_service.dispatcher.flush()
+    MAIL_WORKER_ENABLED = False
+    RATE_LIMIT_ENABLED = False
+    METRICS_ENABLED = False
+
+
+@pytest.fixture(scope='session')
+def app():
+    return create_app(TestingConfig)
+
+
+@pytest.fixture(autouse=True)
+def database(app):
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        # Cached payloads, prices and roles belong to the previous test's rows
+        cache.clear()
+        cache.bump(CATALOG_NAMESPACE)
+        cache.bump(CUSTOMIZATIONS_NAMESPACE)
+        auth_service.role_cache.clear()
+        idempotency_service.init_app(app)
+        email_service.init_app(app)
+        yield db
+        db.session.remove()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def count_queries():
+    """`with count_queries() as statements:` lists the SQL run inside the block."""
+    @contextmanager
+    def counting():
+        statements = []
+
+        def on_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', on_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', on_execute)
+
+    return counting
+
+
+@pytest.fixture
+def cakes():
+    cakes = [Cake(name=f'Cake {i}', description='Test cake', price=40.0 + i) for i in range(3)]
+    db.session.add_all(cakes)
+    db.session.commit()
+    return cakes
+
+
+@pytest.fixture
+def options():
+    options = [
+        CustomizationOption(category='Design', name='Sprinkles', price=2.5),
+        CustomizationOption(category='Flavor', name='Lemon', price=4.0),
+        CustomizationOption(category='Flavor', name='Mint', price=3.0, active=False),
+    ]
+    db.session.add_all(options)
+    db.session.commit()
+    return options
+
+
+@pytest.fixture
+def admin():
+    user = User(name='Admin', email='admin@example.com', password_hash='x', is_admin=True)
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+@pytest.fixture
+def customer():
+    user = User(name='Customer', email='customer@example.com', password_hash='x')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def auth_headers(user):
+    token = create_access_token(identity=str(user.id), additional_claims={'is_admin': user.is_admin})
+    return {'Authorization': f'Bearer {token}'}
+
+
+@pytest.fixture
+def admin_headers(admin):
+    return auth_headers(admin)
+
+
+@pytest.fixture
+def customer_headers(customer):
+    return auth_headers(customer)
+
+
+@pytest.fixture
+def order_payload(cakes):
+    """Builds a valid POST /api/orders body; keyword arguments override fields."""
+    def build(**fields):
+        payload = {
+            'cake_id': cakes[0].id, 'quantity': 1, 'customer_name': 'Customer',
+            'customer_email': 'customer@example.com', 'customer_phone': '555-000-0000',
+            'delivery_date': (date.today() + timedelta(days=3)).isoformat(),
+        }
+        payload.update(fields)
+        return payload
+
+    return build
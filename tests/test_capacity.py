@@ -0,0 +1,73 @@
+# tests/test_capacity.py
+# Delivery-date capacity: full dates refuse orders, cancelling gives the cakes back.
+from datetime import date
+
+import pytest
+
+from extensions import db
+from models.delivery_capacity import DeliveryCapacity
+from models.order import Order
+from services import capacity_service
+
+
+@pytest.fixture
+def delivery_date(order_payload):
+    day = date.fromisoformat(order_payload()['delivery_date'])
+    capacity_service.set_capacity(day, 3)
+    db.session.commit()
+    return day
+
+
+def booked(day):
+    db.session.expire_all()
+    return db.session.get(DeliveryCapacity, day).booked
+
+
+def test_full_date_returns_409(client, order_payload, delivery_date):
+    assert client.post('/api/orders', json=order_payload(quantity=2)).status_code == 201
+
+    response = client.post('/api/orders', json=order_payload(quantity=2))
+
+    assert response.status_code == 409
+    assert booked(delivery_date) == 2
+    assert Order.query.count() == 1
+
+
+def test_cancel_releases_capacity_once(client, order_payload, delivery_date, customer_headers):
+    order_id = client.post('/api/orders', json=order_payload(quantity=3), headers=customer_headers).json['id']
+    assert client.post('/api/orders', json=order_payload()).status_code == 409
+
+    assert client.delete(f'/api/orders/{order_id}', headers=customer_headers).status_code == 200
+    assert booked(delivery_date) == 0
+    # A second cancel must not give the cakes back again
+    assert client.delete(f'/api/orders/{order_id}', headers=customer_headers).status_code == 400
+    assert booked(delivery_date) == 0
+
+    assert client.post('/api/orders', json=order_payload(quantity=3)).status_code == 201
+
+
+def test_reinstating_a_cancelled_order_books_it_again(client, order_payload, delivery_date, admin_headers):
+    order_id = client.post('/api/orders', json=order_payload(quantity=2)).json['id']
+    url = f'/api/admin/orders/{order_id}/status'
+
+    assert client.put(url, json={'status': 'cancelled'}, headers=admin_headers).status_code == 200
+    assert client.post('/api/orders', json=order_payload(quantity=3)).status_code == 201
+
+    # The date filled up while the order was cancelled
+    assert client.put(url, json={'status': 'pending'}, headers=admin_headers).status_code == 409
+    assert db.session.get(Order, order_id).status == 'cancelled'
+    assert booked(delivery_date) == 3
+
+
+def test_stale_status_change_conflicts(client, order_payload, delivery_date):
+    order_id = client.post('/api/orders', json=order_payload(quantity=2)).json['id']
+    order = db.session.get(Order, order_id)
+    # Another request cancels the order after this one loaded it
+    db.session.execute(
+        db.update(Order).where(Order.id == order_id).values(status='cancelled')
+        .execution_options(synchronize_session=False)
+    )
+
+    with pytest.raises(capacity_service.StatusConflict):
+        capacity_service.change_status(order, 'cancelled')
+    db.session.rollback()
@@ -0,0 +1,55 @@
+# tests/test_customizations.py
+# Option pricing on quotes and orders, and removing options that were ordered.
+from models.customization import CustomizationOption
+from models.order import Order
+
+
+def test_quote_adds_option_prices(client, cakes, options):
+    response = client.post('/api/quote', json={
+        'cake_id': cakes[0].id, 'quantity': 2, 'customizations': [options[0].id, options[1].id, options[0].id]
+    })
+
+    assert response.status_code == 200
+    assert response.json['unit_price'] == 40.0 + 2.5 + 4.0
+    assert response.json['total_price'] == 2 * (40.0 + 2.5 + 4.0)
+    assert [option['id'] for option in response.json['customizations']] == [options[0].id, options[1].id]
+
+
+def test_order_is_priced_with_its_options(client, order_payload, options):
+    response = client.post('/api/orders', json=order_payload(quantity=3, customizations=[options[1].id]))
+
+    assert response.status_code == 201
+    assert Order.query.one().total_price == 3 * (40.0 + 4.0)
+
+
+def test_inactive_option_is_rejected(client, order_payload, options):
+    response = client.post('/api/orders', json=order_payload(customizations=[options[2].id]))
+
+    assert response.status_code == 422
+    assert Order.query.count() == 0
+
+
+def test_customizations_must_be_a_list(client, order_payload, options):
+    for customizations in (str(options[0].id), {'id': options[0].id}, options[0].id):
+        assert client.post('/api/quote', json=order_payload(customizations=customizations)).status_code == 422
+        assert client.post('/api/orders', json=order_payload(customizations=customizations)).status_code == 422
+    assert Order.query.count() == 0
+
+
+def test_deleting_an_ordered_option_deactivates_it(client, order_payload, options, admin_headers):
+    client.post('/api/orders', json=order_payload(customizations=[options[0].id]))
+
+    response = client.delete(f'/api/admin/customizations/{options[0].id}', headers=admin_headers)
+
+    assert response.status_code == 200
+    assert response.json['option']['active'] is False
+    assert CustomizationOption.query.count() == 3
+    menu = client.get('/api/customizations').json
+    assert options[0].id not in [option['id'] for group in menu for option in group['options']]
+
+
+def test_deleting_an_unordered_option_removes_it(client, options, admin_headers):
+    assert client.delete(f'/api/admin/customizations/{options[1].id}').status_code == 401
+
+    assert client.delete(f'/api/admin/customizations/{options[1].id}', headers=admin_headers).status_code == 204
+    assert CustomizationOption.query.count() == 2
@@ -0,0 +1,92 @@
+# tests/test_email_outbox.py
+# The email outbox: queued in the request's transaction, sent, retried and given up on.
+from datetime import datetime
+
+import pytest
+from flask import Flask
+
+from extensions import db
+from models.email_outbox import EmailOutbox
+from services import email_service
+
+CONTACT = {'name': 'Customer', 'email': 'customer@example.com', 'message': 'Do you bake vegan cakes?'}
+
+
+@pytest.fixture
+def dispatcher():
+    return email_service.dispatcher
+
+
+def outbox():
+    db.session.expire_all()
+    return EmailOutbox.query.one()
+
+
+def make_due(message):
+    message.next_attempt_at = datetime.now()
+    db.session.commit()
+
+
+def test_contact_message_is_queued_then_sent(client, dispatcher):
+    assert client.post('/api/contact', json=CONTACT).status_code == 200
+    assert outbox().status == 'pending'
+    assert len(dispatcher.transport.sent) == 0
+
+    assert dispatcher.flush() == 1
+
+    message = outbox()
+    assert message.status == 'sent'
+    assert message.attempts == 1
+    assert dispatcher.transport.sent[0]['Reply-To'] == CONTACT['email']
+
+
+def test_failed_send_is_retried_later(client, dispatcher):
+    client.post('/api/contact', json=CONTACT)
+    dispatcher.transport.fail_next = 1
+
+    dispatcher.flush()
+
+    message = outbox()
+    assert message.status == 'pending'
+    assert message.attempts == 1
+    assert message.last_error == 'Simulated delivery failure'
+    assert message.next_attempt_at > datetime.now()
+    # Not due yet
+    assert dispatcher.flush() == 0
+
+    make_due(message)
+    dispatcher.flush()
+
+    message = outbox()
+    assert message.status == 'sent'
+    assert message.attempts == 2
+    assert message.last_error is None
+    assert len(dispatcher.transport.sent) == 1
+
+
+def test_message_fails_after_max_attempts(client, dispatcher):
+    client.post('/api/contact', json=CONTACT)
+    dispatcher.transport.fail_next = dispatcher.max_attempts
+
+    for _ in range(dispatcher.max_attempts):
+        make_due(outbox())
+        dispatcher.flush()
+
+    message = outbox()
+    assert message.status == 'failed'
+    assert message.attempts == dispatcher.max_attempts
+    assert len(dispatcher.transport.sent) == 0
+    # A failed message is never picked up again
+    make_due(message)
+    assert dispatcher.flush() == 0
+
+
+def test_local_transport_needs_testing_or_debug():
+    app = Flask(__name__)
+    app.config.update(MAIL_BACKEND='local', MAIL_WORKER_ENABLED=False)
+
+    with pytest.raises(RuntimeError):
+        email_service.EmailDispatcher().init_app(app)
+
+    app.config['DEBUG'] = True
+    email_service.EmailDispatcher().init_app(app)
@@ -0,0 +1,35 @@
+# tests/test_export.py
+# Streamed order exports.
+import csv
+import io
+import json
+
+import pytest
+
+
+@pytest.fixture
+def orders(client, order_payload):
+    for name in ('=HYPERLINK("http://example.com","click")', '@SUM(A1:A2)', 'Plain Customer'):
+        assert client.post('/api/orders', json=order_payload(customer_name=name,
+                                                            special_requests='-2+3')).status_code == 201
+
+
+def test_csv_export_neutralizes_formulas(client, orders, admin_headers):
+    response = client.get('/api/admin/orders/export', query_string={'format': 'csv'}, headers=admin_headers)
+
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert [row['customer_name'] for row in rows] == [
+        '\'=HYPERLINK("http://example.com","click")', "'@SUM(A1:A2)", 'Plain Customer'
+    ]
+    assert {row['special_requests'] for row in rows} == {"'-2+3"}
+    assert rows[0]['quantity'] == '1'
+
+
+def test_ndjson_export_has_one_order_per_line(client, orders, admin_headers):
+    response = client.get('/api/admin/orders/export', headers=admin_headers)
+
+    assert response.mimetype == 'application/x-ndjson'
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert lines[0]['customer_name'] == '=HYPERLINK("http://example.com","click")'
+    assert len(lines) == 3
+    assert lines[0]['total_price'] == 40.0
@@ -0,0 +1,79 @@
+# tests/test_idempotency.py
+# Idempotency-Key handling on POST /api/orders, for both stores.
+import hashlib
+
+import pytest
+from flask_jwt_extended import verify_jwt_in_request
+
+from models.order import Order
+from services import idempotency_service, order_service
+
+
+@pytest.fixture(params=['memory', 'database'])
+def store(request, app):
+    app.extensions['idempotency_store'] = idempotency_service.STORES[request.param](app.config)
+    return app.extensions['idempotency_store']
+
+
+def keyed(headers, key):
+    return dict(headers, **{idempotency_service.IDEMPOTENCY_HEADER: key})
+
+
+def test_repeat_is_replayed(client, store, order_payload, customer_headers):
+    headers = keyed(customer_headers, 'order-1')
+
+    first = client.post('/api/orders', json=order_payload(), headers=headers)
+    second = client.post('/api/orders', json=order_payload(), headers=headers)
+
+    assert first.status_code == second.status_code == 201
+    assert second.json == first.json
+    assert second.headers[idempotency_service.REPLAYED_HEADER] == 'true'
+    assert Order.query.count() == 1
+
+
+def test_key_reuse_with_different_body_is_rejected(client, store, order_payload, customer_headers):
+    headers = keyed(customer_headers, 'order-1')
+    client.post('/api/orders', json=order_payload(), headers=headers)
+
+    response = client.post('/api/orders', json=order_payload(quantity=2), headers=headers)
+
+    assert response.status_code == 422
+    assert Order.query.count() == 1
+
+
+def test_keys_are_scoped_to_the_caller(client, store, order_payload, customer_headers):
+    client.post('/api/orders', json=order_payload(), headers=keyed(customer_headers, 'order-1'))
+
+    response = client.post('/api/orders', json=order_payload(), headers=keyed({}, 'order-1'))
+
+    assert response.status_code == 201
+    assert Order.query.count() == 2
+
+
+def test_key_in_progress_returns_409(app, client, store, order_payload):
+    body = app.json.dumps(order_payload()).encode()
+    # Another worker has claimed the key and is still running the view
+    with app.test_request_context('/api/orders'):
+        verify_jwt_in_request(optional=True)
+        scoped_key = idempotency_service._scoped_key('order-1')
+    assert store.claim(scoped_key, hashlib.sha256(body).hexdigest()) is None
+
+    response = client.post('/api/orders', data=body, content_type='application/json',
+                           headers=keyed({}, 'order-1'))
+
+    assert response.status_code == 409
+    assert Order.query.count() == 0
+
+
+def test_server_error_frees_the_key(client, store, order_payload, monkeypatch):
+    def broken(data, user_id=None):
+        raise RuntimeError('database went away')
+
+    monkeypatch.setattr(order_service, 'create_order', broken)
+    assert client.post('/api/orders', json=order_payload(), headers=keyed({}, 'order-1')).status_code == 500
+    monkeypatch.undo()
+
+    response = client.post('/api/orders', json=order_payload(), headers=keyed({}, 'order-1'))
+
+    assert response.status_code == 201
+    assert idempotency_service.REPLAYED_HEADER not in response.headers
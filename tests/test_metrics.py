@@ -0,0 +1,21 @@
+# tests/test_metrics.py
+# Prometheus rendering: every series names the worker process it came from.
+import os
+
+from services import metrics_service
+
+
+def test_series_carry_the_worker_pid():
+    labels = ('/api/cakes', 'GET')
+    metrics_service.requests_total.inc(labels + (200,))
+    metrics_service.request_duration.observe(labels, 0.02)
+    metrics_service.slow_queries_total.inc()
+
+    text = metrics_service.render_metrics()
+
+    worker = f'worker="{os.getpid()}"'
+    assert f'http_requests_total{{{worker},route="/api/cakes",method="GET",status="200"}}' in text
+    assert f'http_request_duration_seconds_count{{{worker},route="/api/cakes",method="GET"}}' in text
+    assert f'db_slow_queries_total{{{worker}}}' in text
+    series = [line for line in text.splitlines() if line and not line.startswith('#')]
+    assert all(worker in line for line in series)
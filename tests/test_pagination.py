@@ -0,0 +1,40 @@
+# tests/test_pagination.py
+# Page sizes on the admin listings are clamped and must be integers.
+from datetime import datetime, timedelta
+
+import pytest
+
+from extensions import db
+from models.User import User
+from services import pagination
+
+
+@pytest.fixture
+def users():
+    now = datetime.now()
+    db.session.add_all([
+        User(name=f'Customer {i}', email=f'customer-{i}@example.com', password_hash='x',
+             created_at=now - timedelta(minutes=i))
+        for i in range(pagination.MAX_PER_PAGE + 5)
+    ])
+    db.session.commit()
+
+
+@pytest.mark.parametrize('cursor', [None, ''])
+@pytest.mark.parametrize('per_page, expected', [(1000, pagination.MAX_PER_PAGE), (0, 1), (-5, 1), (7, 7)])
+def test_per_page_is_clamped(client, users, admin_headers, cursor, per_page, expected):
+    params = {'per_page': per_page}
+    if cursor is not None:
+        params['cursor'] = cursor
+
+    response = client.get('/api/admin/users', query_string=params, headers=admin_headers)
+
+    assert response.status_code == 200
+    assert len(response.json['users']) == expected
+
+
+@pytest.mark.parametrize('route', ['/api/admin/users', '/api/admin/orders'])
+def test_per_page_must_be_an_integer(client, admin_headers, route):
+    response = client.get(route, query_string={'per_page': 'all'}, headers=admin_headers)
+
+    assert response.status_code == 400
@@ -0,0 +1,73 @@
+# tests/test_query_counts.py
+# Query-count regression tests for the list endpoints.
+#
+# Every endpoint is called once on a small dataset and once after it has
+# grown tenfold. The number of SQL statements must stay within the
+# endpoint's budget and must not grow with the data, otherwise an N+1 lazy
+# load has crept back in.
+from datetime import date, timedelta
+
+import pytest
+
+from extensions import db
+from models.order import Order
+from models.User import User
+
+# Maximum SQL statements per request, independent of page size
+QUERY_BUDGETS = {
+    '/api/admin/orders': 2,
+    '/api/admin/users': 3,
+    '/api/orders/my-orders': 1,
+    '/api/orders/{order_id}': 1,
+}
+
+ADMIN_ROUTES = ('/api/admin/orders', '/api/admin/users')
+
+
+def add_orders(user, cake_ids, count):
+    db.session.add_all([
+        Order(user_id=user.id, cake_id=cake_ids[i % len(cake_ids)], quantity=1,
+              customer_name=user.name, customer_email=user.email, customer_phone='555-000-0000',
+              delivery_date=date.today() + timedelta(days=1), total_price=40.0)
+        for i in range(count)
+    ])
+
+
+def add_customers(count, cake_ids, orders_per_user=3):
+    offset = User.query.count()
+    users = [User(name=f'Customer {offset + i}', email=f'customer-{offset + i}@example.com',
+                  password_hash='x') for i in range(count)]
+    db.session.add_all(users)
+    db.session.flush()
+    for user in users:
+        add_orders(user, cake_ids, orders_per_user)
+    db.session.commit()
+
+
+@pytest.mark.parametrize('route', QUERY_BUDGETS)
+def test_list_queries_stay_within_budget(route, client, count_queries, cakes, customer,
+                                         admin_headers, customer_headers):
+    cake_ids = [cake.id for cake in cakes]
+    customer_id = customer.id
+    add_orders(customer, cake_ids, 3)
+    add_customers(2, cake_ids)
+    url = route.format(order_id=customer.orders[0].id)
+    headers = admin_headers if route in ADMIN_ROUTES else customer_headers
+
+    def queries():
+        # Start from an empty identity map so lazy loads show up as queries
+        db.session.expunge_all()
+        with count_queries() as statements:
+            response = client.get(url, headers=headers)
+        assert response.status_code == 200
+        return len(statements)
+
+    # Warm-up request so per-process caches (admin roles) are populated
+    queries()
+    small = queries()
+    add_customers(20, cake_ids)
+    add_orders(db.session.get(User, customer_id), cake_ids, 20)
+    db.session.commit()
+    large = queries()
+
+    assert small == large <= QUERY_BUDGETS[route]